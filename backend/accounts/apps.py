@@ -1,6 +1,18 @@
 from django.apps import AppConfig
 
 
+def cache_metrics():
+    from . import user_cache
+    yield ('otopark_user_cache', 'gauge', "user_cache istatistikleri (süreç yerel)",
+           [({'stat': k}, v) for k, v in user_cache.stats().items()])
+
+
 class AccountsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "accounts"
+
+    def ready(self):
+        from core import metrics
+
+        from . import signals  # noqa: F401
+        metrics.register_collector(cache_metrics)
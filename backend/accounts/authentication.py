@@ -0,0 +1,122 @@
+# accounts/authentication.py
+"""
+JWT kimlik doğrulaması (REST_FRAMEWORK DEFAULT_AUTHENTICATION_CLASSES).
+
+FastJWTAuthentication simplejwt'nin JWTAuthentication'ı ile aynı başlığı ve
+token doğrulamasını kullanır; kullanıcıyı her istekte veritabanından yüklemez:
+
+- Okuma (GET/HEAD/OPTIONS): token'daki imzalı claim'lerden (id, role, is_staff;
+  tokens.USER_CLAIMS) kaydedilmemiş bir CustomUser örneği kurulur, sorgu yok.
+  Yalnızca AUTH_CLAIMS_MAX_AGE saniyeden genç token'lara güvenilir; daha eski
+  ya da claim'siz token'lar diğer yoldan gider. Tam profil gereken view'lar
+  stateless_auth = False ile bu yolu kapatır.
+- Diğerleri: kullanıcı satırı user_cache'ten (AUTH_USER_CACHE_TTL, save/delete
+  sinyaliyle silinir); is_active ve tokens_valid_after (tüm cihazlardan çıkış)
+  burada denetlenir.
+
+Rol/is_staff/is_active değişikliği ve LogoutAllView etkisini kaydın yapıldığı
+süreçte yazma isteklerinde hemen, okumalarda en geç AUTH_CLAIMS_MAX_AGE, diğer
+worker'larda en geç max(AUTH_CLAIMS_MAX_AGE, AUTH_USER_CACHE_TTL) saniyede gösterir.
+"""
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import aware_utcnow, get_md5_hash_password
+
+from . import user_cache
+from .tokens import USER_CLAIMS
+
+
+class FastJWTAuthentication(JWTAuthentication):
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        if self.claims_allowed(request, validated_token):
+            return self.get_claims_user(validated_token), validated_token
+        return self.get_user(validated_token), validated_token
+
+    def claims_allowed(self, request, validated_token):
+        if request.method not in SAFE_METHODS:
+            return False
+        view = (getattr(request, 'parser_context', None) or {}).get('view')
+        if not getattr(view, 'stateless_auth', True):
+            return False
+        if any(claim not in validated_token for claim in USER_CLAIMS):
+            return False
+        iat = validated_token.get('iat')
+        max_age = getattr(settings, 'AUTH_CLAIMS_MAX_AGE', 300)
+        return iat is not None and aware_utcnow().timestamp() - iat <= max_age
+
+    def get_claims_user(self, validated_token):
+        """Claim'lerden kurulan, kaydedilmemiş kullanıcı (FK atama/filtrelemede pk yeterli)."""
+        user_id = self.user_model._meta.pk.to_python(self.get_user_id(validated_token))
+        user = self.user_model(**{api_settings.USER_ID_FIELD: user_id},
+                               **{claim: validated_token[claim] for claim in USER_CLAIMS})
+        user._state.adding = False
+        user._state.db = DEFAULT_DB_ALIAS
+        user.from_claims = True
+        return user
+
+    def get_user(self, validated_token):
+        return self.check_user(user_cache.get(self.get_user_id(validated_token)), validated_token)
+
+    @staticmethod
+    def get_user_id(validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+    @staticmethod
+    def check_user(user, validated_token):
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        valid_after = getattr(user, 'tokens_valid_after', None)
+        if valid_after is not None:
+            iat = validated_token.get('iat')
+            # iat saniye hassasiyetinde: çıkışla aynı saniyede alınan token da geçersiz sayılır
+            if iat is None or iat <= valid_after.timestamp():
+                raise AuthenticationFailed(_("Token has been revoked."), code="token_revoked")
+        return user
+
+
+class AsyncJWTAuthentication(FastJWTAuthentication):
+    """
+    Async view'lar (reservations/async_views.py) için FastJWTAuthentication.
+    Başlık/token doğrulaması ve claim yolu aynı; önbellekte olmayan kullanıcı
+    async ORM ile yüklenir. Hatalar DRF'teki gibi AuthenticationFailed/InvalidToken
+    olarak yükselir.
+    """
+
+    async def aauthenticate(self, request):
+        """Geçerli token yoksa AnonymousUser döner (DRF'te request.user gibi)."""
+        header = self.get_header(request)
+        if header is None:
+            return AnonymousUser()
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return AnonymousUser()
+        validated_token = self.get_validated_token(raw_token)
+        if self.claims_allowed(request, validated_token):
+            return self.get_claims_user(validated_token)
+        return await self.aget_user(validated_token)
+
+    async def aget_user(self, validated_token):
+        return self.check_user(await user_cache.aget(self.get_user_id(validated_token)), validated_token)
+
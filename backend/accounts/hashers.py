@@ -0,0 +1,163 @@
+# accounts/hashers.py
+"""
+Şifre hash politikası (settings.PASSWORD_HASHER / PASSWORD_HASH_PARAMS).
+
+Django'nun hasher'ları; farkları:
+- Maliyet parametreleri ayarlardan okunur (argon2: time_cost/memory_cost/
+  parallelism, scrypt: work_factor/block_size/parallelism/maxmem,
+  pbkdf2: iterations). Algoritma adları Django'nunkiyle aynıdır, mevcut
+  hash'ler olduğu gibi doğrulanır.
+- Hash üretme ve doğrulama istek thread'inde değil, sınırlı bir worker
+  havuzunda çalışır (PASSWORD_HASH_WORKERS). Giriş patlaması CPU'yu ve
+  bellek-yoğun hash'lerin belleğini (workers x memory) bu kadarla sınırlar;
+  diğer istekler (ör. gate okutma) çekirdek bulur. Havuz ve kuyruğu
+  (PASSWORD_HASH_QUEUE) doluysa PASSWORD_HASH_WAIT saniye beklenir, sonra
+  HashingBusy yükselir. HashingBusy DRF'den bağımsızdır (admin girişi,
+  createsuperuser da hasher'ı çağırır); DRF'de exception_handler, diğer
+  view'larda HashingBusyMiddleware onu 503 + Retry-After yapar.
+
+Girişte (ModelBackend -> User.check_password) tercih edilen hasher'dan ya da
+güncel parametrelerden farklı bir hash doğrulanırsa Django şifreyi yeni
+politikayla yeniden hash'leyip kaydeder (must_update).
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpResponse
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status, views
+from rest_framework.exceptions import APIException
+
+DEFAULT_PARAMS = {
+    # OWASP Password Storage Cheat Sheet önerileri
+    'argon2': {'time_cost': 2, 'memory_cost': 19456, 'parallelism': 1},  # 19 MiB
+    'scrypt': {'work_factor': 2**14, 'block_size': 8, 'parallelism': 5, 'maxmem': 0},  # 16 MiB
+    'pbkdf2_sha256': {'iterations': hashers.PBKDF2PasswordHasher.iterations},
+}
+
+
+BUSY_DETAIL = _("Çok fazla eşzamanlı giriş isteği, lütfen tekrar deneyin.")
+
+
+class HashingBusy(Exception):
+    """Hash havuzu dolu; retry_after saniye sonra tekrar denenmeli."""
+
+    def __init__(self, retry_after):
+        super().__init__(BUSY_DETAIL)
+        self.retry_after = retry_after
+
+
+class HashingBusyAPIException(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = BUSY_DETAIL
+    default_code = 'hashing_busy'
+
+    def __init__(self, retry_after):
+        super().__init__()
+        self.wait = retry_after  # DRF exception_handler bunu Retry-After'a yazar
+
+
+def exception_handler(exc, context):
+    """REST_FRAMEWORK EXCEPTION_HANDLER: HashingBusy -> 503."""
+    if isinstance(exc, HashingBusy):
+        exc = HashingBusyAPIException(exc.retry_after)
+    return views.exception_handler(exc, context)
+
+
+class HashingBusyMiddleware(MiddlewareMixin):
+    """DRF dışı view'larda (ör. admin girişi) HashingBusy -> 503."""
+
+    def process_exception(self, request, exception):
+        if not isinstance(exception, HashingBusy):
+            return None
+        response = HttpResponse(BUSY_DETAIL, status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                                content_type='text/plain; charset=utf-8')
+        response['Retry-After'] = str(exception.retry_after)
+        return response
+
+
+# ---- sınırlı worker havuzu ----
+_pool = None
+_slots = None
+_pool_lock = threading.Lock()
+_local = threading.local()
+
+
+def _workers():
+    return getattr(settings, 'PASSWORD_HASH_WORKERS', None) or max(1, (os.cpu_count() or 2) // 2)
+
+
+def _get_pool():
+    global _pool, _slots
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                workers = _workers()
+                _slots = threading.BoundedSemaphore(workers + getattr(settings, 'PASSWORD_HASH_QUEUE', 64))
+                _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pwhash',
+                                           initializer=setattr, initargs=(_local, 'in_pool', True))
+    return _pool, _slots
+
+
+@receiver(setting_changed)
+def _reset_pool(setting, **kwargs):
+    global _pool, _slots
+    if setting in ('PASSWORD_HASH_WORKERS', 'PASSWORD_HASH_QUEUE'):
+        with _pool_lock:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = _slots = None
+
+
+def offload(fn, *args):
+    """fn(*args)'ı hash havuzunda çalıştır ve sonucu bekle (havuz thread'inden çağrılırsa doğrudan)."""
+    if getattr(_local, 'in_pool', False) or getattr(settings, 'PASSWORD_HASH_WORKERS', None) == 0:
+        return fn(*args)
+    pool, slots = _get_pool()
+    wait = getattr(settings, 'PASSWORD_HASH_WAIT', 5)
+    if not slots.acquire(timeout=wait):
+        raise HashingBusy(retry_after=max(1, round(wait)))
+    try:
+        return pool.submit(fn, *args).result()
+    finally:
+        slots.release()
+
+
+class PooledHasherMixin:
+    """encode/verify havuzda; maliyet parametreleri PASSWORD_HASH_PARAMS[algorithm]'dan."""
+
+    def _param(self, name):
+        params = getattr(settings, 'PASSWORD_HASH_PARAMS', {}).get(self.algorithm, {})
+        return params.get(name, DEFAULT_PARAMS[self.algorithm][name])
+
+    def encode(self, password, salt, *args, **kwargs):
+        return offload(lambda: super(PooledHasherMixin, self).encode(password, salt, *args, **kwargs))
+
+    def verify(self, password, encoded):
+        return offload(super().verify, password, encoded)
+
+    def harden_runtime(self, password, encoded):
+        return offload(super().harden_runtime, password, encoded)
+
+
+class Argon2PasswordHasher(PooledHasherMixin, hashers.Argon2PasswordHasher):
+    time_cost = property(lambda self: self._param('time_cost'))
+    memory_cost = property(lambda self: self._param('memory_cost'))
+    parallelism = property(lambda self: self._param('parallelism'))
+
+
+class ScryptPasswordHasher(PooledHasherMixin, hashers.ScryptPasswordHasher):
+    work_factor = property(lambda self: self._param('work_factor'))
+    block_size = property(lambda self: self._param('block_size'))
+    parallelism = property(lambda self: self._param('parallelism'))
+    maxmem = property(lambda self: self._param('maxmem'))
+
+
+class PBKDF2PasswordHasher(PooledHasherMixin, hashers.PBKDF2PasswordHasher):
+    iterations = property(lambda self: self._param('iterations'))
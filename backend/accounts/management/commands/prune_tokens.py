@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from accounts import tokens
+
+
+class Command(BaseCommand):
+    help = ("Süresi dolmuş refresh token kayıtlarını (OutstandingToken + BlacklistedToken) parça parça "
+            "siler. Tabloların ve refresh'teki blacklist sorgusunun büyümemesi için günlük cron ile "
+            "çalıştırın, ör.: 15 4 * * * python manage.py prune_tokens")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000)
+
+    def handle(self, *args, **opts):
+        def progress(outstanding, blacklisted):
+            if opts['verbosity'] >= 2:
+                self.stdout.write(f"  {outstanding} token, {blacklisted} blacklist kaydı silindi")
+
+        r = tokens.prune_expired(chunk_size=opts['chunk_size'], progress=progress)
+        self.stdout.write(self.style.SUCCESS(
+            f"{r['outstanding']} süresi dolmuş token ve {r['blacklisted']} blacklist kaydı silindi "
+            f"({r['seconds']} sn)."
+        ))
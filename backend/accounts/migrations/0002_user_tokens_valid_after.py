@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customuser",
+            name="tokens_valid_after",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
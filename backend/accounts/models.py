@@ -10,6 +10,8 @@ class CustomUser(AbstractUser):
     )
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     role = models.CharField(max_length=20, choices=ROLE, default='musteri')
+    # "tüm cihazlardan çıkış": bu andan (iat saniyesi dahil) önce verilen access token'lar geçersiz
+    tokens_valid_after = models.DateTimeField(null=True, blank=True, editable=False)
 
     def __str__(self):
         return f"{self.username} ({self.role})"
\ No newline at end of file
@@ -2,11 +2,19 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
+from rest_framework_simplejwt import serializers as jwt_serializers
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from core import metrics
+from core.serializers import ModelSerializer
+
+from . import tokens
 
 User = get_user_model()
 
 
-class RegisterSerializer(serializers.ModelSerializer):
+class RegisterSerializer(ModelSerializer):
     email = serializers.EmailField(
         required=True, validators=[UniqueValidator(queryset=User.objects.all())]
     )
@@ -32,7 +40,43 @@ class RegisterSerializer(serializers.ModelSerializer):
         return user
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(ModelSerializer):
     class Meta:
         model = User
         fields = ("id", "username", "email")
+
+
+class TokenObtainPairSerializer(metrics.TimedSerializerMixin, jwt_serializers.TokenObtainPairSerializer):
+    """Token'lara kullanıcı claim'lerini ekler; last_login en çok LAST_LOGIN_INTERVAL'da bir yazılır."""
+
+    @classmethod
+    def get_token(cls, user):
+        return tokens.set_user_claims(super().get_token(user), user)
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        tokens.touch_last_login(self.user)
+        return data
+
+
+class TokenRefreshSerializer(metrics.TimedSerializerMixin, jwt_serializers.TokenRefreshSerializer):
+    """simplejwt'ninkiyle aynı (rotasyon + blacklist); claim'ler güncel kullanıcıdan yeniden yazılır."""
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        user = User.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first() if user_id else None
+        if not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages["no_active_account"], "no_active_account")
+        tokens.set_user_claims(refresh, user)
+
+        data = {"access": str(refresh.access_token)}
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data["refresh"] = str(refresh)
+        return data
@@ -0,0 +1,16 @@
+# accounts/signals.py
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import user_cache
+from .models import CustomUser
+
+
+@receiver([post_save, post_delete], sender=CustomUser)
+def invalidate_user(sender, instance, **kwargs):
+    # commit sonrası ikinci kez: arada eski satırı yükleyen isteğin girdisi de düşer
+    user_cache.invalidate(instance.pk)
+    transaction.on_commit(partial(user_cache.invalidate, instance.pk))
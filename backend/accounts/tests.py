@@ -1,3 +1,274 @@
-from django.test import TestCase
+import threading
+from datetime import timedelta
+from importlib.util import find_spec
+from io import StringIO
+from unittest import skipUnless
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from core.testing import QueryBudgetMixin
+
+from . import hashers, tokens, user_cache
+from . import urls as account_urls
+from .authentication import AsyncJWTAuthentication
+
+User = get_user_model()
+
+PASSWORD = 'Guclu.Sifre-2024'
+
+
+class AccountRouteBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # binlerce kullanıcı ve açık refresh token (tablolar boş değilken ölçülsün)
+        users = User.objects.bulk_create([User(username=f'u{i}', email=f'u{i}@ornek.com') for i in range(2000)])
+        expires = timezone.now() + timedelta(days=7)
+        OutstandingToken.objects.bulk_create([
+            OutstandingToken(user=u, jti=f'{u.pk.hex}{k}', token='x', expires_at=expires)
+            for u in users for k in range(3)
+        ], batch_size=2000)
+        cls.user = User.objects.create_user(username='musteri', email='m@ornek.com', password=PASSWORD)
+        cls.other = User.objects.create_user(username='diger', email='d@ornek.com', password=PASSWORD)
+
+    def test_account_routes(self):
+        u = self.user
+        self.assertBudget('register', None, 'post', '/account/auth/register/',
+                          {'username': 'yeni', 'email': 'yeni@ornek.com', 'password': PASSWORD, 'password2': PASSWORD},
+                          status=201, queries=3, ms=1500)
+        r = self.assertBudget('token', None, 'post', '/account/auth/token/',
+                              {'username': 'musteri', 'password': PASSWORD}, queries=3, ms=1500)
+        refresh, access = r.data['refresh'], r.data['access']
+        r = self.assertBudget('token-refresh', None, 'post', '/account/auth/token/refresh/',
+                              {'refresh': refresh}, queries=13)
+        self.assertBudget('token-verify', None, 'post', '/account/auth/token/verify/', {'token': access}, queries=1)
+        self.assertBudget('me', u, 'get', '/account/auth/me/', queries=1)
+        self.assertBudget('logout-get', u, 'get', '/account/auth/logout/', queries=1)
+        self.assertBudget('logout', u, 'post', '/account/auth/logout/', {'refresh': r.data['refresh']},
+                          status=205, queries=8)
+        self.assertBudget('change-password', u, 'post', '/account/auth/change-password/',
+                          {'old_password': PASSWORD, 'new_password': PASSWORD + '!', 'new_password2': PASSWORD + '!'},
+                          queries=2, ms=2500)
+
+        # çok cihazda oturum açmış kullanıcı; token sayısından bağımsız
+        # (kullanıcı + tokens_valid_after + select + bulk insert)
+        for _ in range(50):
+            RefreshToken.for_user(self.other)
+        self.assertBudget('logout-all', self.other, 'post', '/account/auth/logout-all/', queries=1 + 3)
+        self.assertRoutesBudgeted(account_urls.urlpatterns)
+
+
+class TokenBlacklistTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='musteri', email='m@ornek.com', password=PASSWORD)
+
+    def test_logout_all_blacklists_only_live_unlisted_tokens(self):
+        refreshes = [RefreshToken.for_user(self.user) for _ in range(3)]
+        refreshes[0].blacklist()
+        old = OutstandingToken.objects.create(user=self.user, jti='eski', token='x',
+                                              expires_at=timezone.now() - timedelta(days=1))
+        other = User.objects.create_user(username='diger', email='d@ornek.com', password=PASSWORD)
+        RefreshToken.for_user(other)
+
+        self.assertEqual(tokens.blacklist_all(self.user), 2)
+        self.assertEqual(set(BlacklistedToken.objects.values_list('token__jti', flat=True)),
+                         {r['jti'] for r in refreshes})
+        self.assertFalse(BlacklistedToken.objects.filter(token=old).exists())
+        self.assertEqual(tokens.blacklist_all(self.user), 0)
+
+        r = self.client.post('/account/auth/token/refresh/', {'refresh': str(refreshes[1])})
+        self.assertEqual(r.status_code, 401)
+
+    def test_prune_expired_in_chunks(self):
+        now = timezone.now()
+        live = [RefreshToken.for_user(self.user) for _ in range(2)]
+        live[0].blacklist()
+        expired = OutstandingToken.objects.bulk_create([
+            OutstandingToken(user=self.user, jti=f'eski{k}', token='x', expires_at=now - timedelta(hours=k + 1))
+            for k in range(7)
+        ])
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(token=t) for t in expired[:4]])
+
+        chunks = []
+        r = tokens.prune_expired(chunk_size=3, progress=lambda o, b: chunks.append((o, b)))
+        self.assertEqual((r['outstanding'], r['blacklisted']), (7, 4))
+        self.assertEqual([o for o, _ in chunks], [3, 6, 7])
+        self.assertEqual(set(OutstandingToken.objects.values_list('jti', flat=True)), {t['jti'] for t in live})
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+
+        out = StringIO()
+        call_command('prune_tokens', stdout=out)
+        self.assertIn('0 süresi dolmuş token', out.getvalue())
+
+
+@override_settings(AUTH_CLAIMS_MAX_AGE=300, AUTH_USER_CACHE_TTL=60)
+class FastJWTAuthTests(TestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.user = User.objects.create_user(username='gorevli', email='g@ornek.com', password=PASSWORD,
+                                             role='gorevli', is_staff=True)
+
+    def login(self, username='gorevli'):
+        r = self.client.post('/account/auth/token/', {'username': username, 'password': PASSWORD})
+        self.assertEqual(r.status_code, 200)
+        return r.data
+
+    def call(self, method, url, access, **data):
+        with CaptureQueriesContext(connection) as ctx:
+            r = getattr(self.client, method)(url, data, HTTP_AUTHORIZATION=f'Bearer {access}')
+        user_queries = [q for q in ctx.captured_queries if 'FROM "accounts_customuser"' in q['sql']]
+        return r.status_code, len(user_queries)
+
+    def test_reads_trust_fresh_claims_writes_use_cached_user(self):
+        access = self.login()['access']
+        self.assertEqual((AccessToken(access)['role'], AccessToken(access)['is_staff']), ('gorevli', True))
+
+        self.assertEqual(self.call('get', '/reservation/check-events/', access), (200, 0))
+        # yazma: ilk istek kullanıcıyı yükler, sonrakiler önbellekten
+        self.assertEqual(self.call('post', '/reservation/check-by-qr/', access, qr_token='x', tip='check_in')[1], 1)
+        self.assertEqual(self.call('post', '/reservation/check-by-qr/', access, qr_token='x', tip='check_in')[1], 0)
+        # claim'siz token (ör. eski sürümün token'ı) her zaman kullanıcı yolundan
+        self.assertEqual(self.call('get', '/reservation/check-events/', AccessToken.for_user(self.user)), (200, 0))
+
+        with override_settings(AUTH_CLAIMS_MAX_AGE=-1):
+            user_cache.clear()
+            self.assertEqual(self.call('get', '/reservation/check-events/', access), (200, 1))
+
+        r = self.client.get('/account/auth/me/', HTTP_AUTHORIZATION=f'Bearer {access}')
+        self.assertEqual(r.data['username'], 'gorevli')
+
+    def test_role_change_and_logout_all_take_effect(self):
+        access = self.login()['access']
+        self.call('post', '/reservation/check-by-qr/', access, qr_token='x', tip='check_in')  # önbelleğe al
+
+        self.user.is_staff = False
+        self.user.save()  # sinyal önbellek girdisini düşürür
+        with override_settings(AUTH_CLAIMS_MAX_AGE=-1):
+            self.assertEqual(self.call('get', '/reservation/check-events/', access)[0], 403)
+        # claim yolunda AUTH_CLAIMS_MAX_AGE dolana kadar eski rol geçerli
+        self.assertEqual(self.call('get', '/reservation/check-events/', access)[0], 200)
+
+        tokens_ = self.login()
+        self.assertFalse(AccessToken(tokens_['access'])['is_staff'])
+        r = self.client.post('/account/auth/logout-all/', HTTP_AUTHORIZATION=f'Bearer {access}')
+        self.assertEqual(r.status_code, 200)
+        status, _ = self.call('post', '/account/auth/logout-all/', tokens_['access'])
+        self.assertEqual(status, 401)
+        self.assertEqual(self.client.post('/account/auth/token/refresh/', {'refresh': tokens_['refresh']}).status_code, 401)
+
+        # sonraki saniyelerde alınan token geçerli
+        User.objects.filter(pk=self.user.pk).update(tokens_valid_after=timezone.now() - timedelta(seconds=2))
+        user_cache.clear()
+        self.assertEqual(self.call('post', '/account/auth/logout-all/', self.login()['access'])[0], 200)
+
+    def test_refresh_rewrites_claims(self):
+        refresh = self.login()['refresh']
+        self.user.role = 'yonetici'
+        self.user.save()
+        r = self.client.post('/account/auth/token/refresh/', {'refresh': refresh})
+        self.assertEqual(AccessToken(r.data['access'])['role'], 'yonetici')
+        self.assertEqual(RefreshToken(r.data['refresh'])['role'], 'yonetici')
+        self.assertEqual(self.client.post('/account/auth/token/refresh/', {'refresh': refresh}).status_code, 401)
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.post('/account/auth/token/refresh/', {'refresh': r.data['refresh']}).status_code, 401)
+
+    def test_last_login_written_at_most_once_per_interval(self):
+        self.login()
+        first = User.objects.get(pk=self.user.pk).last_login
+        self.assertIsNotNone(first)
+        with CaptureQueriesContext(connection) as ctx:
+            self.login()
+        self.assertFalse([q for q in ctx.captured_queries if q['sql'].startswith('UPDATE')])
+        with override_settings(LAST_LOGIN_INTERVAL=0):
+            self.login()
+        self.assertGreater(User.objects.get(pk=self.user.pk).last_login, first)
+
+    async def test_async_authenticator(self):
+        access = (await sync_to_async(self.login)())['access']
+        auth = AsyncJWTAuthentication()
+        get = RequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {access}')
+        user = await auth.aauthenticate(get)
+        self.assertTrue(user.from_claims)
+        self.assertEqual((user.pk, user.is_staff), (self.user.pk, True))
+        post = RequestFactory().post('/', HTTP_AUTHORIZATION=f'Bearer {access}')
+        user = await auth.aauthenticate(post)
+        self.assertFalse(getattr(user, 'from_claims', False))
+        self.assertEqual(user.username, 'gorevli')
+
+
+class PasswordHashingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='musteri', email='m@ornek.com', password=PASSWORD)
+
+    def login(self):
+        return self.client.post('/account/auth/token/', {'username': 'musteri', 'password': PASSWORD})
+
+    def stored(self):
+        return User.objects.get(pk=self.user.pk).password
+
+    def test_new_hashes_use_preferred_hasher(self):
+        self.assertTrue(self.stored().startswith(settings.PASSWORD_HASHER + '$'))
+        r = self.client.post('/account/auth/register/', {'username': 'yeni', 'email': 'y@ornek.com',
+                                                         'password': PASSWORD, 'password2': PASSWORD})
+        self.assertEqual(r.status_code, 201)
+        self.assertTrue(User.objects.get(username='yeni').password.startswith(settings.PASSWORD_HASHER + '$'))
+
+    @override_settings(PASSWORD_HASHERS=['accounts.hashers.ScryptPasswordHasher',
+                                         'accounts.hashers.PBKDF2PasswordHasher'])
+    def test_login_upgrades_legacy_hash_and_parameters(self):
+        User.objects.filter(pk=self.user.pk).update(password=make_password(PASSWORD, hasher='pbkdf2_sha256'))
+        self.assertEqual(self.login().status_code, 200)
+        self.assertTrue(self.stored().startswith('scrypt$16384$'))
+
+        with override_settings(PASSWORD_HASH_PARAMS={'scrypt': {'work_factor': 2**12, 'parallelism': 1}}):
+            self.assertEqual(self.login().status_code, 200)
+            self.assertTrue(self.stored().startswith('scrypt$4096$'))
+            self.assertRegex(self.stored(), r'\$8\$1\$')
+            before = self.stored()
+            self.login()
+            self.assertEqual(self.stored(), before)  # parametreler güncel: yeniden hash yok
+
+    @skipUnless(find_spec('argon2'), "argon2-cffi kurulu değil")
+    @override_settings(PASSWORD_HASHERS=['accounts.hashers.Argon2PasswordHasher',
+                                         'accounts.hashers.ScryptPasswordHasher'])
+    def test_argon2_parameters(self):
+        with override_settings(PASSWORD_HASH_PARAMS={'argon2': {'memory_cost': 8192}}):
+            self.assertEqual(self.login().status_code, 200)
+            self.assertIn('m=8192,t=2,p=1', self.stored())
+
+    @override_settings(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_QUEUE=0, PASSWORD_HASH_WAIT=0.05)
+    def test_hashing_runs_in_bounded_pool(self):
+        self.assertTrue(hashers.offload(lambda: threading.current_thread().name).startswith('pwhash'))
+
+        started, release = threading.Event(), threading.Event()
+        holder = threading.Thread(target=hashers.offload, args=(lambda: (started.set(), release.wait(5)),))
+        holder.start()
+        started.wait(5)
+        try:
+            r = self.login()
+            self.assertEqual(r.status_code, 503)
+            self.assertEqual(r['Retry-After'], '1')
+            # DRF dışı: admin girişi de 500 değil 503
+            r = self.client.post('/admin/login/', {'username': 'musteri', 'password': PASSWORD})
+            self.assertEqual((r.status_code, r['Retry-After']), (503, '1'))
+            with self.assertRaises(hashers.HashingBusy):  # createsuperuser/changepassword gibi komutlar
+                make_password(PASSWORD)
+        finally:
+            release.set()
+            holder.join()
+        self.assertEqual(self.login().status_code, 200)
+
+    @override_settings(PASSWORD_HASH_WORKERS=0)
+    def test_pool_can_be_disabled(self):
+        self.assertEqual(hashers.offload(threading.get_ident), threading.get_ident())
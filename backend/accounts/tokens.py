@@ -0,0 +1,81 @@
+# accounts/tokens.py
+"""
+Token claim'leri ve refresh token blacklist işlemleri (simplejwt token_blacklist tabloları).
+
+Access/refresh token'lar USER_CLAIMS'i taşır; authentication.FastJWTAuthentication
+okuma isteklerinde kullanıcıyı veritabanına gitmeden bunlardan kurar.
+
+ROTATE_REFRESH_TOKENS + BLACKLIST_AFTER_ROTATION açıkken her refresh bir
+OutstandingToken ve bir BlacklistedToken satırı bırakır; süresi dolanlar
+prune_expired() ile (prune_tokens komutu, cron) parça parça silinir.
+"""
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+
+USER_CLAIMS = ('role', 'is_staff')
+
+
+def set_user_claims(token, user):
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    return token
+
+
+def touch_last_login(user):
+    """last_login'i en çok LAST_LOGIN_INTERVAL saniyede bir yaz (her token alımında değil)."""
+    now = timezone.now()
+    interval = getattr(settings, 'LAST_LOGIN_INTERVAL', 3600)
+    if user.last_login is None or (now - user.last_login).total_seconds() >= interval:
+        # update(): sinyal yok, user_cache'teki satır geçerli kalır (last_login kimlik doğrulamada kullanılmaz)
+        type(user).objects.filter(pk=user.pk).update(last_login=now)
+        user.last_login = now
+
+
+def blacklist_all(user):
+    """
+    Kullanıcının süresi dolmamış, henüz blacklist'te olmayan tüm refresh
+    token'larını tek bulk insert ile blacklist'e al ve şu ana kadar verilmiş
+    access token'ları geçersiz say (tokens_valid_after). Döner: eklenen sayı.
+    """
+    user.tokens_valid_after = timezone.now()
+    user.save(update_fields=['tokens_valid_after'])  # sinyal: user_cache girdisi düşer
+    ids = list(OutstandingToken.objects.filter(
+        user=user, expires_at__gt=timezone.now(), blacklistedtoken__isnull=True,
+    ).values_list('pk', flat=True))
+    # arada başka bir istek aynı token'ı eklediyse unique token_id çakışması atlanır
+    BlacklistedToken.objects.bulk_create([BlacklistedToken(token_id=pk) for pk in ids],
+                                         ignore_conflicts=True, batch_size=1000)
+    return len(ids)
+
+
+def prune_expired(chunk_size=5000, now=None, progress=None):
+    """
+    Süresi dolmuş OutstandingToken'ları (ve CASCADE ile BlacklistedToken'larını)
+    chunk_size'lık parçalar halinde, her parça kendi transaction'ında sil.
+    Süresi dolan refresh token zaten reddedildiği için blacklist kaydı gereksizdir.
+    Döner: {'outstanding', 'blacklisted', 'seconds'}; progress(outstanding, blacklisted).
+    """
+    now = now or timezone.now()
+    expired = OutstandingToken.objects.filter(expires_at__lte=now).order_by('pk').values_list('pk', flat=True)
+    outstanding = blacklisted = 0
+    started = time.perf_counter()
+    while True:
+        ids = list(expired[:chunk_size])
+        if not ids:
+            break
+        with transaction.atomic():
+            _, counts = OutstandingToken.objects.filter(pk__in=ids).delete()
+        outstanding += counts.get(OutstandingToken._meta.label, 0)
+        blacklisted += counts.get(BlacklistedToken._meta.label, 0)
+        if progress:
+            progress(outstanding, blacklisted)
+    return {
+        'outstanding': outstanding,
+        'blacklisted': blacklisted,
+        'seconds': round(time.perf_counter() - started, 3),
+    }
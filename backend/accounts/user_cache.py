@@ -0,0 +1,121 @@
+# accounts/user_cache.py
+"""
+JWT kimlik doğrulaması için süreç içi kullanıcı önbelleği (authentication.py).
+
+Kullanıcı satırı (model örneği değil, alan değerleri) id ile kısa süreli
+tutulur; her istek kendi taze örneğini alır, view'lar örneği değiştirse de
+önbellek etkilenmez.
+
+- CustomUser save/delete sinyali o kullanıcının girdisini siler (signals.py);
+  QuerySet.update() sinyal göndermez, kullanıcıyı değiştiren kod save() kullanmalı.
+- Sinyal yalnızca kaydı yapan süreçte çalışır; diğer worker'lar
+  AUTH_USER_CACHE_TTL saniye içinde yeni değeri görür.
+- AUTH_USER_CACHE_SIZE girdiden sonra en eski kullanılan atılır.
+"""
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+
+_MISSING = object()
+
+_entries = OrderedDict()  # str(user id) -> (bitiş zamanı, satır | None)
+_counts = Counter()
+_lock = threading.Lock()
+_generation = 0  # clear() ile artar; yükleme sırasında boşaltılmışsa sonuç yazılmaz
+_pending = {}  # str(user id) -> yükleme başladığındaki nesil; invalidate() sırasında yüklenen yazılmaz
+
+
+def _maxsize():
+    return getattr(settings, 'AUTH_USER_CACHE_SIZE', 10_000)
+
+
+def _ttl():
+    return getattr(settings, 'AUTH_USER_CACHE_TTL', 60)
+
+
+def _fields():
+    return [f.attname for f in get_user_model()._meta.concrete_fields]
+
+
+def _lookup(key):
+    now = time.monotonic()
+    with _lock:
+        expires, row = _entries.get(key, (0, _MISSING))
+        if expires > now:
+            _entries.move_to_end(key)
+            _counts['hits'] += 1
+            return row, None
+        _counts['misses'] += 1
+        _pending[key] = _generation
+        return _MISSING, _generation
+
+
+def _store(key, gen, row):
+    with _lock:
+        # yükleme sürerken invalidate()/clear() olduysa eski satırı yazma
+        if _pending.pop(key, None) != gen or gen != _generation:
+            return
+        _entries[key] = (time.monotonic() + _ttl(), row)
+        _entries.move_to_end(key)
+        while len(_entries) > _maxsize():
+            _entries.popitem(last=False)
+            _counts['evictions'] += 1
+
+
+def _instance(row):
+    if row is None:
+        return None
+    return get_user_model().from_db(DEFAULT_DB_ALIAS, _fields(), row)
+
+
+def get(pk):
+    """Kullanıcı (her çağrıda yeni örnek) ya da yoksa None."""
+    row, gen = _lookup(str(pk))
+    if row is _MISSING:
+        row = get_user_model().objects.filter(pk=pk).values_list(*_fields()).first()
+        _store(str(pk), gen, row)
+    return _instance(row)
+
+
+async def aget(pk):
+    row, gen = _lookup(str(pk))
+    if row is _MISSING:
+        row = await get_user_model().objects.filter(pk=pk).values_list(*_fields()).afirst()
+        _store(str(pk), gen, row)
+    return _instance(row)
+
+
+def invalidate(pk):
+    with _lock:
+        _entries.pop(str(pk), None)
+        _pending.pop(str(pk), None)
+        _counts['invalidations'] += 1
+
+
+def clear():
+    global _generation
+    with _lock:
+        _generation += 1
+        _entries.clear()
+        _pending.clear()
+        _counts['invalidations'] += 1
+
+
+def stats():
+    with _lock:
+        counts = dict(_counts)
+        size = len(_entries)
+    lookups = counts.get('hits', 0) + counts.get('misses', 0)
+    return {
+        'hits': counts.get('hits', 0),
+        'misses': counts.get('misses', 0),
+        'evictions': counts.get('evictions', 0),
+        'invalidations': counts.get('invalidations', 0),
+        'size': size,
+        'maxsize': _maxsize(),
+        'hit_ratio': round(counts.get('hits', 0) / lookups, 4) if lookups else 0.0,
+    }
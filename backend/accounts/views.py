@@ -3,6 +3,9 @@ from rest_framework import generics, permissions, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.serializers import Serializer
+from . import tokens
 from .serializers import RegisterSerializer, UserSerializer
 from rest_framework import serializers
 
@@ -16,11 +19,12 @@ class RegisterView(generics.CreateAPIView):
 # Oturum sahibi kullanıcı
 class MeView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    stateless_auth = False  # username/email token'da yok
     def get(self, request):
         return Response(UserSerializer(request.user).data)
 
 # Şifre değiştirme
-class ChangePasswordSerializer(serializers.Serializer):
+class ChangePasswordSerializer(Serializer):
     old_password = serializers.CharField(write_only=True)
     new_password = serializers.CharField(write_only=True)
     new_password2 = serializers.CharField(write_only=True)
@@ -63,20 +67,9 @@ class LogoutView(APIView):
         return Response({"detail": "Logout için POST kullanın."})
 
 
-
-from rest_framework.views import APIView
-from rest_framework.response import Response
-from rest_framework import permissions, status
-from rest_framework_simplejwt.token_blacklist.models import (
-    OutstandingToken, BlacklistedToken
-)
-
 class LogoutAllView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request):
-        user = request.user
-        tokens = OutstandingToken.objects.filter(user=user)
-        for t in tokens:
-            BlacklistedToken.objects.get_or_create(token=t)
-        return Response({"detail": "Tüm cihazlardan çıkış yapıldı."}, status=status.HTTP_200_OK)
\ No newline at end of file
+        tokens.blacklist_all(request.user)
+        return Response({"detail": "Tüm cihazlardan çıkış yapıldı."}, status=status.HTTP_200_OK)
@@ -5,12 +5,55 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
+
+/reservation/async/ altındaki gate ve lot okuma uçları (reservations/async_views.py)
+kısa bir middleware zinciriyle karşılanır. MiddlewareMixin tabanlı Django
+middleware'leri ASGI'de process_request/response'u her istekte thread'e atlatır;
+bu uçlar JWT'li JSON API olduğundan oturum/CSRF/mesaj katmanlarına ihtiyaç duymaz.
+Diğer tüm yollar normal Django uygulamasına gider.
 """
 
 import os
 
 from django.core.asgi import get_asgi_application
+from django.core.exceptions import ImproperlyConfigured
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.exception import convert_exception_to_response
+from django.utils.module_loading import import_string
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+HOT_PATH_PREFIX = "/reservation/async/"
+
+
+class HotPathASGIHandler(ASGIHandler):
+    """Yalnızca async-native middleware'lerle çalışan ASGIHandler."""
+
+    middleware = (
+        "core.metrics.PerfMiddleware",
+        "corsheaders.middleware.CorsMiddleware",
+        "core.routers.ReplicaPinMiddleware",
+    )
+
+    def load_middleware(self, is_async=False):
+        self._view_middleware = []
+        self._template_response_middleware = []
+        self._exception_middleware = []
+        handler = convert_exception_to_response(self._get_response_async)
+        for path in reversed(self.middleware):
+            middleware = import_string(path)
+            if not getattr(middleware, "async_capable", False):
+                raise ImproperlyConfigured(f"{path} async desteklemiyor; kısa zincirde kullanılamaz.")
+            handler = convert_exception_to_response(middleware(handler))
+        self._middleware_chain = handler
+
+
+hot_path_application = HotPathASGIHandler()
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "http" and scope["path"].startswith(HOT_PATH_PREFIX):
+        return await hot_path_application(scope, receive, send)
+    return await django_application(scope, receive, send)
@@ -0,0 +1,283 @@
+# core/metrics.py
+"""
+İstek düzeyinde performans ölçümü.
+
+PerfMiddleware her istekte şunları ölçer:
+- toplam süre (middleware zincirinin tamamı; MIDDLEWARE'de en başta durur)
+- veritabanı sorgu sayısı ve süresi (her bağlantıya takılan execute_wrapper;
+  DEBUG gerekmez, async ORM'in çalıştığı thread'de de contextvar ile isteği bulur)
+- serializer süresi (TimedSerializerMixin'li serializer'larda doğrulama +
+  temsil üretimi; içinde tetiklenen sorgular DB'ye sayılır). DRF'ye yama
+  yapılmaz; karışım projenin serializer tabanlarında (core/serializers.py) takılı.
+- yanıt boyutu (streaming yanıtlarda yalnızca Content-Length varsa)
+
+Sonuçlar Server-Timing başlığına yazılır (PERF_SERVER_TIMING) ve süreç içi
+histogramlarda view/action/method etiketleriyle toplanır. /metrics/ (yalnızca
+admin) bunları Prometheus metin formatında verir. Sayaçlar süreç yereldir;
+çok worker'lı kurulumda her worker ayrı kazınır.
+
+Ek metrikler register_collector() ile eklenir (ör. önbellek istatistikleri).
+Middleware hem sync hem async çalışır; ASGI'de araya thread geçişi eklemez.
+"""
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+UNRESOLVED = ('unresolved', '', '')
+
+_current = ContextVar('perf_request_stats', default=None)
+
+
+class RequestStats:
+    """Tek isteğin sayaçları (_current contextvar'ında)."""
+    __slots__ = ('queries', 'db', 'ser', 'in_ser')
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.ser = 0.0
+        self.in_ser = False
+
+
+def _db_hook(execute, sql, params, many, context):
+    st = _current.get()
+    if st is None:
+        return execute(sql, params, many, context)
+    started = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        st.db += perf_counter() - started
+        st.queries += 1
+
+
+def _install_db_hook(connection, **kwargs):
+    # Başa eklenir: connection.execute_wrapper() bloğu çıkarken son elemanı atar,
+    # blok içinde açılan bağlantıda bizimki sona eklenirse onunkinin yerine düşerdi.
+    if _db_hook not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _db_hook)
+
+
+connection_created.connect(_install_db_hook)
+
+
+def _timed(fn, *args):
+    st = _current.get()
+    if st is None or st.in_ser:  # istek dışı ya da iç içe çağrı
+        return fn(*args)
+    st.in_ser = True
+    db_before = st.db
+    started = perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        st.ser += perf_counter() - started - (st.db - db_before)
+        st.in_ser = False
+
+
+class TimedSerializerMixin:
+    """
+    Serializer karışımı: doğrulama (run_validation) ve temsil (to_representation)
+    süresi isteğin serializer sayacına. many=True'da ListSerializer her öğe için
+    bunları çağırır; iç içe serializer'lar dıştakinin süresine dahildir.
+    """
+
+    def run_validation(self, *args, **kwargs):
+        return _timed(lambda: super(TimedSerializerMixin, self).run_validation(*args, **kwargs))
+
+    def to_representation(self, instance):
+        return _timed(super().to_representation, instance)
+
+
+class Histogram:
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # son kova +Inf
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Series:
+    __slots__ = ('duration', 'db_duration', 'db_queries', 'serializer_duration', 'response_size', 'statuses')
+
+    def __init__(self):
+        self.duration = Histogram(DURATION_BUCKETS)
+        self.db_duration = Histogram(DURATION_BUCKETS)
+        self.db_queries = Histogram(QUERY_BUCKETS)
+        self.serializer_duration = Histogram(DURATION_BUCKETS)
+        self.response_size = Histogram(SIZE_BUCKETS)
+        self.statuses = {}
+
+
+HISTOGRAMS = (
+    ('duration', 'otopark_request_duration_seconds', "İstek süresi (middleware dahil)"),
+    ('db_duration', 'otopark_request_db_duration_seconds', "İstek başına veritabanı süresi"),
+    ('db_queries', 'otopark_request_db_queries', "İstek başına sorgu sayısı"),
+    ('serializer_duration', 'otopark_request_serializer_duration_seconds',
+     "İstek başına serializer süresi (sorgular hariç)"),
+    ('response_size', 'otopark_response_size_bytes', "Yanıt gövdesi boyutu"),
+)
+
+_series = {}  # (view, action, method) -> Series
+_lock = threading.Lock()
+_collectors = []
+
+
+def observe(labels, status, wall, st, size):
+    with _lock:
+        s = _series.get(labels)
+        if s is None:
+            s = _series[labels] = Series()
+        s.duration.observe(wall)
+        s.db_duration.observe(st.db)
+        s.db_queries.observe(st.queries)
+        s.serializer_duration.observe(st.ser)
+        if size is not None:
+            s.response_size.observe(size)
+        s.statuses[status] = s.statuses.get(status, 0) + 1
+
+
+def reset():
+    with _lock:
+        _series.clear()
+
+
+def register_collector(fn):
+    """fn() -> [(ad, tip, açıklama, [(etiketler, değer), ...]), ...]; /metrics/ her kazımada çağırır."""
+    if fn not in _collectors:
+        _collectors.append(fn)
+
+
+def view_labels(view_func, method):
+    """(sınıf, action, method); viewset dışı view'larda action = handler adı."""
+    cls = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+    method = method.lower()
+    if cls is None:
+        return getattr(view_func, '__name__', 'view'), method, method.upper()
+    actions = getattr(view_func, 'actions', None)
+    action = actions.get(method, method) if actions else method
+    return cls.__name__, action, method.upper()
+
+
+class PerfMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        for conn in connections.all(initialized_only=True):  # sinyalden önce açılmış olanlar
+            _install_db_hook(conn)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        st = RequestStats()
+        token = _current.set(st)
+        started = perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, st, perf_counter() - started)
+
+    async def __acall__(self, request):
+        st = RequestStats()
+        token = _current.set(st)
+        started = perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, st, perf_counter() - started)
+
+    def _finish(self, request, response, st, wall):
+        # process_view kullanılmaz: ASGI'de sync process_view her istekte thread'e atlatılır
+        match = request.resolver_match
+        labels = view_labels(match.func, request.method) if match else UNRESOLVED
+        if response.streaming:
+            size = int(response['Content-Length']) if response.has_header('Content-Length') else None
+        else:
+            size = len(response.content)
+        observe(labels, response.status_code, wall, st, size)
+
+        if getattr(settings, 'PERF_SERVER_TIMING', True):
+            response['Server-Timing'] = (
+                f'app;dur={wall * 1000:.2f}, db;dur={st.db * 1000:.2f};desc="{st.queries} sorgu", '
+                f'ser;dur={st.ser * 1000:.2f}'
+            )
+        return response
+
+
+# ---- Prometheus metin formatı ----
+def _esc(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(pairs):
+    return '{' + ','.join(f'{k}="{_esc(v)}"' for k, v in pairs) + '}' if pairs else ''
+
+
+def _num(value):
+    return repr(round(value, 6)) if isinstance(value, float) else str(value)
+
+
+def render():
+    with _lock:
+        snapshot = sorted(_series.items())
+        lines = []
+        for attr, name, help_text in HISTOGRAMS:
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+            for (view, action, method), s in snapshot:
+                h = getattr(s, attr)
+                if not h.count:
+                    continue
+                base = (('view', view), ('action', action), ('method', method))
+                cumulative = 0
+                for bound, n in zip(h.bounds + ('+Inf',), h.counts):
+                    cumulative += n
+                    lines.append(f'{name}_bucket{_labels(base + (("le", bound),))} {cumulative}')
+                lines.append(f'{name}_sum{_labels(base)} {_num(h.sum)}')
+                lines.append(f'{name}_count{_labels(base)} {h.count}')
+
+        name = 'otopark_requests_total'
+        lines += [f'# HELP {name} Yanıt durumuna göre istek sayısı', f'# TYPE {name} counter']
+        for (view, action, method), s in snapshot:
+            for status, n in sorted(s.statuses.items()):
+                lines.append(f'{name}{_labels((("view", view), ("action", action), ("method", method), ("status", status)))} {n}')
+
+    for collect in _collectors:
+        for name, kind, help_text, samples in collect():
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+            lines += [f'{name}{_labels(tuple(labels.items()))} {_num(value)}' for labels, value in samples]
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsView(APIView):
+    """Prometheus kazıma ucu (yalnızca admin)."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return HttpResponse(render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,130 @@
+# core/routers.py
+"""
+Okuma replikası yönlendirmesi (DATABASE_ROUTERS).
+
+settings.REPLICA_DATABASE (DATABASE_REPLICA_URL / SQLITE_REPLICA_PATH verilince
+"replica") tanımlıysa, ReplicaReadMixin'li DRF view'larda güvenli metotların
+(GET/HEAD/OPTIONS) okumaları replikaya gider. Diğer her şey (yazmalar, mixin'siz
+view'lar, komutlar) birincil veritabanını kullanır.
+
+Kendi yazdığını okuma: POST/PUT/PATCH/DELETE başarılı olunca ReplicaPinMiddleware
+kullanıcıyı REPLICA_PIN_SECONDS boyunca birincile sabitler (kimliği doğrulanmışsa
+önbellekte kullanıcı id'siyle, değilse çerezle). Süre, replikasyon gecikmesinden
+uzun tutulmalı. Önbellekteki sabitleme yalnızca paylaşılan önbellekte (Redis)
+tüm worker'larda görünür; locmem'de A worker'ının sabitlemesini B görmez. Bu
+yüzden settings, replika tanımlıysa REDIS_URL ister (REPLICA_LOCAL_PIN=1 ile
+yalnızca tek süreçli yerel deneme).
+
+Replika birincilin kopyasıdır, migrate edilmez. SQLite ile yerel deneme:
+    cp db.sqlite3 replica.sqlite3
+    SQLITE_REPLICA_PATH=replica.sqlite3 REPLICA_LOCAL_PIN=1 python manage.py runserver --nothreading
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+PIN_COOKIE = 'db_pin'
+
+_read_db = ContextVar('replica_read_db', default=None)
+
+
+def read_db():
+    """Şu an okumaların gittiği alias (yönlendirme yoksa None = birincil)."""
+    return _read_db.get()
+
+
+@contextmanager
+def primary():
+    """Blok içindeki okumalar birincilden (ör. paylaşılan önbelleği doldururken)."""
+    token = _read_db.set(None)
+    try:
+        yield
+    finally:
+        _read_db.reset(token)
+
+
+def _pin_key(user):
+    return f'db-pin:{user.pk}'
+
+
+def is_pinned(request):
+    if request.COOKIES.get(PIN_COOKIE):
+        return True
+    user = getattr(request, 'user', None)
+    return bool(user is not None and user.is_authenticated and cache.get(_pin_key(user)))
+
+
+def replica_for(request):
+    """İsteğin okumaları için replika alias'ı ya da None."""
+    alias = getattr(settings, 'REPLICA_DATABASE', None)
+    if alias is None or request.method not in SAFE_METHODS or is_pinned(request):
+        return None
+    return alias
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_db.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True  # replika birincilin kopyası
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != getattr(settings, 'REPLICA_DATABASE', None)
+
+
+class ReplicaReadMixin:
+    """DRF view karışımı: güvenli metotlarda okumalar replikadan (kullanıcı sabitlenmemişse)."""
+
+    def dispatch(self, request, *args, **kwargs):
+        token = _read_db.set(None)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            _read_db.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)  # kimlik doğrulama burada; sabitleme kullanıcıya bağlı
+        alias = replica_for(request)
+        if alias is not None:
+            _read_db.set(alias)
+
+
+class ReplicaPinMiddleware:
+    """Başarılı yazmadan sonra kullanıcıyı REPLICA_PIN_SECONDS boyunca birincile sabitle."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self._pin(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self._pin(request, await self.get_response(request))
+
+    def _pin(self, request, response):
+        if (request.method in SAFE_METHODS or response.status_code >= 400
+                or getattr(settings, 'REPLICA_DATABASE', None) is None):
+            return response
+        seconds = getattr(settings, 'REPLICA_PIN_SECONDS', 10)
+        user = getattr(request, 'user', None)  # DRF, JWT kullanıcısını da buraya yazar
+        if user is not None and user.is_authenticated:
+            cache.set(_pin_key(user), 1, seconds)
+        else:
+            response.set_cookie(PIN_COOKIE, '1', max_age=seconds, httponly=True, samesite='Lax')
+        return response
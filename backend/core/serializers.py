@@ -0,0 +1,18 @@
+# core/serializers.py
+"""
+Projenin serializer tabanları. Süre ölçümü (metrics.TimedSerializerMixin) burada
+takılır; uygulamalar rest_framework.serializers.Serializer/ModelSerializer yerine
+bunlardan türetir. Tabanı üçüncü taraf olanlar (simplejwt) karışımı doğrudan alır.
+Testler, proje modüllerinde ölçümsüz serializer kalmadığını denetler.
+"""
+from rest_framework import serializers
+
+from core import metrics
+
+
+class Serializer(metrics.TimedSerializerMixin, serializers.Serializer):
+    pass
+
+
+class ModelSerializer(metrics.TimedSerializerMixin, serializers.ModelSerializer):
+    pass
@@ -10,9 +10,15 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from datetime import timedelta
+from importlib.util import find_spec
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
+from core.db import database_config, replica_config
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -46,14 +52,17 @@ INSTALLED_APPS = [
 ]
 AUTH_USER_MODEL = 'accounts.CustomUser'
 MIDDLEWARE = [
+    "core.metrics.PerfMiddleware",  # en başta: toplam süre tüm zinciri kapsasın
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "accounts.hashers.HashingBusyMiddleware",  # admin girişi: hash havuzu dolu -> 503
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     'corsheaders.middleware.CorsMiddleware',
+    "core.routers.ReplicaPinMiddleware",
 ]
 
 ROOT_URLCONF = "core.urls"
@@ -82,13 +91,25 @@ WSGI_APPLICATION = "core.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# DATABASE_URL varsa PostgreSQL (kalıcı bağlantı / DB_POOL ile psycopg havuzu), yoksa
+# WAL + IMMEDIATE transaction'lı SQLite. Ayrıntılar ve diğer değişkenler: core/db.py
 DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
+    "default": database_config(os.environ, BASE_DIR),
 }
 
+# Okuma replikası: DATABASE_REPLICA_URL / SQLITE_REPLICA_PATH verilirse katalog,
+# tarife, check-event ve rapor GET'leri oradan okunur (core/routers.py).
+# Yazmadan sonraki sabitleme önbellekte tutulur; worker'lar arasında görünmesi için
+# Redis (REDIS_URL) gerekir. Tek süreçli yerel denemede REPLICA_LOCAL_PIN=1 verilebilir.
+if _replica := replica_config(os.environ):
+    if not os.environ.get("REDIS_URL") and not os.environ.get("REPLICA_LOCAL_PIN"):
+        raise ImproperlyConfigured(
+            "Okuma replikası paylaşılan önbellek ister (REDIS_URL); tek süreç için REPLICA_LOCAL_PIN=1.")
+    DATABASES["replica"] = _replica
+REPLICA_DATABASE = "replica" if _replica else None
+REPLICA_PIN_SECONDS = 10  # yazmadan sonra birincilden okuma süresi (replikasyon gecikmesinden uzun)
+DATABASE_ROUTERS = ["core.routers.ReplicaRouter"]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -109,6 +130,21 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Şifre hash politikası (accounts/hashers.py). PASSWORD_HASHER: argon2 (argon2-cffi kuruluysa
+# varsayılan) | scrypt | pbkdf2_sha256. Listedeki diğerleri yalnızca eski hash'leri doğrular;
+# girişte eski hash'ler tercih edilen algoritma/parametrelerle yeniden hash'lenir.
+_HASHERS = {
+    "argon2": "accounts.hashers.Argon2PasswordHasher",
+    "scrypt": "accounts.hashers.ScryptPasswordHasher",
+    "pbkdf2_sha256": "accounts.hashers.PBKDF2PasswordHasher",
+}
+PASSWORD_HASHER = os.environ.get("PASSWORD_HASHER") or ("argon2" if find_spec("argon2") else "scrypt")
+PASSWORD_HASHERS = [_HASHERS[PASSWORD_HASHER]] + [h for k, h in _HASHERS.items() if k != PASSWORD_HASHER]
+PASSWORD_HASH_PARAMS = {}  # ör. {"scrypt": {"work_factor": 2**15, "parallelism": 2}}; boşsa OWASP değerleri
+PASSWORD_HASH_WORKERS = None  # eşzamanlı hash sayısı; None: çekirdek sayısının yarısı, 0: havuz kapalı
+PASSWORD_HASH_QUEUE = 64      # havuzu bekleyebilecek istek sayısı
+PASSWORD_HASH_WAIT = 5        # sn; kuyruk doluysa bu kadar beklenir, sonra 503 + Retry-After
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
 
@@ -133,18 +169,67 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.FastJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.AllowAny",
     ),
+    "EXCEPTION_HANDLER": "accounts.hashers.exception_handler",  # hash havuzu dolu -> 503
 }
 
+# Doluluk motoru dilim genişliği (reservations/availability.py)
+OCCUPANCY_BUCKET_MINUTES = 15
+
+# İmzalı QR token'lar (reservations/qr.py). Gate cihazlarıyla paylaşılan anahtar;
+# boşsa SECRET_KEY'den türetilir. Check-in, rezervasyon penceresinin bu kadar dakika
+# öncesi/sonrasına kadar kabul edilir.
+QR_SIGNING_KEY = None
+QR_CHECKIN_GRACE_MINUTES = 30
+
+# Önbellek: varsayılan süreç içi locmem; REDIS_URL verilirse Redis (süreçler arası paylaşılır).
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "otopark",
+        }
+    }
+
+# Lot/tarife katalog önbelleği (reservations/catalog_cache.py)
+CATALOG_CACHE_ALIAS = "default"
+CATALOG_CACHE_TIMEOUT = 300  # sn; sinyaller sürümü artırdığı için yalnızca bellek sınırı
+
+# Fiyatlamada süreç içi tarife önbelleği (reservations/rateplan_cache.py)
+RATEPLAN_CACHE_SIZE = 1024
+RATEPLAN_CACHE_TTL = 60  # sn; diğer worker'ların bir tarife değişikliğini görme süresi
+
+# Anlık doluluk yayını (reservations/live.py, /reservation/async/lots/live/)
+if os.environ.get("REDIS_URL"):
+    LIVE_BROKER = "reservations.live.RedisBroker"
+    LIVE_REDIS_URL = os.environ["REDIS_URL"]
+else:
+    LIVE_BROKER = "reservations.live.LocalBroker"
+LIVE_HEARTBEAT_SECONDS = 15
+LIVE_QUEUE_SIZE = 100  # istemci başına; dolarsa "resync"
+LIVE_REPLAY = 1000     # Last-Event-ID ile yeniden gönderilebilen son olay sayısı
+
+# İstek ölçümü (core/metrics.py): Server-Timing başlığı; histogramlar /metrics/ altında
+PERF_SERVER_TIMING = True
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "ROTATE_REFRESH_TOKENS": True,          # her refresh’te yeni refresh üret
     "BLACKLIST_AFTER_ROTATION": True,        # eski refresh’i blacklist’e at
-    "UPDATE_LAST_LOGIN": True,
+    "UPDATE_LAST_LOGIN": False,              # accounts.tokens.touch_last_login (LAST_LOGIN_INTERVAL)
+    "TOKEN_OBTAIN_SERIALIZER": "accounts.serializers.TokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "accounts.serializers.TokenRefreshSerializer",
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
\ No newline at end of file
@@ -0,0 +1,91 @@
+# core/testing.py
+"""
+Uygulamaların testlerinde ortak yardımcılar.
+
+QueryBudgetMixin: route başına sorgu bütçesi (her zaman) ve gecikme bütçesi.
+Gecikme duvar saatine bağlı olduğundan yalnızca PERF_BUDGET_SCALE ortam
+değişkeni verilince kontrol edilir (ör. 1; yavaş makinede 3).
+asgi=True ile istek AsyncClient üzerinden (async view'lar) gider.
+assertRoutesBudgeted, bütçesi olmayan adlı route kalırsa testi düşürür.
+"""
+import os
+import time
+from urllib.parse import urlsplit
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, resolve
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts import user_cache
+
+
+def _budget_scale():
+    value = os.environ.get('PERF_BUDGET_SCALE')
+    return float(value) if value else None
+
+
+def route_names(patterns):
+    """urlpatterns'teki (include'lar dahil) adlı route'lar."""
+    names = set()
+    for p in patterns:
+        if isinstance(p, URLResolver):
+            names |= route_names(p.url_patterns)
+        elif p.name:
+            names.add(p.name)
+    return names
+
+
+class QueryBudgetMixin:
+    budget_scale = _budget_scale()  # None: gecikme kontrol edilmez
+
+    def setUp(self):
+        super().setUp()
+        self.budgeted_routes = set()
+
+    def call(self, user, method, url, data=None, asgi=False):
+        auth = f'Bearer {AccessToken.for_user(user)}' if user is not None else None
+        if asgi:
+            send = async_to_sync(getattr(AsyncClient(), method))  # ORM çağrıları bu thread'de: sorgular sayılır
+            kwargs = {'headers': {'Authorization': auth} if auth else {}}
+            if method != 'get':
+                kwargs['content_type'] = 'application/json'
+        else:
+            client = APIClient()
+            if auth:
+                client.credentials(HTTP_AUTHORIZATION=auth)
+            send = getattr(client, method)
+            kwargs = {'format': 'json'}
+        cache.clear()  # önbelleksiz yol ölçülür
+        user_cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            r = send(url, data, **kwargs)
+            if r.streaming and not asgi:
+                b''.join(r.streaming_content)
+            elapsed = (time.perf_counter() - started) * 1000
+        return r, len(ctx.captured_queries), elapsed, ctx.captured_queries
+
+    def assertBudget(self, name, user, method, url, data=None, status=200, queries=None, ms=200, asgi=False):
+        self.budgeted_routes.add(resolve(urlsplit(url).path).url_name)
+        r, n, elapsed, captured = self.call(user, method, url, data, asgi)
+        with self.subTest(route=name):
+            self.assertEqual(r.status_code, status, r.content[:500] if asgi else getattr(r, 'data', None))
+            self.assertLessEqual(n, queries, f"{name}: {n} sorgu (bütçe {queries})\n" +
+                                 "\n".join(q['sql'][:200] for q in captured))
+            if self.budget_scale is None:
+                return r
+            limit = ms * self.budget_scale
+            if method == 'get' and elapsed > limit:
+                elapsed = min(elapsed, self.call(user, method, url, data, asgi)[2])  # ısınma payı
+            self.assertLessEqual(elapsed, limit, f"{name}: {elapsed:.1f} ms (bütçe {ms})")
+        return r
+
+    def assertRoutesBudgeted(self, patterns, exempt=()):
+        """patterns'teki her adlı route en az bir assertBudget'tan geçmiş olmalı (exempt: ad -> neden)."""
+        missing = route_names(patterns) - self.budgeted_routes - set(exempt)
+        self.assertFalse(missing, f"bütçesi olmayan route'lar: {sorted(missing)}")
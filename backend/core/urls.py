@@ -1,6 +1,8 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from core.metrics import MetricsView
+
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -8,4 +10,7 @@ urlpatterns = [
     # API endpointleri
     path('reservation/', include('reservations.urls')),
     path('account/', include('accounts.urls')),
+
+    # Prometheus kazıma ucu (yalnızca admin)
+    path('metrics/', MetricsView.as_view(), name='metrics'),
 ]
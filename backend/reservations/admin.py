@@ -1,3 +1,22 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 
-# Register your models here.
+from . import repricing
+from .models import RatePlan
+
+
+@admin.register(RatePlan)
+class RatePlanAdmin(admin.ModelAdmin):
+    list_display = ('ad', 'lot', 'saatlik_ucret', 'gunluk_tavan')
+    list_select_related = ('lot',)
+    list_filter = ('lot',)
+    actions = ['reprice_reservations']
+
+    @admin.action(description="Seçili tarifelerin ileri tarihli rezervasyonlarını yeniden fiyatla")
+    def reprice_reservations(self, request, queryset):
+        qs = repricing.affected(rateplan_ids=list(queryset.values_list('id', flat=True)))
+        r = repricing.reprice(qs)
+        self.message_user(
+            request,
+            f"{r['scanned']} rezervasyon tarandı, {r['updated']} güncellendi ({r['rows_per_s']} satır/sn).",
+            messages.SUCCESS,
+        )
@@ -1,6 +1,19 @@
 from django.apps import AppConfig
 
 
+def cache_metrics():
+    from . import catalog_cache, rateplan_cache
+    for name, stats in (('catalog_cache', catalog_cache.stats()), ('rateplan_cache', rateplan_cache.stats())):
+        yield (f'otopark_{name}', 'gauge', f"{name} istatistikleri (süreç yerel)",
+               [({'stat': k}, v) for k, v in stats.items()])
+
+
 class ReservationsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "reservations"
+
+    def ready(self):
+        from core import metrics
+
+        from . import signals  # noqa: F401
+        metrics.register_collector(cache_metrics)
@@ -0,0 +1,230 @@
+# reservations/async_views.py
+"""
+Gate okutma ve lot okuma uçlarının async (ASGI) sürümleri: /reservation/async/...
+
+DRF APIView sync olduğundan bunlar düz Django async view'larıdır; gövde/sorgu
+doğrulaması aynı DRF serializer'larıyla, kimlik doğrulama AsyncJWTAuthentication
+ile yapılır, yanıt ve hata biçimi sync uçlarla aynıdır.
+
+- Okumalar async ORM ile (afirst / async for); kilitli yazma (gate.record_scan)
+  transaction gerektirdiği için tek bir sync_to_async çağrısıdır.
+- Lot list/detail önbellek yerine doğrudan veritabanından okunur (önbellek
+  backend'lerinin async API'si de thread'e atlar) ama ETag'i katalog önbelleğiyle
+  aynıdır; If-None-Match eşleşirse 304 döner.
+- lots/live/ doluluk değişikliklerini SSE ile iter (live.py); polling'in yerini alır.
+- core/asgi.py bu önekteki istekleri kısa (async-native) bir middleware
+  zinciriyle karşılar; WSGI altında da çalışırlar (async_to_sync ile).
+"""
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.decorators import classonlymethod
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, status
+from rest_framework.renderers import JSONRenderer
+
+from accounts.authentication import AsyncJWTAuthentication
+
+from . import availability, catalog_cache, gate, live, qr, search
+from .models import ParkingLot
+from .serializers import (
+    AvailabilityQuerySerializer,
+    CheckByQRSerializer,
+    CheckEventSerializer,
+    LotAvailabilitySerializer,
+    LotSearchQuerySerializer,
+    ParkingLotSerializer,
+    ReservationDetailSerializer,
+)
+from .views import IsGateStaff, calendar_body, calendar_etag, calendar_headers, filter_lots
+
+_renderer = JSONRenderer()
+
+
+def json_response(data, status=status.HTTP_200_OK):
+    response = HttpResponse(_renderer.render(data), status=status, content_type='application/json')
+    response['X-Content-Type-Options'] = 'nosniff'  # kısa zincirde SecurityMiddleware yok
+    return response
+
+
+class AsyncAPIView(View):
+    """DRF APIView'ın bu uçlarda gereken kısmı: JWT, izinler, JSON gövde, DRF hata biçimi."""
+    authenticator = AsyncJWTAuthentication()
+    permission_classes = ()  # yalnızca has_permission (nesne izni yok)
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        request.get_host()  # ALLOWED_HOSTS (kısa zincirde CommonMiddleware yok); DisallowedHost -> 400
+        try:
+            request.user = await self.authenticator.aauthenticate(request)
+            self.check_permissions(request)
+            return await super().dispatch(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+            response = json_response(data, exc.status_code)
+            if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+                response['WWW-Authenticate'] = self.authenticator.authenticate_header(request)
+            return response
+
+    def check_permissions(self, request):
+        for permission in (cls() for cls in self.permission_classes):
+            if not permission.has_permission(request, self):
+                if not request.user.is_authenticated:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied(getattr(permission, 'message', None))
+
+    @staticmethod
+    def json_body(request):
+        if not request.body:
+            return {}
+        try:
+            return json.loads(request.body)
+        except ValueError as exc:
+            raise exceptions.ParseError(f'JSON parse error - {exc}')
+
+
+class LotListView(AsyncAPIView):
+    """GET /reservation/async/lots/  (?aktif, ?tip, ?search, ?ordering)"""
+
+    async def get(self, request):
+        qs = filter_lots(ParkingLot.objects.all(), request.GET)
+        return _conditional(request, ParkingLotSerializer([lot async for lot in qs], many=True).data)
+
+
+class LotDetailView(AsyncAPIView):
+    """GET /reservation/async/lots/{id}/"""
+
+    async def get(self, request, pk):
+        return _conditional(request, ParkingLotSerializer(await _get_lot(pk)).data)
+
+
+class LotAvailabilityView(AsyncAPIView):
+    """GET /reservation/async/lots/{id}/availability/ — sync takvimle aynı parametreler ve ETag."""
+
+    async def get(self, request, pk):
+        lot = await _get_lot(pk)
+        q = AvailabilityQuerySerializer(data=request.GET)
+        q.is_valid(raise_exception=True)
+        bas, bit, step = (q.validated_data[k] for k in ('baslangic', 'bitis', 'step'))
+
+        etag, last_modified = calendar_etag(lot, bas, bit, step)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            slots = await availability.acalendar(lot.pk, bas, bit, step)
+            response = json_response(calendar_body(lot, q.validated_data, slots))
+        return calendar_headers(response, etag, last_modified)
+
+
+class LotSearchView(AsyncAPIView):
+    """GET /reservation/async/lots/search/?baslangic=...&bitis=...[&tip&search&ordering]"""
+
+    async def get(self, request):
+        q = LotSearchQuerySerializer(data=request.GET)
+        q.is_valid(raise_exception=True)
+        bas, bit = q.validated_data['baslangic'], q.validated_data['bitis']
+
+        qs = filter_lots(ParkingLot.objects.filter(aktif=True), request.GET)
+        order = q.validated_data['ordering']
+        tie = '-bos' if order.lstrip('-') == 'fiyat' else 'fiyat'
+        qs = search.annotate_availability(qs, bas, bit).order_by(order, tie, 'id')
+        return json_response(LotAvailabilitySerializer([lot async for lot in qs], many=True).data)
+
+
+class LotLiveView(AsyncAPIView):
+    """
+    GET /reservation/async/lots/live/?lots=1,2  (lots yoksa tüm lotlar)
+    text/event-stream: her doluluk değişikliği bir "occupancy" olayı; yavaş istemciye
+    "resync". Last-Event-ID ile yeniden bağlanan istemci kaçırdıklarını alır.
+    Bağlantı başına bir thread tutmamak için ASGI altında çalıştırılmalı.
+    """
+
+    async def get(self, request):
+        try:
+            lots = [int(x) for x in request.GET.get('lots', '').split(',') if x]
+            last_id = request.headers.get('Last-Event-ID')
+            last_id = int(last_id) if last_id else None
+        except ValueError:
+            raise exceptions.ValidationError({'detail': "lots ve Last-Event-ID tam sayı olmalı."})
+        sub = live.broker().subscribe(lots=lots, last_id=last_id)
+        response = StreamingHttpResponse(_EventStream(sub), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # nginx tamponlamasın
+        return response
+
+
+class _EventStream:
+    """
+    StreamingHttpResponse içeriği. Django yanıt bitince (istemci kopsa da) close()'u
+    çağırır; async generator'ın kapanması ise GC'ye kalır, abonelik burada bırakılır.
+    """
+
+    def __init__(self, sub):
+        self.sub = sub
+
+    async def __aiter__(self):
+        heartbeat = getattr(settings, 'LIVE_HEARTBEAT_SECONDS', 15)
+        yield b'retry: 3000\n\n'
+        while True:
+            event = await self.sub.get(timeout=heartbeat)
+            # boşta yorum satırı: proxy bağlantıyı kesmesin, kopan istemci fark edilsin
+            yield live.sse(event) if event is not None else b': ping\n\n'
+
+    def close(self):
+        self.sub.close()
+
+
+class CheckByQRView(AsyncAPIView):
+    """POST /reservation/async/check-by-qr/ — /reservation/check-by-qr/ ile aynı gövde, yanıtlar ve izin."""
+    permission_classes = (IsGateStaff,)
+
+    async def post(self, request):
+        ser = CheckByQRSerializer(data=self.json_body(request))
+        ser.is_valid(raise_exception=True)
+        token, tip = ser.validated_data['qr_token'], ser.validated_data['tip']
+
+        try:
+            qs, check = gate.lookup(token, tip, ser.validated_data.get('lot'))
+        except qr.InvalidQR as e:
+            return json_response({"detail": e.detail, "code": e.code}, status.HTTP_400_BAD_REQUEST)
+        resv = await qs.afirst()
+        if resv is None:
+            return json_response({"detail": "Rezervasyon bulunamadı."}, status.HTTP_404_NOT_FOUND)
+        mismatch = check(resv)
+        if mismatch:
+            return json_response({"detail": mismatch[0], "code": mismatch[1]}, status.HTTP_400_BAD_REQUEST)
+
+        err = gate.rule_error(resv, tip)
+        if err:
+            return json_response({"detail": err}, status.HTTP_400_BAD_REQUEST)
+
+        event = await sync_to_async(gate.record_scan)(resv, tip, gorevli=request.user)
+        if event is None:
+            return json_response({"detail": "Rezervasyon durumu aynı anda değişti, tekrar okutun.",
+                                  "code": "conflict"}, status.HTTP_409_CONFLICT)
+
+        return json_response({
+            "detail": "OK",
+            "reservation": ReservationDetailSerializer(resv).data,
+            "event": CheckEventSerializer(event).data,
+        })
+
+
+async def _get_lot(pk):
+    lot = await ParkingLot.objects.filter(pk=pk).afirst()
+    if lot is None:
+        raise exceptions.NotFound()
+    return lot
+
+
+def _conditional(request, data):
+    etag = catalog_cache.etag_for(data)
+    response = get_conditional_response(request, etag=etag) or json_response(data)
+    response['ETag'] = etag
+    return response
@@ -0,0 +1,129 @@
+# reservations/booking.py
+"""
+Rezervasyon kabulü: aynı lot için eşzamanlı istekler sıraya sokulur, böylece
+iki worker aynı boş yeri görüp ikisi birden kayıt açamaz.
+
+- SELECT ... FOR UPDATE destekleyen backend'ler (PostgreSQL): lot satırı kilitlenir,
+  kapasite kontrolü + insert + sayaç güncellemesi kilit altında yapılır.
+- SQLite: iyimser yol. lot.surum okunur, kontrol + insert yapılır, commit öncesi
+  surum koşullu olarak arttırılır; araya başka bir kabul girdiyse işlem geri alınır
+  ve kısa bir beklemeden sonra tekrar denenir.
+
+Güncellemede (lot/zaman değişimi) aynı yol kullanılır; lot değişiyorsa iki lot da
+kilitlenir / iki lotun da surum'u arttırılır.
+"""
+import copy
+import random
+import time
+
+from django.db import OperationalError, connection, transaction
+from django.db.models import F
+from rest_framework import serializers, status
+from rest_framework.exceptions import APIException
+
+from . import availability, live
+from .models import ParkingLot, Reservation
+
+MAX_RETRIES = 10
+FULL_MSG = "Seçilen zaman aralığında otoparkta boş yer yok."
+INACTIVE_MSG = "Aktif olmayan rezervasyonun lotu veya zamanı değiştirilemez."
+
+
+class BookingConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Otopark şu an çok yoğun, lütfen tekrar deneyin."
+    default_code = 'booking_conflict'
+
+
+class _VersionChanged(Exception):
+    pass
+
+
+def is_lock_error(exc):
+    """Kilit çekişmesi mi (SQLite "database is locked" / "busy")? Bağlantı, şema, I/O hataları değil."""
+    message = str(exc).lower()
+    return 'database is locked' in message or 'busy' in message
+
+
+def create_reservation(serializer, **save_kwargs):
+    """serializer.save(**save_kwargs) çağrısını lot bazında güvenli hale getirir."""
+    lot = serializer.validated_data['lot']
+    return _serialized(serializer, [lot.pk], lambda: _admit(serializer, lot, save_kwargs))
+
+
+def update_reservation(serializer):
+    """
+    PUT/PATCH: lot veya zaman değişirse eski aralık bırakılır, yeni aralık
+    kapasiteye göre (create ile aynı kilit/sürüm kontrolü altında) kabul edilir.
+    """
+    resv = serializer.instance
+    data = serializer.validated_data
+    lot = data.get('lot', resv.lot)
+    bas, bit = data.get('baslangic', resv.baslangic), data.get('bitis', resv.bitis)
+    if (lot.pk, bas, bit) == (resv.lot_id, resv.baslangic, resv.bitis):
+        return serializer.save()
+    if bas >= bit:
+        raise serializers.ValidationError("Bitiş tarihi başlangıçtan sonra olmalı.")
+    if lot.pk != resv.lot_id and not lot.aktif:
+        raise serializers.ValidationError("Seçtiğiniz otopark aktif değil.")
+    old = copy.copy(resv)  # serializer.save() örneği yerinde değiştirir; tekrar denemede eski aralık lazım
+    lot_ids = sorted({resv.lot_id, lot.pk})
+    return _serialized(serializer, lot_ids, lambda: _move(serializer, old, lot, bas, bit))
+
+
+def _admit(serializer, lot, save_kwargs):
+    data = serializer.validated_data
+    if not availability.has_capacity(lot, data['baslangic'], data['bitis']):
+        raise serializers.ValidationError(FULL_MSG)
+    resv = serializer.save(**save_kwargs)
+    availability.occupy(resv)
+    live.notify('reservation_created', resv)
+    return resv
+
+
+def _move(serializer, old, lot, bas, bit):
+    # durum satır kilidiyle okunur: eşzamanlı iptal/check-out ile yarışılmaz
+    active = Reservation.objects.select_for_update().filter(pk=old.pk, durum__in=Reservation.AKTIF)
+    if not active.exists():
+        raise serializers.ValidationError(INACTIVE_MSG)
+    availability.release(old)
+    live.notify('reservation_canceled', old)
+    if not availability.has_capacity(lot, bas, bit):
+        raise serializers.ValidationError(FULL_MSG)  # transaction geri alınır, eski aralık yerinde kalır
+    resv = serializer.save()
+    availability.occupy(resv)
+    live.notify('reservation_created', resv)
+    return resv
+
+
+def _serialized(serializer, lot_ids, admit):
+    if connection.features.has_select_for_update:
+        return _locked(lot_ids, admit)
+    return _optimistic(serializer, lot_ids, admit)
+
+
+def _locked(lot_ids, admit):
+    with transaction.atomic():
+        list(ParkingLot.objects.select_for_update().filter(pk__in=lot_ids).order_by('pk'))
+        return admit()
+
+
+def _optimistic(serializer, lot_ids, admit):
+    instance = serializer.instance
+    for attempt in range(MAX_RETRIES):
+        surum = dict(ParkingLot.objects.filter(pk__in=lot_ids).values_list('pk', 'surum'))
+        try:
+            with transaction.atomic():
+                resv = admit()
+                for lot_id in lot_ids:
+                    bumped = ParkingLot.objects.filter(pk=lot_id, surum=surum[lot_id]).update(surum=F('surum') + 1)
+                    if not bumped:
+                        raise _VersionChanged
+                return resv
+        except (_VersionChanged, OperationalError) as e:
+            # "database is locked" da aynı şekilde tekrar denenir; diğer DB hataları aynen yükselir
+            if isinstance(e, OperationalError) and not is_lock_error(e):
+                raise
+            serializer.instance = instance
+            time.sleep(random.uniform(0, 0.002 * 2 ** attempt))
+    raise BookingConflict()
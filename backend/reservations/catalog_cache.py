@@ -0,0 +1,148 @@
+# reservations/catalog_cache.py
+"""
+Lot ve tarife kataloğu (/lots/, /rateplans/ list/detail) için sürümlü
+read-through önbellek.
+
+- Anahtar: "catalog:<sürüm>:<yol + sıralı sorgu parametreleri>"; ?search=,
+  ?tip=, ?aktif= vb. her varyant ayrı girdi olur.
+- ParkingLot/RatePlan save/delete sinyalleri sürümü artırır (signals.py);
+  eski girdiler okunmaz, TTL ile düşer. Silme taraması gerekmez, Redis'te de
+  çalışır.
+- Girdi, yanıt verisi + içerik ETag'i olarak saklanır; If-None-Match
+  eşleşirse 304 döner, veri yeniden serileştirilmez.
+- Önbellek birincilden doldurulur: geride kalan okuma replikası, sürüm
+  artışından sonra eski veriyi yeni sürüm altına yazamaz.
+
+Backend settings.CACHES'tan seçilir (CATALOG_CACHE_ALIAS, varsayılan locmem).
+İsabet sayaçları süreç yereldir (stats()).
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from core import routers
+
+VERSION_KEY = 'catalog:version'
+
+_counts = Counter()
+_lock = threading.Lock()
+
+
+def _cache():
+    return caches[getattr(settings, 'CATALOG_CACHE_ALIAS', 'default')]
+
+
+def _timeout():
+    return getattr(settings, 'CATALOG_CACHE_TIMEOUT', 300)
+
+
+def _count(name):
+    with _lock:
+        _counts[name] += 1
+
+
+def version():
+    # Sürüm anahtarı kaybolursa (eviction/restart) zaman tabanlı yeni bir değerle
+    # başlar; eski sürüm numaraları geri gelip bayat girdileri diriltmez.
+    return _cache().get_or_set(VERSION_KEY, time.time_ns() // 1000, timeout=None)
+
+
+def _bump():
+    c = _cache()
+    try:
+        c.incr(VERSION_KEY)
+    except ValueError:
+        c.set(VERSION_KEY, time.time_ns() // 1000, timeout=None)
+    _count('invalidations')
+
+
+def invalidate():
+    """
+    Hemen ve commit sonrasında sürümü artır. İkinci artış, commit'ten önce
+    eski veriyi yeni sürümle önbelleğe yazmış olabilecek okuyucuyu geçersiz kılar.
+    """
+    _bump()
+    transaction.on_commit(_bump)
+
+
+def _key(ver, request):
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    digest = hashlib.md5(f"{request.path}?{query}".encode()).hexdigest()
+    return f"catalog:{ver}:{digest}"
+
+
+def etag_for(data):
+    """Yanıt verisinin içerik ETag'i (async_views de aynı değeri üretir)."""
+    body = json.dumps(data, cls=JSONEncoder, sort_keys=True).encode()
+    return quote_etag(hashlib.md5(body).hexdigest())
+
+
+def serve(request, build):
+    """
+    GET yanıtını önbellekten ver; yoksa build() ile üretip (200 ise) sakla.
+    build: önbelleksiz DRF Response döndüren çağrı.
+    """
+    c = _cache()
+    key = _key(version(), request)
+    entry = c.get(key)
+    if entry is None:
+        _count('misses')
+        with routers.primary():
+            response = build()
+        if response.status_code != 200:
+            return response
+        entry = (response.data, etag_for(response.data))
+        c.set(key, entry, _timeout())
+        state = 'MISS'
+    else:
+        _count('hits')
+        state = 'HIT'
+
+    data, etag = entry
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = Response(data)
+    else:
+        _count('not_modified')
+    response['ETag'] = etag
+    response['X-Cache'] = state
+    return response
+
+
+def stats():
+    with _lock:
+        counts = dict(_counts)
+    lookups = counts.get('hits', 0) + counts.get('misses', 0)
+    return {
+        'hits': counts.get('hits', 0),
+        'misses': counts.get('misses', 0),
+        'not_modified': counts.get('not_modified', 0),
+        'invalidations': counts.get('invalidations', 0),
+        'hit_ratio': round(counts.get('hits', 0) / lookups, 4) if lookups else 0.0,
+    }
+
+
+def reset_stats():
+    with _lock:
+        _counts.clear()
+
+
+class CachedCatalogMixin:
+    """ViewSet karışımı: list/retrieve GET yanıtlarını serve() üzerinden verir."""
+
+    def list(self, request, *args, **kwargs):
+        return serve(request, lambda: super(CachedCatalogMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return serve(request, lambda: super(CachedCatalogMixin, self).retrieve(request, *args, **kwargs))
@@ -0,0 +1,187 @@
+# reservations/export.py
+"""
+Reservation / CheckEvent / Payment tablolarının akış halinde dışa aktarımı.
+
+Satırlar values_list(...).iterator() ile parça parça okunur (PostgreSQL'de
+sunucu taraflı cursor) ve her parça hemen CSV/NDJSON/Parquet baytlarına
+çevrilip verilir; bellek kullanımı satır sayısından bağımsızdır. Aynı
+üreteçler hem /export/ endpoint'inde (StreamingHttpResponse) hem de
+export_data komutunda kullanılır.
+
+Parquet için pyarrow gerekir (opsiyonel bağımlılık).
+"""
+import csv
+import io
+from collections import namedtuple
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import CheckEvent, Payment, Reservation
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # opsiyonel bağımlılık
+    pa = pq = None
+
+CHUNK_SIZE = 2000
+
+# model, sütunlar (values_list yolları), tarih aralığı alanı, lot alanı
+Spec = namedtuple('Spec', 'model columns date_field lot_field')
+
+SPECS = {
+    'reservations': Spec(Reservation, (
+        'id', 'lot_id', 'lot__ad', 'user__username', 'plaka', 'baslangic', 'bitis',
+        'durum', 'rateplan__ad', 'ucret_hesap', 'created_at',
+    ), 'baslangic', 'lot_id'),
+    'check-events': Spec(CheckEvent, (
+        'id', 'reservation_id', 'reservation__lot_id', 'reservation__plaka', 'tip', 'zaman',
+        'gorevli__username',
+    ), 'zaman', 'reservation__lot_id'),
+    'payments': Spec(Payment, (
+        'id', 'reservation_id', 'reservation__lot_id', 'tutar', 'saglayici', 'durum',
+        'odeme_ref', 'created_at',
+    ), 'created_at', 'reservation__lot_id'),
+}
+
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+
+def parquet_available():
+    return pq is not None
+
+
+def queryset(kind, lot=None, since=None, until=None, using=None):
+    """Filtrelenmiş, tarih + pk sıralı values_list sorgusu (using: veritabanı alias'ı, None = router)."""
+    spec = SPECS[kind]
+    qs = spec.model.objects.using(using)
+    if lot is not None:
+        qs = qs.filter(**{spec.lot_field: lot})
+    if since is not None:
+        qs = qs.filter(**{f'{spec.date_field}__gte': since})
+    if until is not None:
+        qs = qs.filter(**{f'{spec.date_field}__lt': until})
+    return qs.order_by(spec.date_field, 'pk').values_list(*spec.columns)
+
+
+def chunks(qs, chunk_size=CHUNK_SIZE):
+    """iterator() ile okunan satırları chunk_size'lık listeler halinde ver."""
+    buf = []
+    for row in qs.iterator(chunk_size=chunk_size):
+        buf.append(row)
+        if len(buf) >= chunk_size:
+            yield buf
+            buf = []
+    if buf:
+        yield buf
+
+
+# ---- biçimler ----
+def _cell(value):
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def stream_csv(kind, qs, chunk_size=CHUNK_SIZE):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(SPECS[kind].columns)
+    for rows in chunks(qs, chunk_size):
+        writer.writerows([_cell(v) for v in row] for row in rows)
+        yield out.getvalue().encode()
+        out.seek(0)
+        out.truncate()
+    if out.tell():  # boş sonuçta yalnız başlık
+        yield out.getvalue().encode()
+
+
+def stream_ndjson(kind, qs, chunk_size=CHUNK_SIZE):
+    columns = SPECS[kind].columns
+    encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    for rows in chunks(qs, chunk_size):
+        yield ''.join(encoder.encode(dict(zip(columns, row))) + '\n' for row in rows).encode()
+
+
+def _resolve(model, path):
+    field = None
+    for part in path.split('__'):
+        field = model._meta.get_field(part)
+        model = field.related_model or model
+    return field
+
+
+def _arrow_type(field):
+    kind = field.get_internal_type()
+    if kind == 'DateTimeField':
+        return pa.timestamp('us', tz='UTC')
+    if kind == 'DecimalField':
+        return pa.decimal128(field.max_digits, field.decimal_places)
+    if kind in ('AutoField', 'BigAutoField', 'IntegerField', 'PositiveIntegerField', 'ForeignKey', 'BigIntegerField'):
+        return pa.int64()
+    return pa.string()
+
+
+def arrow_schema(kind):
+    spec = SPECS[kind]
+    return pa.schema([(c, _arrow_type(_resolve(spec.model, c))) for c in spec.columns])
+
+
+class _Drain:
+    """ParquetWriter'ın yazdığı baytları biriktirip parça parça boşaltan dosya nesnesi."""
+    closed = False
+
+    def __init__(self):
+        self.parts, self.pos = [], 0
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.pos += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.pos
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self):
+        data, self.parts = b''.join(self.parts), []
+        return data
+
+
+def stream_parquet(kind, qs, chunk_size=CHUNK_SIZE):
+    """Her parça ayrı bir row group olarak yazılır; footer en sonda gelir."""
+    if pq is None:
+        raise RuntimeError("Parquet dışa aktarımı için pyarrow kurulu olmalı.")
+    schema = arrow_schema(kind)
+    sink = _Drain()
+    writer = pq.ParquetWriter(sink, schema, compression='snappy')
+    try:
+        for rows in chunks(qs, chunk_size):
+            cols = list(zip(*rows))
+            arrays = [pa.array([None if v is None else str(v) for v in col], type=f.type)
+                      if pa.types.is_string(f.type) else pa.array(col, type=f.type)
+                      for col, f in zip(cols, schema)]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            yield sink.take()
+    finally:
+        writer.close()
+    yield sink.take()
+
+
+STREAMERS = {'csv': stream_csv, 'ndjson': stream_ndjson, 'parquet': stream_parquet}
+
+
+def stream(kind, fmt, lot=None, since=None, until=None, chunk_size=CHUNK_SIZE, using=None):
+    """Seçilen biçimde bayt parçaları üreten generator."""
+    return STREAMERS[fmt](kind, queryset(kind, lot, since, until, using), chunk_size)
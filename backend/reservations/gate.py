@@ -0,0 +1,166 @@
+# reservations/gate.py
+"""
+Gate okutmaları için durum geçişleri.
+
+Geçiş tek bir koşullu UPDATE (WHERE durum IN ...) ile yapılır ve CheckEvent
+kaydıyla aynı transaction'da yazılır. Reservation.save() çağrılmadığı için
+token/ücret işi yapılmaz; aynı anda iki okutma gelirse yalnızca biri kazanır.
+"""
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import availability, live, qr
+from .models import CheckEvent, Reservation
+
+# tip -> (kaynak durumlar, hedef durum)
+GECISLER = {
+    'check_in': (('pending', 'confirmed'), 'checked_in'),
+    'check_out': (('checked_in',), 'checked_out'),
+}
+
+
+def rule_error(resv, tip, durum=None):
+    """Mevcut (ya da verilen) duruma göre iş kuralı hatası (yoksa None)."""
+    durum = durum or resv.durum
+    if durum in GECISLER[tip][0]:
+        return None
+    if tip == 'check_in':
+        return f"Bu rezervasyon için check-in yapılamaz (durum: {durum})."
+    return "Check-out yalnızca 'checked_in' durumunda yapılabilir."
+
+
+def lookup(token, tip, lot_id=None):
+    """
+    Okutulan token için (queryset, kontrol) döner; sorgu sync (.first()) ya da
+    async (.afirst()) çalıştırılabilir. İmzalı token veritabanına gitmeden
+    doğrulanır (geçersizse qr.InvalidQR). kontrol(resv) -> None ya da (detay, kod).
+    """
+    qs = Reservation.objects.select_related('lot', 'rateplan')
+    if qr.is_signed(token):
+        claims = qr.verify(token, lot_id=lot_id, check_window=(tip == 'check_in'))
+        return qs.filter(pk=claims.reservation_id), lambda resv: (
+            None if qr.matches(claims, resv) else ("QR güncel değil, rezervasyon değişmiş.", 'stale'))
+    return qs.filter(qr_token=token), lambda resv: (
+        None if lot_id in (None, resv.lot_id) else ("Bu QR başka bir otoparka ait.", 'lot'))
+
+
+def record_scan(resv, tip, gorevli=None):
+    """
+    Geçişi uygula ve CheckEvent yaz. Başka bir okutma araya girdiyse None döner.
+    Başarılıysa resv.durum bellekte de güncellenir.
+    """
+    kaynak, hedef = GECISLER[tip]
+    with transaction.atomic():
+        if not Reservation.transition(resv.pk, kaynak, hedef):
+            return None
+        event = CheckEvent.objects.create(reservation=resv, tip=tip, gorevli=gorevli)
+        since = None
+        if tip == 'check_out':
+            since = event.zaman or timezone.now()
+            availability.release(resv, since=since)
+        live.notify(tip, resv, since=since)
+    resv.durum = hedef
+    return event
+
+
+# ---- offline gate senkronu ----
+
+class _StateChanged(Exception):
+    pass
+
+
+def _result(i, scan, status, detail=None, resv=None, code=None):
+    out = {'index': i, 'qr_token': scan['qr_token'], 'tip': scan['tip'],
+           'scanned_at': scan['scanned_at'], 'status': status,
+           'reservation': resv.pk if resv is not None else None}
+    if detail:
+        out['detail'] = detail
+    if code:
+        out['code'] = code
+    return out
+
+
+def apply_batch(scans, gorevli=None, retries=3):
+    """
+    Tamponlanmış okutmaları (qr_token, tip, scanned_at[, lot]) zaman sırasıyla uygular.
+
+    Token'lar tek sorguda çözülür, durum makinesi bellekte yürütülür; değişen
+    rezervasyonlar (eski, yeni durum) gruplarıyla koşullu UPDATE edilir, CheckEvent'ler
+    gerçek okutma anıyla bulk_create edilir, check-out'lar dilimleri toplu serbest bırakır.
+    Arada başka bir yazma durum değiştirdiyse tüm parti geri alınıp yeniden denenir;
+    retries denemede de olmazsa None döner (record_scan gibi). Sonuçlar girdi sırasıyla döner.
+    """
+    base = [None] * len(scans)
+    claims = {}
+    for i, scan in enumerate(scans):
+        if qr.is_signed(scan['qr_token']):
+            try:
+                claims[i] = qr.verify(scan['qr_token'], lot_id=scan.get('lot'), now=scan['scanned_at'],
+                                      check_window=(scan['tip'] == 'check_in'))
+            except qr.InvalidQR as e:
+                base[i] = _result(i, scan, 'invalid', e.detail, code=e.code)
+
+    for _ in range(retries):
+        try:
+            with transaction.atomic():
+                return _apply_batch(scans, base, claims, gorevli)
+        except _StateChanged:
+            pass
+    return None
+
+
+def _apply_batch(scans, base, claims, gorevli):
+    results = list(base)
+    tokens = {s['qr_token'] for i, s in enumerate(scans) if i not in claims and results[i] is None}
+    qs = Reservation.objects.filter(
+        Q(pk__in=[c.reservation_id for c in claims.values()]) | Q(qr_token__in=tokens)
+    ).only('id', 'lot_id', 'baslangic', 'bitis', 'durum', 'qr_token').order_by()
+    if connection.features.has_select_for_update:
+        qs = qs.select_for_update()
+    by_pk = {r.pk: r for r in qs}
+    by_token = {r.qr_token: r for r in by_pk.values()}
+
+    states, events, releases, notices = {}, [], [], []
+    for i in sorted(range(len(scans)), key=lambda i: scans[i]['scanned_at']):
+        if results[i] is not None:
+            continue
+        scan, tip = scans[i], scans[i]['tip']
+        if i in claims:
+            resv = by_pk.get(claims[i].reservation_id)
+            if resv is not None and not qr.matches(claims[i], resv):
+                results[i] = _result(i, scan, 'invalid', "QR güncel değil, rezervasyon değişmiş.", resv, 'stale')
+                continue
+        else:
+            resv = by_token.get(scan['qr_token'])
+            if resv is not None and scan.get('lot') not in (None, resv.lot_id):
+                results[i] = _result(i, scan, 'invalid', "Bu QR başka bir otoparka ait.", resv, 'lot')
+                continue
+        if resv is None:
+            results[i] = _result(i, scan, 'not_found', "Rezervasyon bulunamadı.")
+            continue
+
+        durum = states.get(resv.pk, resv.durum)
+        err = rule_error(resv, tip, durum=durum)
+        if err:
+            results[i] = _result(i, scan, 'rejected', err, resv)
+            continue
+        states[resv.pk] = GECISLER[tip][1]
+        events.append(CheckEvent(reservation_id=resv.pk, tip=tip, gorevli=gorevli, zaman=scan['scanned_at']))
+        if tip == 'check_out':
+            releases.append((resv, scan['scanned_at']))
+        notices.append((tip, resv, scan['scanned_at'] if tip == 'check_out' else None))
+        results[i] = _result(i, scan, 'ok', resv=resv)
+
+    groups = {}
+    for pk, hedef in states.items():
+        groups.setdefault((by_pk[pk].durum, hedef), []).append(pk)
+    for (kaynak, hedef), pks in groups.items():
+        if Reservation.objects.filter(pk__in=pks, durum=kaynak).update(durum=hedef) != len(pks):
+            raise _StateChanged
+    CheckEvent.objects.bulk_create(events)
+    if releases:
+        availability.release_many(releases)
+    for tip, resv, since in notices:
+        live.notify(tip, resv, since=since)
+    return results
@@ -0,0 +1,249 @@
+# reservations/live.py
+"""
+Lot doluluk değişikliklerinin anlık yayını (SSE: /reservation/async/lots/live/).
+
+Check-in/out (tekli ve toplu okutma), rezervasyon oluşturma ve iptal,
+transaction commit olduktan sonra notify() ile broker'a bir olay bırakır:
+
+    {"seq": 42, "lot": 3, "kind": "check_in", "delta": 1,
+     "baslangic": "...", "bitis": "...", "zaman": "..."}
+
+kind: check_in / check_out (delta = lottaki araç sayısı değişimi) ya da
+reservation_created / reservation_canceled (delta = [baslangic, bitis)
+aralığındaki dilimlerin doluluk değişimi). Check-out'ta baslangic çıkış anıdır.
+
+Broker settings.LIVE_BROKER ile seçilir:
+- LocalBroker: süreç içi. Aboneler event loop başına gruplanır; yayın her loop'a
+  tek call_soon_threadsafe ile gider, boşta bekleyen abone yalnızca bir kuyruk
+  ve askıdaki bir coroutine'dir. Son LIVE_REPLAY olay Last-Event-ID ile yeniden
+  bağlanan istemciye tekrar gönderilir. Kuyruğu (LIVE_QUEUE_SIZE) dolan yavaş
+  istemci "resync" olayı alır ve durumu REST'ten yeniden çekmelidir.
+- RedisBroker: çok süreçli kurulum; olaylar Redis pub/sub kanalından gelir,
+  her süreç kendi abonelerine LocalBroker gibi dağıtır (redis paketi gerekir).
+  seq yayında Redis INCR ile bir kez verilir, böylece Last-Event-ID hangi
+  worker'a bağlanılırsa bağlanılsın aynı olayı gösterir. Dinleyici bağlantı
+  koparsa artan beklemeyle yeniden bağlanır; aradaki olaylar kaybolduğu için
+  abonelere resync gider ve replay tamponu sıfırlanır.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import deque
+from functools import partial
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+try:
+    import redis
+except ImportError:  # opsiyonel: yalnızca RedisBroker için
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+DELTAS = {
+    'check_in': 1,
+    'check_out': -1,
+    'reservation_created': 1,
+    'reservation_canceled': -1,
+}
+
+
+class Subscription:
+    """Tek istemcinin kuyruğu; yalnızca kendi event loop'unda kullanılır."""
+
+    def __init__(self, broker, loop, lots, maxsize):
+        self.broker = broker
+        self.loop = loop
+        self.lots = lots
+        self.queue = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def offer(self, event):
+        if self.lots is not None and event['lot'] not in self.lots:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout=None):
+        """Sıradaki olay; timeout dolarsa None. Taşma olduysa kuyruk boşaltılır ve resync döner."""
+        if self.overflowed:
+            self.overflowed = False
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            return {'kind': 'resync'}
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def resync(self):
+        """Bekleyen olayları at, sıradaki get() resync dönsün (event loop'unda çağrılır)."""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait({'kind': 'resync'})
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class LocalBroker:
+    def __init__(self):
+        self.queue_size = getattr(settings, 'LIVE_QUEUE_SIZE', 100)
+        self._replay = deque(maxlen=getattr(settings, 'LIVE_REPLAY', 1000))
+        self._subs = {}  # loop -> {Subscription}
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def publish(self, event):
+        """Herhangi bir thread'den çağrılabilir; beklemez."""
+        self._dispatch(event)
+
+    def _dispatch(self, event):
+        with self._lock:
+            if 'seq' in event:  # RedisBroker: yayında verilmiş
+                self._seq = max(self._seq, event['seq'])
+            else:
+                self._seq += 1
+                event = {**event, 'seq': self._seq}
+            self._replay.append(event)
+        self._each_loop(self._fanout, event)
+
+    def _each_loop(self, fn, *args):
+        with self._lock:
+            loops = list(self._subs)
+        for loop in loops:
+            try:
+                loop.call_soon_threadsafe(fn, loop, *args)
+            except RuntimeError:  # loop kapanmış
+                with self._lock:
+                    self._subs.pop(loop, None)
+
+    def _fanout(self, loop, event):
+        for sub in list(self._subs.get(loop, ())):
+            sub.offer(event)
+
+    def _resync(self, loop):
+        for sub in list(self._subs.get(loop, ())):
+            sub.resync()
+
+    def subscribe(self, lots=None, last_id=None):
+        """Çalışan event loop'ta abonelik aç. last_id verilirse sonrasındaki olaylar önce gelir."""
+        loop = asyncio.get_running_loop()
+        sub = Subscription(self, loop, set(lots) if lots else None, self.queue_size)
+        with self._lock:
+            self._subs.setdefault(loop, set()).add(sub)
+            if last_id is not None:
+                missed = [e for e in self._replay if e['seq'] > last_id]
+                oldest = self._replay[0]['seq'] if self._replay else self._seq + 1
+                if last_id > self._seq or last_id < oldest - 1:  # süreç yeniden başlamış ya da boşluk var
+                    sub.overflowed = True
+                else:
+                    for event in missed:
+                        sub.offer(event)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            subs = self._subs.get(sub.loop)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subs[sub.loop]
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(s) for s in self._subs.values())
+
+
+class RedisBroker(LocalBroker):
+    """Yayın Redis kanalına gider; arka plandaki dinleyici thread yerel abonelere dağıtır."""
+    channel = 'otopark:live'
+    seq_key = 'otopark:live:seq'
+    reconnect_delay = (0.5, 30)  # ilk / en uzun bekleme (sn)
+
+    def __init__(self):
+        if redis is None:
+            raise ImproperlyConfigured("RedisBroker için 'redis' paketi gerekli.")
+        super().__init__()
+        self._redis = redis.Redis.from_url(settings.LIVE_REDIS_URL)
+        self._listener = None
+
+    def publish(self, event):
+        event = {**event, 'seq': self._redis.incr(self.seq_key)}
+        self._redis.publish(self.channel, json.dumps(event, cls=DjangoJSONEncoder))
+
+    def subscribe(self, lots=None, last_id=None):
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name='live-redis', daemon=True)
+                self._listener.start()
+        return super().subscribe(lots, last_id)
+
+    def _listen(self):
+        delay, connected = self.reconnect_delay[0], False
+        while True:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self.channel)
+                self._connected(reconnect=connected)
+                delay, connected = self.reconnect_delay[0], True
+                for message in pubsub.listen():
+                    self._dispatch(json.loads(message['data']))
+            except redis.RedisError as e:
+                logger.warning("Canlı yayın Redis bağlantısı koptu (%s), %.1f sn sonra tekrar denenecek.", e, delay)
+            finally:
+                pubsub.close()
+            time.sleep(delay)
+            delay = min(delay * 2, self.reconnect_delay[1])
+
+    def _connected(self, reconnect):
+        # Replay yalnızca kesintisiz dinlenen olaylardan oluşur; daha eski
+        # Last-Event-ID'ler subscribe()'daki boşluk kontrolüyle resync alır.
+        current = int(self._redis.get(self.seq_key) or 0)
+        with self._lock:
+            self._replay.clear()
+            self._seq = current
+        if reconnect:
+            self._each_loop(self._resync)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(getattr(settings, 'LIVE_BROKER', 'reservations.live.LocalBroker'))()
+    return _broker
+
+
+def notify(kind, resv, since=None):
+    """Olayı mevcut transaction commit olunca yayınla (geri alınırsa hiç gitmez)."""
+    event = {
+        'lot': resv.lot_id,
+        'kind': kind,
+        'delta': DELTAS[kind],
+        'baslangic': since or resv.baslangic,
+        'bitis': resv.bitis,
+        'zaman': timezone.now(),
+    }
+    transaction.on_commit(partial(broker().publish, event))
+
+
+def sse(event):
+    """Olayın SSE çerçevesi (bytes)."""
+    head = f"id: {event['seq']}\n" if 'seq' in event else ''
+    data = json.dumps(event, cls=DjangoJSONEncoder)
+    return f"{head}event: {event['kind'] if event['kind'] == 'resync' else 'occupancy'}\ndata: {data}\n\n".encode()
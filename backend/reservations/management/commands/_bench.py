@@ -0,0 +1,132 @@
+# reservations/management/commands/_bench.py
+"""
+bench_* komutları için ortak yardımcılar.
+Alt çizgiyle başladığı için Django bu modülü bir komut olarak görmez.
+"""
+import logging
+import os
+import random
+import secrets
+import shutil
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from reservations.models import ParkingLot, RatePlan, Reservation
+
+
+@contextmanager
+def throwaway_db(keepdb=False, threaded=False):
+    """
+    Testlerdeki gibi geçici bir veritabanı kur (migrate dahil), iş bitince sil.
+    threaded=True: SQLite'ta bellek yerine geçici dosya kullan; paylaşımlı bellek
+    veritabanı thread'ler arası tablo kilidi verir ve gerçek yükü yansıtmaz.
+    """
+    old_name = connection.settings_dict['NAME']
+    test_settings = connection.settings_dict.setdefault('TEST', {})
+    old_test_name = test_settings.get('NAME')
+    tmpdir = None
+    if threaded and connection.vendor == 'sqlite' and not old_test_name:
+        tmpdir = tempfile.mkdtemp(prefix='bench-')
+        test_settings['NAME'] = os.path.join(tmpdir, 'bench.sqlite3')
+    setup_test_environment()  # ALLOWED_HOSTS'a 'testserver' vb.
+    logging.getLogger('django.request').setLevel(logging.ERROR)  # beklenen 4xx'ler log basmasın
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=keepdb)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+        teardown_test_environment()
+        if tmpdir:
+            test_settings['NAME'] = old_test_name
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+class QueryCounter:
+    """connection.execute_wrapper ile kullanılan hafif sorgu sayacı (DEBUG gerektirmez)."""
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def percentile(sorted_samples, p):
+    if not sorted_samples:
+        return 0.0
+    k = min(len(sorted_samples) - 1, max(0, int(round(p / 100 * (len(sorted_samples) - 1)))))
+    return sorted_samples[k]
+
+
+def summarize(samples):
+    """Saniye cinsinden örneklerden ms özet (n, mean, p50, p95, p99, max)."""
+    s = sorted(samples)
+    n = len(s)
+    return {
+        'n': n,
+        'mean_ms': round(sum(s) / n * 1000, 3) if n else 0.0,
+        'p50_ms': round(percentile(s, 50) * 1000, 3),
+        'p95_ms': round(percentile(s, 95) * 1000, 3),
+        'p99_ms': round(percentile(s, 99) * 1000, 3),
+        'max_ms': round(s[-1] * 1000, 3) if n else 0.0,
+    }
+
+
+def timed(fn, repeat):
+    out = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        out.append(time.perf_counter() - t0)
+    return out
+
+
+def seed_lots(n, kapasite=100, tip_cycle=('acik', 'kapali', 'vip')):
+    """n lot + her lota bir 'Standart' tarife."""
+    lots = ParkingLot.objects.bulk_create([
+        ParkingLot(ad=f"Lot {i}", tip=tip_cycle[i % len(tip_cycle)],
+                   konum=f"Bolge {i % 20}", kapasite=kapasite)
+        for i in range(n)
+    ], batch_size=2000)
+    ids = [l.pk for l in lots]
+    if None in ids:  # bulk insert'ten pk dönmeyen backend'ler
+        ids = list(ParkingLot.objects.order_by('-id').values_list('id', flat=True)[:n])[::-1]
+    RatePlan.objects.bulk_create([
+        RatePlan(lot_id=lot_id, ad='Standart',
+                 saatlik_ucret=Decimal(20 + lot_id % 30),
+                 gunluk_tavan=Decimal(200 + lot_id % 100) if lot_id % 2 else None)
+        for lot_id in ids
+    ], batch_size=2000)
+    return ids
+
+
+def seed_reservations(lot_ids, n, days=90, max_hours=8, batch_size=5000, rng=None, durum='confirmed'):
+    """
+    n rezervasyonu save() bypass ederek toplu yaz (qr_token ve ücret hazır verilir).
+    Başlangıçlar şimdi..şimdi+days aralığına yayılır.
+    """
+    rng = rng or random.Random(42)
+    t0 = timezone.now().replace(minute=0, second=0, microsecond=0)
+    span = days * 24 * 60
+    written = 0
+    while written < n:
+        chunk = []
+        for _ in range(min(batch_size, n - written)):
+            bas = t0 + timedelta(minutes=rng.randrange(0, span, 15))
+            chunk.append(Reservation(
+                id=uuid.uuid4(), lot_id=rng.choice(lot_ids),
+                plaka=f"34BN{rng.randrange(10000):04d}",
+                baslangic=bas, bitis=bas + timedelta(minutes=rng.randrange(30, max_hours * 60, 15)),
+                durum=durum, qr_token=secrets.token_urlsafe(32), ucret_hesap=Decimal('0.00'),
+            ))
+        Reservation.objects.bulk_create(chunk, batch_size=batch_size)
+        written += len(chunk)
+    return t0
@@ -0,0 +1,181 @@
+# reservations/management/commands/_loadtest.py
+"""
+loadtest komutu için taşıyıcılar ve sanal kullanıcı senaryosu.
+
+Her sanal kullanıcı (VU) bir müşteridir; kendi rng'si (seed + sıra) ile
+karışımdan işlem seçer. Önkoşulu olmayan işlem (ör. iptal edilecek
+rezervasyon yok) rezervasyona döner; böylece aynı seed aynı işlem dizisini
+üretir. Check-in/out görevli hesabıyla yapılır.
+
+Taşıyıcılar:
+- InProcess: rest_framework.test.APIClient (gerçek URLconf, middleware, JWT)
+- HTTP: http.client ile keep-alive bağlantı (runserver / ASGI sunucusu)
+"""
+import http.client
+import json
+import random
+import time
+from datetime import timedelta
+from urllib.parse import urlencode, urlsplit
+
+from django.utils import timezone
+
+OPS = ('browse', 'lot_detail', 'search', 'book', 'cancel', 'check_in', 'check_out', 'refresh')
+# raporlanan uç noktalar: işlemler + check-in öncesi müşterinin QR detay isteği
+ENDPOINTS = OPS[:5] + ('qr_detail',) + OPS[5:]
+DEFAULT_MIX = 'browse=30,lot_detail=10,search=20,book=15,cancel=5,check_in=8,check_out=7,refresh=5'
+
+
+def parse_mix(text):
+    mix = {}
+    for part in filter(None, (p.strip() for p in text.split(','))):
+        name, _, weight = part.partition('=')
+        if name not in OPS:
+            raise ValueError(f"Bilinmeyen işlem: {name} (seçenekler: {', '.join(OPS)})")
+        mix[name] = float(weight or 1)
+    if not any(mix.values()):
+        raise ValueError("Karışımda en az bir işlemin ağırlığı > 0 olmalı.")
+    return mix
+
+
+class InProcess:
+    name = 'inprocess'
+
+    def __init__(self):
+        from rest_framework.test import APIClient
+        self.client = APIClient(raise_request_exception=False)
+
+    def request(self, method, path, data=None, token=None):
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+        if method == 'GET':
+            r = self.client.get(path, data, **headers)
+        else:
+            r = self.client.post(path, data, format='json', **headers)
+        body = r.json() if r.get('Content-Type', '').startswith('application/json') and r.content else None
+        return r.status_code, body
+
+    def close(self):
+        from django.db import connections
+        connections.close_all()
+
+
+class HTTP:
+    name = 'http'
+
+    def __init__(self, base_url, timeout=30):
+        parts = urlsplit(base_url)
+        conn_cls = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+        self.conn = conn_cls(parts.netloc, timeout=timeout)
+        self.prefix = parts.path.rstrip('/')
+
+    def request(self, method, path, data=None, token=None):
+        headers = {'Accept': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        body = None
+        if method == 'GET' and data:
+            path = f'{path}?{urlencode(data)}'
+        elif data is not None:
+            body = json.dumps(data)
+            headers['Content-Type'] = 'application/json'
+        try:
+            self.conn.request(method, self.prefix + path, body=body, headers=headers)
+            r = self.conn.getresponse()
+            raw = r.read()
+        except (OSError, http.client.HTTPException):
+            self.conn.close()  # bir sonraki istekte yeniden bağlanır
+            return 599, None
+        ok_json = raw and (r.getheader('Content-Type') or '').startswith('application/json')
+        return r.status, json.loads(raw) if ok_json else None
+
+    def close(self):
+        self.conn.close()
+
+
+class VirtualUser:
+    def __init__(self, idx, transport, staff_transport, tokens, staff_token, lot_ids, mix, seed):
+        self.rng = random.Random(seed * 1000 + idx)
+        self.t = transport
+        self.staff = staff_transport
+        self.access, self.refresh_token = tokens
+        self.staff_token = staff_token
+        self.lot_ids = lot_ids
+        self.ops, self.weights = zip(*mix.items())
+        self.booked, self.checked_in = [], []  # rezervasyon id'leri / giriş yapmış QR'lar
+        self.samples = []
+        self.base = (timezone.now() + timedelta(days=2)).replace(minute=0, second=0, microsecond=0)
+
+    def _window(self):
+        bas = self.base + timedelta(hours=self.rng.randrange(0, 24 * 14))
+        return bas, bas + timedelta(hours=self.rng.choice((1, 2, 3, 4, 8)))
+
+    def _call(self, name, transport, method, path, data=None, token=None):
+        started = time.perf_counter()
+        status, body = transport.request(method, path, data, token)
+        self.samples.append((name, status, time.perf_counter() - started))
+        return status, body
+
+    def step(self):
+        """Karışımdan bir işlem seç ve uygula (örnekler self.samples'a eklenir)."""
+        op = self.rng.choices(self.ops, self.weights)[0]
+        if op in ('cancel', 'check_in') and not self.booked:
+            op = 'book'
+        if op == 'check_out' and not self.checked_in:
+            op = 'check_in' if self.booked else 'book'
+        getattr(self, f'op_{op}')()
+
+    def op_browse(self):
+        params = self.rng.choice(({}, {'tip': 'acik'}, {'aktif': 'true'}, {'search': 'Bolge 1'}))
+        self._call('browse', self.t, 'GET', '/reservation/lots/', params, self.access)
+
+    def op_lot_detail(self):
+        self._call('lot_detail', self.t, 'GET', f'/reservation/lots/{self.rng.choice(self.lot_ids)}/',
+                   None, self.access)
+
+    def op_search(self):
+        bas, bit = self._window()
+        self._call('search', self.t, 'GET', '/reservation/lots/search/',
+                   {'baslangic': bas.isoformat(), 'bitis': bit.isoformat()}, self.access)
+
+    def op_book(self):
+        bas, bit = self._window()
+        status, body = self._call('book', self.t, 'POST', '/reservation/reservations/', {
+            'lot': self.rng.choice(self.lot_ids), 'plaka': f'34LT{self.rng.randrange(10000):04d}',
+            'baslangic': bas.isoformat(), 'bitis': bit.isoformat(),
+        }, self.access)
+        if status == 201:
+            self.booked.append(body['id'])
+
+    def op_cancel(self):
+        resv_id = self.booked.pop(self.rng.randrange(len(self.booked)))
+        self._call('cancel', self.t, 'POST', f'/reservation/reservations/{resv_id}/cancel/', {}, self.access)
+
+    def op_check_in(self):
+        # müşteri QR ekranını açar (detay), görevli okutur
+        resv_id = self.booked.pop(self.rng.randrange(len(self.booked)))
+        status, body = self._call('qr_detail', self.t, 'GET', f'/reservation/reservations/{resv_id}/',
+                                  None, self.access)
+        if status != 200:
+            return
+        status, _ = self._call('check_in', self.staff, 'POST', '/reservation/check-by-qr/',
+                               {'qr_token': body['qr_token'], 'tip': 'check_in'}, self.staff_token)
+        if status == 200:
+            self.checked_in.append(body['qr_token'])
+
+    def op_check_out(self):
+        self._call('check_out', self.staff, 'POST', '/reservation/check-by-qr/',
+                   {'qr_token': self.checked_in.pop(0), 'tip': 'check_out'}, self.staff_token)
+
+    def op_refresh(self):
+        status, body = self._call('refresh', self.t, 'POST', '/account/auth/token/refresh/',
+                                  {'refresh': self.refresh_token})
+        if status == 200:
+            self.access = body['access']
+            self.refresh_token = body.get('refresh', self.refresh_token)
+
+
+def run_user(vu, n_requests, deadline):
+    """VU'yu istek sayısı ya da süre dolana kadar çalıştır -> [(uç nokta, durum, saniye), ...]."""
+    while len(vu.samples) < n_requests and time.perf_counter() < deadline:
+        vu.step()
+    return vu.samples
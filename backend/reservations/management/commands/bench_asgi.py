@@ -0,0 +1,208 @@
+import asyncio
+import json
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+from io import BytesIO
+from urllib.parse import urlencode
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reservations import availability
+from reservations.models import Reservation
+
+from ._bench import seed_lots, seed_reservations, summarize, throwaway_db
+
+STACKS = ('wsgi', 'asgi', 'asgi-async')
+SCENARIOS = ('poll', 'lot', 'scan')
+
+
+class Command(BaseCommand):
+    help = ("Gate okutma (check-by-qr), doluluk takvimi yoklama ve lot detayı için sürekli eşzamanlı "
+            "yükte üç yığını karşılaştırır: WSGI + DRF view, ASGI + DRF view ve ASGI + async view "
+            "(/reservation/async/, kısa middleware zinciri). Gerçek core.wsgi/core.asgi uygulamaları "
+            "süreç içinde çağrılır; istemci ve sunucu aynı GIL'i paylaştığı için sonuçlar görelidir.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=32)
+        parser.add_argument('--duration', type=float, default=5.0, help="Senaryo başına saniye")
+        parser.add_argument('--lots', type=int, default=100)
+        parser.add_argument('--reservations', type=int, default=20_000, help="Okutulacak ve arka plan")
+        parser.add_argument('--stacks', default=','.join(STACKS))
+        parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+        parser.add_argument('--json', action='store_true')
+
+    def handle(self, *args, **opts):
+        with throwaway_db(threaded=True):
+            result = self._run(opts)
+        if opts['json']:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+        self.stdout.write(f"{'senaryo':<8}{'yığın':<12}{'istek/sn':>10}{'p50':>9}{'p95':>9}{'p99':>9}  durumlar")
+        for scenario, stacks in result['results'].items():
+            for stack, r in stacks.items():
+                self.stdout.write(f"{scenario:<8}{stack:<12}{r['rps']:>10}{r['p50_ms']:>9}{r['p95_ms']:>9}"
+                                  f"{r['p99_ms']:>9}  {r['statuses']}")
+
+    def _run(self, opts):
+        from core.asgi import application as asgi_app
+        from core.wsgi import application as wsgi_app
+
+        lot_ids = seed_lots(opts['lots'], kapasite=10_000)
+        seed_reservations(lot_ids, opts['reservations'], days=1, max_hours=3, rng=random.Random(3))
+        availability.rebuild()
+        staff = get_user_model().objects.create_user(username='gorevli', password='x', is_staff=True,
+                                                     role='gorevli')
+        token = str(AccessToken.for_user(staff))
+        # her (yığın, senaryo) çalıştırması kendi taze rezervasyonlarını okutur
+        tokens = list(Reservation.objects.values_list('qr_token', flat=True))
+        random.Random(4).shuffle(tokens)
+        stacks = [s for s in opts['stacks'].split(',') if s in STACKS]
+        scenarios = [s for s in opts['scenarios'].split(',') if s in SCENARIOS]
+        pools = {}
+        if 'scan' in scenarios:
+            share = len(tokens) // len(stacks)
+            pools = {s: iter(tokens[i * share:(i + 1) * share]) for i, s in enumerate(stacks)}
+
+        t0 = availability.floor_bucket(timezone.now())
+        window = {'baslangic': t0.isoformat(), 'bitis': (t0 + timedelta(days=1)).isoformat(),
+                  'granularity': '1h'}
+
+        def make_request(stack, scenario, rng):
+            prefix = '/reservation/async/' if stack == 'asgi-async' else '/reservation/'
+            if scenario == 'poll':
+                return 'GET', f'{prefix}lots/{rng.choice(lot_ids)}/availability/', window, None
+            if scenario == 'lot':
+                return 'GET', f'{prefix}lots/{rng.choice(lot_ids)}/', {}, None
+            qr_token = next(pools[stack], None)
+            if qr_token is None:
+                return None
+            return 'POST', f'{prefix}check-by-qr/', {}, {'qr_token': qr_token, 'tip': 'check_in'}
+
+        results = {}
+        for scenario in scenarios:
+            results[scenario] = {}
+            for stack in stacks:
+                def next_request(rng, stack=stack, scenario=scenario):
+                    return make_request(stack, scenario, rng)
+                if stack == 'wsgi':
+                    samples, wall = _drive_wsgi(wsgi_app, next_request, token, opts)
+                else:
+                    samples, wall = asyncio.run(_drive_asgi(asgi_app, next_request, token, opts))
+                statuses = Counter(status for status, _ in samples)
+                results[scenario][stack] = {
+                    'requests': len(samples),
+                    'rps': round(len(samples) / wall, 1),
+                    'statuses': {str(k): v for k, v in sorted(statuses.items())},
+                    **summarize([secs for _, secs in samples]),
+                }
+        return {
+            'concurrency': opts['concurrency'],
+            'duration_s': opts['duration'],
+            'lots': opts['lots'],
+            'results': results,
+        }
+
+
+def _environ(method, path, query, body, token):
+    raw = json.dumps(body).encode() if body is not None else b''
+    return {
+        'REQUEST_METHOD': method, 'PATH_INFO': path, 'QUERY_STRING': urlencode(query),
+        'SERVER_NAME': 'testserver', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_HOST': 'testserver', 'HTTP_AUTHORIZATION': f'Bearer {token}',
+        'CONTENT_TYPE': 'application/json', 'CONTENT_LENGTH': str(len(raw)),
+        'wsgi.input': BytesIO(raw), 'wsgi.errors': sys.stderr, 'wsgi.url_scheme': 'http',
+        'wsgi.version': (1, 0), 'wsgi.multithread': True, 'wsgi.multiprocess': False, 'wsgi.run_once': False,
+    }
+
+
+def _drive_wsgi(app, next_request, token, opts):
+    samples, lock = [], threading.Lock()
+    barrier = threading.Barrier(opts['concurrency'] + 1)
+    deadline = [0.0]
+
+    def worker(i):
+        rng, out = random.Random(i), []
+        barrier.wait()
+        while time.perf_counter() < deadline[0]:
+            req = next_request(rng)
+            if req is None:
+                break
+            status = []
+            started = time.perf_counter()
+            result = app(_environ(*req, token), lambda s, headers, exc_info=None: status.append(int(s[:3])))
+            try:
+                for _ in result:
+                    pass
+            finally:
+                result.close()
+            out.append((status[0], time.perf_counter() - started))
+        with lock:
+            samples.extend(out)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(opts['concurrency'])]
+    for th in threads:
+        th.start()
+    started = time.perf_counter()
+    deadline[0] = started + opts['duration']
+    barrier.wait()
+    for th in threads:
+        th.join()
+    return samples, time.perf_counter() - started
+
+
+async def _asgi_request(app, method, path, query, body, token):
+    raw = json.dumps(body).encode() if body is not None else b''
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'scheme': 'http',
+        'method': method, 'path': path, 'raw_path': path.encode(), 'root_path': '',
+        'query_string': urlencode(query).encode(), 'client': ('127.0.0.1', 50000), 'server': ('testserver', 80),
+        'headers': [(b'host', b'testserver'), (b'authorization', f'Bearer {token}'.encode()),
+                    (b'content-type', b'application/json'), (b'content-length', str(len(raw)).encode())],
+    }
+    status, sent = [], False
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {'type': 'http.request', 'body': raw, 'more_body': False}
+        await asyncio.Future()  # bağlantı kopmaz; yanıt bitince Django bu bekleyişi iptal eder
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status.append(message['status'])
+
+    await app(scope, receive, send)
+    return status[0]
+
+
+async def _drive_asgi(app, next_request, token, opts):
+    samples = []
+    start = asyncio.Event()
+    deadline = [0.0]
+
+    async def worker(i):
+        rng = random.Random(i)
+        await start.wait()
+        while time.perf_counter() < deadline[0]:
+            req = next_request(rng)
+            if req is None:
+                break
+            started = time.perf_counter()
+            status = await _asgi_request(app, *req, token)
+            samples.append((status, time.perf_counter() - started))
+
+    tasks = [asyncio.create_task(worker(i)) for i in range(opts['concurrency'])]
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    deadline[0] = started + opts['duration']
+    start.set()
+    await asyncio.gather(*tasks)
+    return samples, time.perf_counter() - started
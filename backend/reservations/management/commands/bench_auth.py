@@ -0,0 +1,85 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts import user_cache
+from accounts.authentication import FastJWTAuthentication
+from accounts.serializers import TokenObtainPairSerializer
+
+from ._bench import QueryCounter, seed_lots, summarize, throwaway_db, timed
+
+
+class Command(BaseCommand):
+    help = ("İstek başına JWT kimlik doğrulama maliyetini ölçer: simplejwt JWTAuthentication "
+            "(her istekte kullanıcı sorgusu) ile FastJWTAuthentication'ın claim yolu (okuma), önbellek "
+            "isabeti ve ıskası (yazma). Ayrıca önbellekli lot detayı (GET) uçtan uca claim'li ve "
+            "claim'siz token ile karşılaştırılır.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=5000, help="Tablodaki kullanıcı sayısı")
+        parser.add_argument('--repeat', type=int, default=2000)
+        parser.add_argument('--json', action='store_true')
+
+    def handle(self, *args, **opts):
+        with throwaway_db():
+            result = self._run(opts)
+        if opts['json']:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+        self.stdout.write(f"{'yol':<28}{'sorgu/istek':>12}{'p50 µs':>10}{'p95 µs':>10}{'p99 µs':>10}")
+        for name, r in result.items():
+            self.stdout.write(f"{name:<28}{r['queries']:>12}{r['p50_us']:>10}{r['p95_us']:>10}{r['p99_us']:>10}")
+
+    def _run(self, opts):
+        User = get_user_model()
+        User.objects.bulk_create([User(username=f'u{i}') for i in range(opts['users'])], batch_size=2000)
+        staff = User.objects.create_user(username='gorevli', password='x', is_staff=True, role='gorevli')
+        lot_id = seed_lots(1)[0]
+
+        access = str(TokenObtainPairSerializer.get_token(staff).access_token)
+        plain = str(AccessToken.for_user(staff))  # claim'siz (eski sürümün token'ı)
+        factory = APIRequestFactory()
+        get = Request(factory.get('/', HTTP_AUTHORIZATION=f'Bearer {access}'))
+        post = Request(factory.post('/', HTTP_AUTHORIZATION=f'Bearer {access}'))
+        simple, fast = JWTAuthentication(), FastJWTAuthentication()
+
+        def miss():
+            user_cache.clear()
+            fast.authenticate(post)
+
+        cases = {
+            'simplejwt (önce)': lambda: simple.authenticate(get),
+            'fast: claim (okuma)': lambda: fast.authenticate(get),
+            'fast: önbellek (yazma)': lambda: fast.authenticate(post),
+            'fast: önbellek ıskası': miss,
+        }
+        client = APIClient()
+        url = f'/reservation/lots/{lot_id}/'  # katalog önbelleğinden; kalan maliyet çoğunlukla kimlik doğrulama
+
+        def e2e(token, cold):
+            def call():
+                if cold:
+                    user_cache.clear()
+                assert client.get(url, HTTP_AUTHORIZATION=f'Bearer {token}').status_code == 200
+            return call
+        cases['uçtan uca: db (önce)'] = e2e(plain, cold=True)
+        cases['uçtan uca: claim'] = e2e(access, cold=False)
+
+        result = {}
+        for name, fn in cases.items():
+            timed(fn, 100)  # ısınma
+            counter = QueryCounter()
+            with connection.execute_wrapper(counter):
+                samples = timed(fn, opts['repeat'])
+            s = summarize(samples)
+            result[name] = {
+                'queries': round(counter.count / opts['repeat'], 2),
+                **{k.replace('_ms', '_us'): round(v * 1000, 1) for k, v in s.items() if k.endswith('_ms')},
+            }
+        return result
@@ -0,0 +1,69 @@
+import json
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from reservations import availability
+from reservations.models import ParkingLot, Reservation
+
+from ._bench import seed_lots, seed_reservations, summarize, throwaway_db, timed
+
+
+class Command(BaseCommand):
+    help = ("Doluluk motoru (LotOccupancy aralık-MAX) ile naif çakışan rezervasyon "
+            "COUNT(*) sorgusunu geçici bir veritabanında karşılaştırır.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reservations', type=int, default=1_000_000)
+        parser.add_argument('--lots', type=int, default=50)
+        parser.add_argument('--queries', type=int, default=500)
+        parser.add_argument('--json', action='store_true', help="Sonucu JSON olarak yaz")
+
+    def handle(self, *args, **opts):
+        with throwaway_db():
+            result = self._run(opts)
+        if opts['json']:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+        for k, v in result.items():
+            self.stdout.write(f"{k:>10}: {v}")
+
+    def _run(self, opts):
+        rng = random.Random(7)
+        lot_ids = seed_lots(opts['lots'], kapasite=1_000_000)
+
+        t = time.perf_counter()
+        t0 = seed_reservations(lot_ids, opts['reservations'], rng=rng)
+        seed_s = time.perf_counter() - t
+
+        t = time.perf_counter()
+        n_buckets = availability.rebuild()
+        rebuild_s = time.perf_counter() - t
+
+        lots = {l.pk: l for l in ParkingLot.objects.all()}
+        windows = []
+        for _ in range(opts['queries']):
+            bas = t0 + timedelta(minutes=rng.randrange(0, 90 * 24 * 60, 15))
+            windows.append((lots[rng.choice(lot_ids)], bas, bas + timedelta(hours=rng.randint(1, 6))))
+        it = iter(windows * 2)
+
+        def naive():
+            lot, bas, bit = next(it)
+            Reservation.objects.filter(
+                lot=lot, durum__in=Reservation.AKTIF, baslangic__lt=bit, bitis__gt=bas,
+            ).count()
+
+        def engine():
+            lot, bas, bit = next(it)
+            availability.has_capacity(lot, bas, bit)
+
+        return {
+            'rows': opts['reservations'],
+            'buckets': n_buckets,
+            'seed_s': round(seed_s, 2),
+            'rebuild_s': round(rebuild_s, 2),
+            'naive': summarize(timed(naive, len(windows))),
+            'engine': summarize(timed(engine, len(windows))),
+        }
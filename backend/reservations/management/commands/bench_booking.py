@@ -0,0 +1,112 @@
+import json
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from rest_framework.test import APIClient
+
+from reservations.models import Reservation
+
+from ._bench import seed_lots, summarize, throwaway_db
+
+
+def max_concurrency(intervals):
+    """[(bas, bitis), ...] için aynı anda açık en fazla aralık sayısı (sweep line)."""
+    events = sorted([(b, 1) for b, _ in intervals] + [(e, -1) for _, e in intervals])
+    cur = peak = 0
+    for _, d in events:
+        cur += d
+        peak = max(peak, cur)
+    return peak
+
+
+class Command(BaseCommand):
+    help = ("Çok thread'li rezervasyon yük testi: aynı lotlara eşzamanlı POST atar, "
+            "fazla rezervasyon (overbooking) olmadığını doğrular ve booking/sn raporlar.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=16)
+        parser.add_argument('--requests', type=int, default=800, help="Toplam POST sayısı")
+        parser.add_argument('--lots', type=int, default=4)
+        parser.add_argument('--kapasite', type=int, default=25)
+        parser.add_argument('--json', action='store_true')
+
+    def handle(self, *args, **opts):
+        with throwaway_db(threaded=True):
+            result = self._run(opts)
+        if opts['json']:
+            self.stdout.write(json.dumps(result, indent=2))
+        else:
+            for k, v in result.items():
+                self.stdout.write(f"{k:>16}: {v}")
+        if result['overbooked_lots']:
+            raise CommandError("Overbooking tespit edildi!")
+
+    def _run(self, opts):
+        lot_ids = seed_lots(opts['lots'], kapasite=opts['kapasite'])
+        user = get_user_model().objects.create_user(username='bench', password='x')
+        base = datetime(2030, 1, 1, 8, tzinfo=dt_timezone.utc)
+        # Birbiriyle çakışan az sayıda pencere: yüksek çekişme
+        windows = [(base + timedelta(hours=h), base + timedelta(hours=h + d))
+                   for h in range(0, 6) for d in (1, 2, 3)]
+
+        rng = random.Random(1)
+        jobs = [(rng.choice(lot_ids), *rng.choice(windows)) for _ in range(opts['requests'])]
+        per_thread = [jobs[i::opts['threads']] for i in range(opts['threads'])]
+
+        statuses = Counter()
+        latencies = []
+        lock = threading.Lock()
+        start_gate = threading.Barrier(opts['threads'])
+
+        def worker(my_jobs):
+            client = APIClient()
+            client.force_authenticate(user)
+            local_lat, local_st = [], Counter()
+            start_gate.wait()
+            for lot_id, bas, bit in my_jobs:
+                t = time.perf_counter()
+                r = client.post('/reservation/reservations/', {
+                    'lot': lot_id, 'plaka': '34BNC01',
+                    'baslangic': bas.isoformat(), 'bitis': bit.isoformat(),
+                }, format='json')
+                local_lat.append(time.perf_counter() - t)
+                local_st[r.status_code] += 1
+            connections.close_all()
+            with lock:
+                latencies.extend(local_lat)
+                statuses.update(local_st)
+
+        threads = [threading.Thread(target=worker, args=(j,)) for j in per_thread]
+        wall = time.perf_counter()
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        wall = time.perf_counter() - wall
+
+        intervals = defaultdict(list)
+        for lot_id, bas, bit in Reservation.objects.filter(durum__in=Reservation.AKTIF) \
+                .values_list('lot_id', 'baslangic', 'bitis'):
+            intervals[lot_id].append((bas, bit))
+        peaks = {lot_id: max_concurrency(iv) for lot_id, iv in intervals.items()}
+        over = {lot_id: p for lot_id, p in peaks.items() if p > opts['kapasite']}
+
+        return {
+            'backend': connection.vendor,
+            'path': 'select_for_update' if connection.features.has_select_for_update else 'optimistic',
+            'threads': opts['threads'],
+            'requests': opts['requests'],
+            'statuses': dict(statuses),
+            'wall_s': round(wall, 3),
+            'bookings_per_s': round(statuses[201] / wall, 1),
+            'requests_per_s': round(opts['requests'] / wall, 1),
+            'latency': summarize(latencies),
+            'peak_per_lot': peaks,
+            'overbooked_lots': over,
+        }
@@ -0,0 +1,124 @@
+import json
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from rest_framework.test import APIClient
+
+from core.db import sqlite_config
+from reservations import availability
+from reservations.models import Reservation
+
+from ._bench import seed_lots, seed_reservations, summarize, throwaway_db
+
+# SQLite'ın Django varsayılanı: rollback journal, synchronous=FULL, DEFERRED, 5 sn bekleme
+SQLITE_MODES = {
+    'sqlite-varsayilan': {},
+    'sqlite-wal': sqlite_config('', {})['OPTIONS'],
+}
+
+
+class Command(BaseCommand):
+    help = ("Yazma çekişmesi: eşzamanlı thread'ler rezervasyon açar (POST /reservation/reservations/) ve "
+            "gate check-in okutur (POST /reservation/check-by-qr/). SQLite Django varsayılanları ile "
+            "core/db.py ayarları (WAL, synchronous=NORMAL, IMMEDIATE) karşılaştırılır; DATABASE_URL "
+            "ile PostgreSQL'e bağlıysa o da ölçülür. 500'ler çoğunlukla 'database is locked'tır.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=16)
+        parser.add_argument('--duration', type=float, default=5.0, help="Mod başına saniye")
+        parser.add_argument('--lots', type=int, default=8)
+        parser.add_argument('--modes', default='', help="Virgülle; boşsa backend'e uyan hepsi")
+        parser.add_argument('--json', action='store_true')
+
+    def handle(self, *args, **opts):
+        if connection.vendor == 'sqlite':
+            modes = dict(SQLITE_MODES)
+        else:
+            modes = {connection.vendor: connection.settings_dict['OPTIONS']}
+        if opts['modes']:
+            modes = {k: v for k, v in modes.items() if k in opts['modes'].split(',')}
+
+        original = connection.settings_dict['OPTIONS']
+        result = {}
+        try:
+            for name, options in modes.items():
+                # thread'lerin yeni bağlantıları aynı settings_dict'ten kurulur
+                connections.close_all()
+                connection.settings_dict['OPTIONS'] = dict(options)
+                with throwaway_db(threaded=True):
+                    result[name] = self._run(opts)
+        finally:
+            connections.close_all()
+            connection.settings_dict['OPTIONS'] = original
+
+        if opts['json']:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+        self.stdout.write(f"{'mod':<20}{'yazma/sn':>10}{'p50':>9}{'p95':>9}{'p99':>9}{'500':>6}  durumlar")
+        for name, r in result.items():
+            self.stdout.write(f"{name:<20}{r['writes_per_s']:>10}{r['p50_ms']:>9}{r['p95_ms']:>9}"
+                              f"{r['p99_ms']:>9}{r['errors']:>6}  {r['statuses']}")
+
+    def _run(self, opts):
+        lot_ids = seed_lots(opts['lots'], kapasite=10_000)
+        seed_reservations(lot_ids, 50_000, days=1, max_hours=3, rng=random.Random(11))
+        availability.rebuild()
+        user = get_user_model().objects.create_user(username='bench', password='x', is_staff=True)
+        tokens = iter(Reservation.objects.values_list('qr_token', flat=True))
+        base = datetime(2030, 1, 1, 8, tzinfo=dt_timezone.utc)
+
+        stop = threading.Event()
+        lock = threading.Lock()
+        statuses, latencies = Counter(), []
+        barrier = threading.Barrier(opts['threads'] + 1)
+
+        def worker(i):
+            rng = random.Random(i)
+            client = APIClient()
+            client.raise_request_exception = False  # kilit hatası 500 olarak sayılsın
+            client.force_authenticate(user)
+            local_st, local_lat = Counter(), []
+            barrier.wait()
+            while not stop.is_set():
+                started = time.perf_counter()
+                if i % 2:
+                    bas = base + timedelta(hours=rng.randrange(48))
+                    r = client.post('/reservation/reservations/', {
+                        'lot': rng.choice(lot_ids), 'plaka': '34BNC01',
+                        'baslangic': bas.isoformat(), 'bitis': (bas + timedelta(hours=2)).isoformat(),
+                    }, format='json')
+                else:
+                    with lock:
+                        token = next(tokens)
+                    r = client.post('/reservation/check-by-qr/', {'qr_token': token, 'tip': 'check_in'})
+                local_lat.append(time.perf_counter() - started)
+                local_st[r.status_code] += 1
+            connections.close_all()
+            with lock:
+                statuses.update(local_st)
+                latencies.extend(local_lat)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(opts['threads'])]
+        for th in threads:
+            th.start()
+        barrier.wait()
+        started = time.perf_counter()
+        time.sleep(opts['duration'])
+        stop.set()
+        for th in threads:
+            th.join()
+        wall = time.perf_counter() - started
+
+        ok = statuses[200] + statuses[201]
+        return {
+            'writes_per_s': round(ok / wall, 1),
+            'errors': statuses[500],
+            'statuses': {str(k): v for k, v in sorted(statuses.items())},
+            **{k: v for k, v in summarize(latencies).items() if k.endswith(('p50_ms', 'p95_ms', 'p99_ms'))},
+        }
@@ -0,0 +1,52 @@
+import json
+import random
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from reservations import export
+
+from ._bench import seed_lots, seed_reservations, throwaway_db
+
+
+class Command(BaseCommand):
+    help = ("export.stream'in satır/sn hızını ve en yüksek Python bellek kullanımını farklı "
+            "satır sayılarında ölçer (bellek satır sayısıyla büyümemeli).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='50000,200000,500000')
+        parser.add_argument('--formats', default='csv,ndjson' + (',parquet' if export.parquet_available() else ''))
+        parser.add_argument('--json', action='store_true')
+
+    def handle(self, *args, **opts):
+        with throwaway_db():
+            result = self._run(opts)
+        if opts['json']:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+        for row in result:
+            self.stdout.write(f"{row['format']:>8} {row['rows']:>9} satır  {row['rows_per_s']:>10} satır/sn  "
+                              f"{row['mb_out']:>8} MB çıktı  tepe bellek {row['peak_mb']} MB")
+
+    def _run(self, opts):
+        lot_ids = seed_lots(20)
+        sizes = sorted(int(s) for s in opts['sizes'].split(','))
+        seeded, out = 0, []
+        for n in sizes:
+            seed_reservations(lot_ids, n - seeded, rng=random.Random(n))
+            seeded = n
+            for fmt in opts['formats'].split(','):
+                tracemalloc.start()
+                t = time.perf_counter()
+                size = sum(len(part) for part in export.stream('reservations', fmt))
+                secs = time.perf_counter() - t
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                out.append({
+                    'format': fmt, 'rows': n,
+                    'rows_per_s': round(n / secs),
+                    'mb_out': round(size / 2**20, 1),
+                    'peak_mb': round(peak / 2**20, 1),
+                })
+        return out
@@ -0,0 +1,91 @@
+import json
+import random
+import threading
+import time
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.models import Count
+from rest_framework.test import APIClient
+
+from reservations.models import CheckEvent, Reservation
+
+from ._bench import seed_lots, seed_reservations, summarize, throwaway_db
+
+
+class Command(BaseCommand):
+    help = ("Aynı anda okutan N gate'i simüle eder (check-in + check-out, bir kısmı çift okutma) "
+            "ve /check-by-qr/ gecikme yüzdeliklerini raporlar; çift kayıt olmadığını doğrular.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--gates', type=int, default=50)
+        parser.add_argument('--per-gate', type=int, default=40, help="Gate başına rezervasyon")
+        parser.add_argument('--dup', type=float, default=0.1, help="Çift okutma oranı")
+        parser.add_argument('--json', action='store_true')
+
+    def handle(self, *args, **opts):
+        with throwaway_db(threaded=True):
+            result = self._run(opts)
+        if opts['json']:
+            self.stdout.write(json.dumps(result, indent=2))
+        else:
+            for k, v in result.items():
+                self.stdout.write(f"{k:>14}: {v}")
+        if result['double_events']:
+            raise CommandError("Aynı geçiş için birden fazla CheckEvent yazıldı!")
+
+    def _run(self, opts):
+        gates = opts['gates']
+        lot_ids = seed_lots(gates, kapasite=opts['per_gate'])
+        staff = get_user_model().objects.create_user(username='gorevli', password='x', is_staff=True)
+        for lot_id in lot_ids:
+            seed_reservations([lot_id], opts['per_gate'], days=1, max_hours=3)
+        by_lot = {}
+        for lot_id, token in Reservation.objects.values_list('lot_id', 'qr_token'):
+            by_lot.setdefault(lot_id, []).append(token)
+
+        rng = random.Random(5)
+        latencies, statuses = [], Counter()
+        lock = threading.Lock()
+        barrier = threading.Barrier(gates)
+
+        def gate_worker(lot_id, tokens):
+            client = APIClient(raise_request_exception=False)  # 500'ler sayılsın, thread ölmesin
+            client.force_authenticate(staff)
+            lat, st = [], Counter()
+            barrier.wait()
+            for tip in ('check_in', 'check_out'):
+                for token in tokens:
+                    for _ in range(2 if rng.random() < opts['dup'] else 1):
+                        t = time.perf_counter()
+                        r = client.post('/reservation/check-by-qr/',
+                                        {'qr_token': token, 'tip': tip, 'lot': lot_id})
+                        lat.append(time.perf_counter() - t)
+                        st[r.status_code] += 1
+            connections.close_all()
+            with lock:
+                latencies.extend(lat)
+                statuses.update(st)
+
+        threads = [threading.Thread(target=gate_worker, args=item) for item in by_lot.items()]
+        wall = time.perf_counter()
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        wall = time.perf_counter() - wall
+
+        doubles = (CheckEvent.objects.values('reservation_id', 'tip')
+                   .annotate(n=Count('id')).filter(n__gt=1).count())
+        return {
+            'backend': connection.vendor,
+            'gates': gates,
+            'scans': len(latencies),
+            'statuses': dict(statuses),
+            'wall_s': round(wall, 3),
+            'scans_per_s': round(len(latencies) / wall, 1),
+            'latency': summarize(latencies),
+            'double_events': doubles,
+        }
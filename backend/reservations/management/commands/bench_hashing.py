@@ -0,0 +1,128 @@
+import json
+import os
+import random
+import threading
+import time
+from importlib.util import find_spec
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from reservations import availability
+from reservations.models import Reservation
+
+from ._bench import seed_lots, seed_reservations, summarize, throwaway_db, timed
+
+PASSWORD = 'Guclu.Sifre-2024'
+
+
+class Command(BaseCommand):
+    help = ("Şifre hash politikasının maliyetini ölçer: algoritma başına tek çekirdekte doğrulama/sn, "
+            "POST /account/auth/token/ ile uçtan uca giriş/sn ve bir giriş patlaması sırasında gate "
+            "okutma gecikmesi (hash havuzu açık/kapalı).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--duration', type=float, default=5.0, help="Senaryo başına saniye")
+        parser.add_argument('--logins', type=int, default=16, help="Eşzamanlı giriş yapan istemci")
+        parser.add_argument('--scanners', type=int, default=2, help="Eşzamanlı gate okutan istemci")
+        parser.add_argument('--json', action='store_true')
+
+    def handle(self, *args, **opts):
+        with throwaway_db(threaded=True):
+            result = self._run(opts)
+        if opts['json']:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+        self.stdout.write(f"çekirdek: {result['cpus']}, tercih edilen: {result['preferred']}")
+        self.stdout.write(f"{'algoritma':<16}{'parametreler':<60}{'ms/hash':>9}{'doğrulama/sn/çekirdek':>23}")
+        for name, r in result['hashers'].items():
+            self.stdout.write(f"{name:<16}{r['params']:<60}{r['ms']:>9}{r['per_core_per_s']:>23}")
+        for name, r in result['burst'].items():
+            self.stdout.write(f"{name:<28} giriş/sn {r['logins_per_s']:>7}  okutma p50 {r['scan']['p50_ms']:>8} ms"
+                              f"  p95 {r['scan']['p95_ms']:>8} ms  p99 {r['scan']['p99_ms']:>8} ms"
+                              f"  503: {r['busy']}")
+
+    def _run(self, opts):
+        result = {'cpus': os.cpu_count(), 'preferred': get_hasher().algorithm, 'hashers': {}, 'burst': {}}
+
+        algorithms = ['pbkdf2_sha256', 'scrypt'] + (['argon2'] if find_spec('argon2') else [])
+        with override_settings(PASSWORD_HASH_WORKERS=0):  # saf hash maliyeti
+            for algorithm in algorithms:
+                hasher = get_hasher(algorithm)
+                encoded = make_password(PASSWORD, hasher=algorithm)
+                secs = summarize(timed(lambda: hasher.verify(PASSWORD, encoded), 5))['p50_ms'] / 1000
+                summary = hasher.safe_summary(encoded)
+                params = ', '.join(f'{k}={v}' for k, v in summary.items() if k not in ('algorithm', 'salt', 'hash'))
+                result['hashers'][algorithm] = {
+                    'params': params,
+                    'ms': round(secs * 1000, 1),
+                    'per_core_per_s': round(1 / secs, 1),
+                }
+
+        User = get_user_model()
+        User.objects.create_user(username='musteri', password=PASSWORD)
+        staff = User.objects.create_user(username='gorevli', password=PASSWORD, is_staff=True, role='gorevli')
+        lot_ids = seed_lots(10, kapasite=10_000)
+        seed_reservations(lot_ids, 20_000, days=1, max_hours=3, rng=random.Random(9))
+        availability.rebuild()
+        tokens = iter(Reservation.objects.values_list('qr_token', flat=True))
+
+        workers = max(1, (os.cpu_count() or 2) // 2)
+        scenarios = {
+            'yalnız okutma': (0, None),
+            'patlama, havuz kapalı': (opts['logins'], 0),
+            f'patlama, havuz={workers}': (opts['logins'], workers),
+        }
+        for name, (logins, pool) in scenarios.items():
+            with override_settings(PASSWORD_HASH_WORKERS=pool, PASSWORD_HASH_QUEUE=4 * opts['logins']):
+                result['burst'][name] = self._burst(opts, logins, opts['scanners'], staff, tokens)
+        return result
+
+    def _burst(self, opts, n_login, n_scan, staff, tokens):
+        stop = threading.Event()
+        lock = threading.Lock()
+        scans, logins, busy = [], [0], [0]
+
+        def login():
+            client = APIClient()
+            while not stop.is_set():
+                r = client.post('/account/auth/token/', {'username': 'musteri', 'password': PASSWORD})
+                with lock:
+                    if r.status_code == 200:
+                        logins[0] += 1
+                    elif r.status_code == 503:
+                        busy[0] += 1
+
+        def scan():
+            client = APIClient()
+            client.force_authenticate(staff)
+            out = []
+            while not stop.is_set():
+                with lock:
+                    token = next(tokens, None)
+                if token is None:
+                    break
+                started = time.perf_counter()
+                client.post('/reservation/check-by-qr/', {'qr_token': token, 'tip': 'check_in'})
+                out.append(time.perf_counter() - started)
+            with lock:
+                scans.extend(out)
+
+        threads = ([threading.Thread(target=login) for _ in range(n_login)] +
+                   [threading.Thread(target=scan) for _ in range(n_scan)])
+        started = time.perf_counter()
+        for th in threads:
+            th.start()
+        time.sleep(opts['duration'])
+        stop.set()
+        for th in threads:
+            th.join()
+        wall = time.perf_counter() - started
+        return {
+            'logins_per_s': round(logins[0] / wall, 1),
+            'busy': busy[0],
+            'scan': summarize(scans),
+        }
@@ -0,0 +1,70 @@
+import json
+import random
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import modify_settings
+from rest_framework.test import APIClient
+
+from reservations.models import Reservation
+
+from ._bench import seed_lots, seed_reservations, summarize, throwaway_db, timed
+
+
+class Command(BaseCommand):
+    help = ("core.metrics.PerfMiddleware'ın istek başına ek maliyetini ölçer: aynı uç noktalar "
+            "middleware açık ve kapalıyken çağrılır, p50 farkı µs olarak raporlanır.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=500)
+        parser.add_argument('--json', action='store_true')
+
+    def handle(self, *args, **opts):
+        with throwaway_db():
+            result = self._run(opts)
+        if opts['json']:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+        for k, v in result.items():
+            self.stdout.write(f"{k:>20}: {v}")
+
+    def _run(self, opts):
+        lot_ids = seed_lots(20, kapasite=100)
+        seed_reservations(lot_ids, 2000, rng=random.Random(5))
+        admin = get_user_model().objects.create_user(username='bench', password='x', is_staff=True)
+        Reservation.objects.update(user=admin)
+        resv_id = Reservation.objects.values_list('id', flat=True).first()
+
+        # test istemcisi middleware zincirini ilk istekte kurar; kapalı istemci o anda
+        # PerfMiddleware'sız ayarlarla ısıtılır ve sonra öyle kalır
+        on_client, off_client = APIClient(), APIClient()
+        for c in (on_client, off_client):
+            c.force_authenticate(admin)
+        urls = {
+            'lot_detail': f'/reservation/lots/{lot_ids[0]}/',
+            'reservation_detail': f'/reservation/reservations/{resv_id}/',
+            'reservations_page': '/reservation/reservations/?page_size=50',
+        }
+        with modify_settings(MIDDLEWARE={'remove': 'core.metrics.PerfMiddleware'}):
+            assert not off_client.get(urls['lot_detail']).has_header('Server-Timing')
+        assert on_client.get(urls['lot_detail']).has_header('Server-Timing')
+
+        result = {}
+        for name, url in urls.items():
+            def call(client, url=url):
+                assert client.get(url).status_code == 200
+
+            for c in (on_client, off_client):  # ısınma (önbellekler)
+                timed(lambda: call(c), 50)
+            # açık/kapalı bloklar sırayla: ısınma ve GC etkisi iki tarafa eşit dağılsın
+            on, off = [], []
+            for _ in range(max(1, opts['repeat'] // 50)):
+                off += timed(lambda: call(off_client), 50)
+                on += timed(lambda: call(on_client), 50)
+            on, off = summarize(on), summarize(off)
+            result[name] = {
+                'off_p50_ms': off['p50_ms'],
+                'on_p50_ms': on['p50_ms'],
+                'overhead_us': round((on['p50_ms'] - off['p50_ms']) * 1000, 1),
+            }
+        return result
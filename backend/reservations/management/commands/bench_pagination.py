@@ -0,0 +1,74 @@
+import json
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIClient
+
+from reservations.models import Reservation
+from reservations.pagination import ReservationPagination
+
+from ._bench import seed_lots, seed_reservations, summarize, throwaway_db, timed
+
+
+class Command(BaseCommand):
+    help = ("/reservations/ listesinde keyset sayfalamanın farklı derinliklerdeki gecikmesini "
+            "OFFSET sayfalamayla karşılaştırır (derin sayfa da ilk sayfa kadar ucuz olmalı).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reservations', type=int, default=1_000_000)
+        parser.add_argument('--page-size', type=int, default=50)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--json', action='store_true')
+
+    def handle(self, *args, **opts):
+        with throwaway_db():
+            result = self._run(opts)
+        if opts['json']:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+        for k, v in result.items():
+            self.stdout.write(f"{k:>18}: {v}")
+
+    def _run(self, opts):
+        n, size = opts['reservations'], opts['page_size']
+        t = time.perf_counter()
+        seed_reservations(seed_lots(50, kapasite=10_000), n, rng=random.Random(11))
+        seed_s = round(time.perf_counter() - t, 1)
+
+        client = APIClient()
+        client.force_authenticate(get_user_model().objects.create_user(username='bench', password='x',
+                                                                      is_staff=True))
+        ordered = Reservation.objects.order_by(*ReservationPagination.ordering)
+        paginator = ReservationPagination()
+
+        keyset, offset = {}, {}
+        for depth in (0, 0.01, 0.5, 0.99):
+            k = int((n - size) * depth)
+            url = f'/reservation/reservations/?page_size={size}'
+            if k:
+                # k. satırdan hemen önceki kayıt cursor konumu olur
+                anchor = ordered.only('id', 'created_at')[k - 1]
+                url += '&cursor=' + paginator.encode_cursor(anchor, reverse=False)
+
+            def via_cursor(url=url):
+                r = client.get(url)
+                assert r.status_code == 200 and len(r.data['results']) == size
+
+            def via_offset(k=k):
+                assert len(list(ordered.select_related('lot', 'user', 'rateplan')[k:k + size])) == size
+
+            label = f'{depth:.0%}'
+            keyset[label] = summarize(timed(via_cursor, opts['repeat']))
+            offset[label] = summarize(timed(via_offset, max(1, opts['repeat'] // 4)))
+
+        p50 = [v['p50_ms'] for v in keyset.values()]
+        return {
+            'rows': n,
+            'page_size': size,
+            'seed_s': seed_s,
+            'keyset_api': keyset,
+            'offset_orm': offset,
+            'keyset_flatness': round(max(p50) / min(p50), 2),  # en derin / en sığ p50
+        }
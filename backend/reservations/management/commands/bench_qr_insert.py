@@ -0,0 +1,69 @@
+import json
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from reservations.models import ParkingLot, RatePlan, Reservation, _gen_token
+
+from ._bench import QueryCounter, seed_lots, seed_reservations, throwaway_db
+
+
+class Command(BaseCommand):
+    help = ("Reservation insert hızı: eski yol (token için önce exists() sorgusu) ile "
+            "yalnızca unique kısıtına dayanan iyimser insert'i karşılaştırır. "
+            "DATABASES['default'] hangi backend ise (SQLite/PostgreSQL) onu ölçer.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--inserts', type=int, default=5000)
+        parser.add_argument('--existing', type=int, default=200_000,
+                            help="Önceden tabloda bulunan rezervasyon sayısı (indeks boyutu)")
+        parser.add_argument('--json', action='store_true')
+
+    def handle(self, *args, **opts):
+        with throwaway_db():
+            result = self._run(opts)
+        if opts['json']:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+        for k, v in result.items():
+            self.stdout.write(f"{k:>14}: {v}")
+
+    def _run(self, opts):
+        lot_ids = seed_lots(1, kapasite=10_000_000)
+        seed_reservations(lot_ids, opts['existing'])
+        lot = ParkingLot.objects.get(pk=lot_ids[0])
+        rp = RatePlan.objects.get(lot=lot)
+        bas = timezone.now() + timedelta(days=1)
+
+        def make():
+            return Reservation(lot=lot, rateplan=rp, plaka='34QR001', baslangic=bas, bitis=bas + timedelta(hours=2))
+
+        def legacy():
+            # eski Reservation.save: exists() ön kontrolü + her insert'te transaction
+            r = make()
+            t = _gen_token()
+            Reservation.objects.filter(qr_token=t).exists()
+            r.qr_token = t
+            r.ucret_hesap = r.hesapla_ucret()
+            with transaction.atomic():
+                models.Model.save(r)
+
+        def optimistic():
+            make().save()
+
+        out = {'backend': connection.vendor, 'inserts': opts['inserts'], 'existing': opts['existing']}
+        for name, fn in (('legacy', legacy), ('optimistic', optimistic)):
+            counter = QueryCounter()
+            with connection.execute_wrapper(counter):
+                t = time.perf_counter()
+                for _ in range(opts['inserts']):
+                    fn()
+                secs = time.perf_counter() - t
+            out[name] = {
+                'inserts_per_s': round(opts['inserts'] / secs, 1),
+                'queries_per_insert': round(counter.count / opts['inserts'], 2),
+            }
+        return out
@@ -0,0 +1,69 @@
+import json
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIClient
+
+from reservations import availability
+from reservations.models import ParkingLot, Reservation
+
+from ._bench import seed_lots, seed_reservations, summarize, throwaway_db, timed
+
+
+class Command(BaseCommand):
+    help = ("Toplu müsaitlik araması (/lots/search/) ile lot başına müsaitlik + "
+            "hesapla_ucret döngüsünü (N+1) karşılaştırır.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lots', type=int, default=5000)
+        parser.add_argument('--reservations', type=int, default=100_000)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--json', action='store_true')
+
+    def handle(self, *args, **opts):
+        with throwaway_db():
+            result = self._run(opts)
+        if opts['json']:
+            self.stdout.write(json.dumps(result, indent=2))
+            return
+        for k, v in result.items():
+            self.stdout.write(f"{k:>18}: {v}")
+
+    def _run(self, opts):
+        lot_ids = seed_lots(opts['lots'], kapasite=50)
+        t0 = seed_reservations(lot_ids, opts['reservations'], days=30, rng=random.Random(3))
+        availability.rebuild()
+
+        bas = t0 + timedelta(days=3, hours=18)
+        bit = bas + timedelta(hours=5)
+        params = {'baslangic': bas.isoformat(), 'bitis': bit.isoformat()}
+        client = APIClient()
+        client.force_authenticate(get_user_model().objects.create_user(username='bench', password='x'))
+
+        def naive():
+            out = []
+            for lot in ParkingLot.objects.filter(aktif=True):
+                bos = availability.free_capacity(lot, bas, bit)
+                fiyat = Reservation(lot=lot, baslangic=bas, bitis=bit).hesapla_ucret()
+                out.append((fiyat, -bos, lot.pk))
+            out.sort()
+
+        def set_based():
+            assert client.get('/reservation/lots/search/', params).status_code == 200
+
+        def set_based_by_free():
+            client.get('/reservation/lots/search/', {**params, 'ordering': '-bos'})
+
+        t = time.perf_counter()
+        naive_samples = timed(naive, max(1, opts['repeat'] // 10))
+        return {
+            'lots': opts['lots'],
+            'rows': opts['reservations'],
+            'naive_n_plus_1': summarize(naive_samples),
+            'search_api': summarize(timed(set_based, opts['repeat'])),
+            'search_api_by_free': summarize(timed(set_based_by_free, opts['repeat'])),
+            'total_s': round(time.perf_counter() - t, 2),
+        }
@@ -0,0 +1,53 @@
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from reservations import export
+
+
+def _when(value):
+    """ISO tarih ya da tarih-saat; tarih verilirse gün başı (yerel saat)."""
+    dt = parse_datetime(value)
+    if dt is None:
+        d = parse_date(value)
+        if d is None:
+            raise CommandError(f"Geçersiz tarih: {value}")
+        dt = datetime.combine(d, time.min)
+    return timezone.make_aware(dt) if timezone.is_naive(dt) else dt
+
+
+class Command(BaseCommand):
+    help = ("Reservation / CheckEvent / Payment tablolarını sabit bellekle CSV, NDJSON "
+            "ya da Parquet olarak dışa aktarır (ör. aylık finans dökümü).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=list(export.SPECS))
+        parser.add_argument('--format', dest='fmt', choices=list(export.FORMATS), default='csv')
+        parser.add_argument('--lot', type=int)
+        parser.add_argument('--since', type=_when, help="Dahil; ör. 2025-01-01")
+        parser.add_argument('--until', type=_when, help="Hariç; ör. 2025-02-01")
+        parser.add_argument('-o', '--output', help="Dosya yolu (verilmezse stdout)")
+        parser.add_argument('--chunk-size', type=int, default=export.CHUNK_SIZE)
+
+    def handle(self, *args, **opts):
+        fmt = opts['fmt']
+        if fmt == 'parquet' and not export.parquet_available():
+            raise CommandError("Parquet için pyarrow kurulu olmalı.")
+        if fmt == 'parquet' and not opts['output']:
+            raise CommandError("Parquet çıktısı için --output verin.")
+
+        parts = export.stream(opts['kind'], fmt, lot=opts['lot'], since=opts['since'],
+                              until=opts['until'], chunk_size=opts['chunk_size'])
+        if not opts['output']:
+            for part in parts:
+                self.stdout.write(part.decode(), ending='')
+            return
+
+        size = 0
+        with open(opts['output'], 'wb') as fh:
+            for part in parts:
+                fh.write(part)
+                size += len(part)
+        self.stderr.write(f"{opts['output']}: {size} bayt yazıldı.")
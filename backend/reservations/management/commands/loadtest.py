@@ -0,0 +1,208 @@
+import json
+import platform
+import random
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from ._bench import seed_lots, seed_reservations, summarize, throwaway_db
+from ._loadtest import DEFAULT_MIX, ENDPOINTS, HTTP, InProcess, VirtualUser, parse_mix, run_user
+
+
+class Command(BaseCommand):
+    help = ("Sentetik otopark iş yüküyle yük testi: lot gezme, müsaitlik araması, rezervasyon, "
+            "iptal, QR giriş/çıkış ve token yenileme karışımını eşzamanlı sanal kullanıcılarla "
+            "çalıştırır; uç nokta başına throughput ve p50/p95/p99 raporlar. Varsayılan olarak "
+            "uygulama süreç içinde (geçici veritabanıyla) sürülür; --url ile çalışan bir sunucuya "
+            "HTTP üzerinden gidilir.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=8, help="Eşzamanlı sanal kullanıcı")
+        parser.add_argument('--requests', type=int, default=2000, help="Toplam istek (VU'lara bölünür)")
+        parser.add_argument('--duration', type=float, help="Saniye; verilirse istek sayısından önce dolabilir")
+        parser.add_argument('--mix', default=DEFAULT_MIX, help=f"Ağırlıklar, ör. {DEFAULT_MIX}")
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--lots', type=int, default=200, help="Süreç içi modda tohumlanan lot")
+        parser.add_argument('--reservations', type=int, default=20_000, help="Süreç içi modda arka plan rezervasyon")
+        parser.add_argument('--url', help="HTTP modu: ör. http://127.0.0.1:8000")
+        parser.add_argument('--staff-username', help="HTTP modu: check-in/out için görevli hesabı")
+        parser.add_argument('--staff-password')
+        parser.add_argument('--out', help="Sonuç JSON dosyası")
+        parser.add_argument('--compare', help="Önceki bir sonuç JSON'u; fark tablosu basılır")
+        parser.add_argument('--json', action='store_true')
+
+    def handle(self, *args, **opts):
+        try:
+            mix = parse_mix(opts['mix'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if opts['url']:
+            result = self._run_http(opts, mix)
+        else:
+            with throwaway_db(threaded=True):
+                result = self._run_inprocess(opts, mix)
+
+        if opts['out']:
+            with open(opts['out'], 'w') as fh:
+                json.dump(result, fh, indent=2)
+        if opts['json']:
+            self.stdout.write(json.dumps(result, indent=2))
+        else:
+            self._print(result)
+        if opts['compare']:
+            with open(opts['compare']) as fh:
+                self._print_compare(json.load(fh), result)
+
+    # ---- kurulum ----
+    def _run_inprocess(self, opts, mix):
+        from rest_framework_simplejwt.tokens import RefreshToken
+        from reservations import availability
+
+        User = get_user_model()
+        lot_ids = seed_lots(opts['lots'], kapasite=50)
+        seed_reservations(lot_ids, opts['reservations'], days=30, rng=random.Random(opts['seed']))
+        availability.rebuild()
+        users = User.objects.bulk_create([User(username=f'lt-{i}') for i in range(opts['users'])])
+        staff = User.objects.create_user(username='lt-gorevli', password='x', is_staff=True, role='gorevli')
+
+        def tokens(user):
+            refresh = RefreshToken.for_user(user)
+            return str(refresh.access_token), str(refresh)
+
+        staff_token = tokens(staff)[0]
+        vus = [VirtualUser(i, InProcess(), InProcess(), tokens(u), staff_token, lot_ids, mix, opts['seed'])
+               for i, u in enumerate(users)]
+        return self._drive(opts, mix, vus, mode='inprocess')
+
+    def _run_http(self, opts, mix):
+        base = opts['url']
+        setup = HTTP(base)
+        status, lots = setup.request('GET', '/reservation/lots/', {'aktif': 'true'})
+        if status != 200 or not lots:
+            raise CommandError(f"{base} üzerinde aktif lot bulunamadı (durum {status}).")
+        lot_ids = [lot['id'] for lot in (lots['results'] if isinstance(lots, dict) else lots)]
+
+        staff_token = None
+        if opts['staff_username']:
+            status, body = setup.request('POST', '/account/auth/token/',
+                                         {'username': opts['staff_username'], 'password': opts['staff_password']})
+            if status != 200:
+                raise CommandError("Görevli girişi başarısız.")
+            staff_token = body['access']
+        elif mix.get('check_in') or mix.get('check_out'):
+            self.stderr.write("Görevli hesabı verilmedi; check_in/check_out karışımdan çıkarıldı.")
+            mix = {k: v for k, v in mix.items() if k not in ('check_in', 'check_out')}
+
+        run_id = uuid.uuid4().hex[:8]
+        password = f'Lt.{run_id}.Sifre'
+        vus = []
+        for i in range(opts['users']):
+            username = f'lt-{run_id}-{i}'
+            setup.request('POST', '/account/auth/register/', {
+                'username': username, 'email': f'{username}@loadtest.invalid',
+                'password': password, 'password2': password,
+            })
+            status, body = setup.request('POST', '/account/auth/token/', {'username': username, 'password': password})
+            if status != 200:
+                raise CommandError(f"Test kullanıcısı oluşturulamadı: {username} ({status})")
+            vus.append(VirtualUser(i, HTTP(base), HTTP(base), (body['access'], body['refresh']),
+                                   staff_token, lot_ids, mix, opts['seed']))
+        setup.close()
+        return self._drive(opts, mix, vus, mode='http', target=base)
+
+    # ---- çalıştırma ----
+    def _drive(self, opts, mix, vus, mode, target=None):
+        per_user = -(-opts['requests'] // len(vus))
+        samples = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(len(vus) + 1)
+        deadline = [float('inf')]
+
+        def worker(vu):
+            barrier.wait()
+            out = run_user(vu, per_user, deadline[0])
+            vu.t.close()
+            vu.staff.close()
+            with lock:
+                samples.extend(out)
+
+        threads = [threading.Thread(target=worker, args=(vu,)) for vu in vus]
+        for th in threads:
+            th.start()
+        if opts['duration']:
+            deadline[0] = time.perf_counter() + opts['duration']
+        barrier.wait()
+        wall = time.perf_counter()
+        for th in threads:
+            th.join()
+        wall = time.perf_counter() - wall
+        return self._report(opts, mix, samples, wall, mode, target)
+
+    def _report(self, opts, mix, samples, wall, mode, target):
+        lat, statuses = defaultdict(list), defaultdict(Counter)
+        for op, status, secs in samples:
+            lat[op].append(secs)
+            statuses[op][status] += 1
+        endpoints = {}
+        for op in ENDPOINTS:
+            if not lat[op]:
+                continue
+            endpoints[op] = {
+                'requests': len(lat[op]),
+                'rps': round(len(lat[op]) / wall, 1),
+                'errors': sum(n for s, n in statuses[op].items() if s >= 500),
+                'statuses': {str(s): n for s, n in sorted(statuses[op].items())},
+                **summarize(lat[op]),
+            }
+        all_lat = [s for _, _, s in samples]
+        return {
+            'meta': {
+                'mode': mode,
+                'target': target or connection.vendor,
+                'started': timezone.now().isoformat(),
+                'users': opts['users'],
+                'requests': opts['requests'],
+                'duration': opts['duration'],
+                'mix': mix,
+                'seed': opts['seed'],
+                'python': platform.python_version(),
+                'django': django.get_version(),
+            },
+            'total': {
+                'requests': len(samples),
+                'wall_s': round(wall, 3),
+                'rps': round(len(samples) / wall, 1) if wall else 0.0,
+                'errors': sum(e['errors'] for e in endpoints.values()),
+                **summarize(all_lat),
+            },
+            'endpoints': endpoints,
+        }
+
+    # ---- çıktı ----
+    def _print(self, result):
+        t = result['total']
+        self.stdout.write(f"{result['meta']['mode']} / {result['meta']['target']}: {t['requests']} istek, "
+                          f"{t['wall_s']} sn, {t['rps']} istek/sn, {t['errors']} hata")
+        self.stdout.write(f"{'uç nokta':<12}{'n':>7}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}  durumlar")
+        for op, e in result['endpoints'].items():
+            self.stdout.write(f"{op:<12}{e['requests']:>7}{e['rps']:>9}{e['p50_ms']:>9}{e['p95_ms']:>9}"
+                              f"{e['p99_ms']:>9}  {e['statuses']}")
+
+    def _print_compare(self, old, new):
+        def delta(a, b):
+            return f"{(b - a) / a * 100:+.1f}%" if a else 'n/a'
+
+        self.stdout.write("\nÖnceki çalıştırmaya göre (rps, p50, p95, p99):")
+        rows = [('TOPLAM', old['total'], new['total'])]
+        rows += [(op, old['endpoints'][op], e) for op, e in new['endpoints'].items() if op in old['endpoints']]
+        for name, a, b in rows:
+            self.stdout.write(f"{name:<12}" + "".join(
+                f"{delta(a[k], b[k]):>10}" for k in ('rps', 'p50_ms', 'p95_ms', 'p99_ms')))
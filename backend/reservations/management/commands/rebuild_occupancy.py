@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from reservations import availability
+
+
+class Command(BaseCommand):
+    help = "LotOccupancy doluluk sayaçlarını rezervasyonlardan yeniden hesaplar."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lot', type=int, action='append', dest='lots',
+                            help="Sadece bu lot(lar) için (birden fazla verilebilir)")
+
+    def handle(self, *args, **opts):
+        n = availability.rebuild(lot_ids=opts['lots'])
+        self.stdout.write(self.style.SUCCESS(f"{n} doluluk dilimi yazıldı."))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from reservations import repricing
+
+
+class Command(BaseCommand):
+    help = ("İleri tarihli pending/confirmed rezervasyonların ucret_hesap alanını güncel "
+            "tarifelere göre parça parça (bulk_update) yeniden hesaplar.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rateplan', type=int, action='append', dest='rateplans',
+                            help="Sadece bu tarife(ler)den etkilenenler (birden fazla verilebilir)")
+        parser.add_argument('--lot', type=int, action='append', dest='lots',
+                            help="Sadece bu lot(lar)")
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **opts):
+        qs = repricing.affected(rateplan_ids=opts['rateplans'], lot_ids=opts['lots'])
+
+        def progress(scanned, updated):
+            if opts['verbosity'] >= 2:
+                self.stdout.write(f"  {scanned} tarandı, {updated} güncellendi")
+
+        r = repricing.reprice(qs, chunk_size=opts['chunk_size'], progress=progress)
+        self.stdout.write(self.style.SUCCESS(
+            f"{r['scanned']} rezervasyon tarandı, {r['updated']} güncellendi "
+            f"({r['seconds']} sn, {r['rows_per_s']} satır/sn)."
+        ))
@@ -0,0 +1,92 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:03
+
+import django.db.models.deletion
+from collections import Counter
+from datetime import datetime, timezone as dt_timezone
+from math import ceil
+
+from django.db import migrations, models
+from django.db.models import Max, Q
+
+
+# Bu migration yazıldığı andaki dilim kuralı (availability.buckets, 15 dakika);
+# uygulama kodu ya da OCCUPANCY_BUCKET_MINUTES sonradan değişse de aynı kalır.
+BUCKET_SECONDS = 15 * 60
+
+
+def _buckets(start, end, until=None):
+    """[start, end) aralığına değen dilim başlangıçları; until (çıkış) dilimine kadar."""
+    stop = end.timestamp()
+    if until is not None:
+        stop = min(stop, int(until.timestamp()) // BUCKET_SECONDS * BUCKET_SECONDS)
+    first = int(start.timestamp()) // BUCKET_SECONDS * BUCKET_SECONDS
+    return [
+        datetime.fromtimestamp(b, tz=dt_timezone.utc)
+        for b in range(first, ceil(stop), BUCKET_SECONDS)
+        if b < stop
+    ]
+
+
+def backfill_occupancy(apps, schema_editor):
+    Reservation = apps.get_model("reservations", "Reservation")
+    LotOccupancy = apps.get_model("reservations", "LotOccupancy")
+
+    counts = Counter()
+    rows = (
+        Reservation.objects.filter(
+            durum__in=["pending", "confirmed", "checked_in", "checked_out"]
+        )
+        .annotate(cikis=Max("checks__zaman", filter=Q(checks__tip="check_out")))
+        .values_list("lot_id", "baslangic", "bitis", "durum", "cikis")
+    )
+    for lot_id, bas, bit, durum, cikis in rows.iterator():
+        if durum == "checked_out" and cikis is None:
+            continue
+        until = cikis if durum == "checked_out" else None
+        for b in _buckets(bas, bit, until=until):
+            counts[(lot_id, b)] += 1
+
+    LotOccupancy.objects.bulk_create(
+        [LotOccupancy(lot_id=l, bucket=b, dolu=n) for (l, b), n in counts.items()],
+        batch_size=5000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reservations", "0002_reservation_rateplan_alter_reservation_qr_token"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LotOccupancy",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("bucket", models.DateTimeField()),
+                ("dolu", models.PositiveIntegerField(default=0)),
+                (
+                    "lot",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="occupancy",
+                        to="reservations.parkinglot",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Doluluk",
+                "verbose_name_plural": "Doluluklar",
+                "unique_together": {("lot", "bucket")},
+            },
+        ),
+        migrations.RunPython(backfill_occupancy, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reservations", "0003_lotoccupancy"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="parkinglot",
+            name="surum",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reservations", "0004_parkinglot_surum"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="parkinglot",
+            name="doluluk_zamani",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:19
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reservations", "0005_parkinglot_doluluk_zamani"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="checkevent",
+            name="zaman",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reservations", "0006_checkevent_zaman_default"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="checkevent",
+            index=models.Index(fields=["-zaman", "id"], name="checkevent_zaman_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["-created_at", "id"], name="resv_created_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="reservation",
+            index=models.Index(
+                fields=["user", "-created_at", "id"], name="resv_user_created_id_idx"
+            ),
+        ),
+    ]
@@ -1,9 +1,13 @@
 # reservations/models.py
 import uuid, secrets
+from contextlib import nullcontext
 from decimal import Decimal
-from django.db import models, transaction, IntegrityError
+from django.db import models, router, transaction, IntegrityError
 from django.core.validators import MinValueValidator
 from django.conf import settings
+from django.utils import timezone
+
+from . import pricing, rateplan_cache
 
 
 # ----------------------
@@ -17,6 +21,10 @@ class ParkingLot(models.Model):
     konum    = models.CharField(max_length=200, blank=True)
     kapasite = models.PositiveIntegerField(validators=[MinValueValidator(1)])
     aktif    = models.BooleanField(default=True)
+    # İyimser kilitleme sayacı: her kabul edilen rezervasyonda artar (bkz. booking.py)
+    surum    = models.PositiveIntegerField(default=0, editable=False)
+    # Doluluk sayaçlarının son değiştiği an (availability ETag/Last-Modified)
+    doluluk_zamani = models.DateTimeField(null=True, blank=True, editable=False)
 
     class Meta:
         indexes = [models.Index(fields=['aktif', 'tip'])]
@@ -60,6 +68,8 @@ class Reservation(models.Model):
         ('checked_out', 'CheckedOut'),
         ('canceled', 'Canceled'),
     )
+    # Kapasiteden yer tutan durumlar
+    AKTIF = ('pending', 'confirmed', 'checked_in')
 
     id          = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user        = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
@@ -88,6 +98,9 @@ class Reservation(models.Model):
             models.Index(fields=['lot', 'baslangic', 'bitis']),
             models.Index(fields=['durum']),
             models.Index(fields=['qr_token']),
+            # keyset sayfalama (pagination.ReservationPagination)
+            models.Index(fields=['-created_at', 'id'], name='resv_created_id_idx'),
+            models.Index(fields=['user', '-created_at', 'id'], name='resv_user_created_id_idx'),
         ]
         ordering = ['-created_at']
         verbose_name = "Rezervasyon"
@@ -100,60 +113,101 @@ class Reservation(models.Model):
             raise ValidationError("Bitiş tarihi başlangıçtan sonra olmalı.")
 
     def _ensure_qr(self):
-        """qr_token boşsa üret (uniq çakışmayı minimize etmek için önce varlık kontrolü yapar)."""
-        if self.qr_token:
-            return
-        for _ in range(6):
-            t = _gen_token()
-            if not Reservation.objects.filter(qr_token=t).exists():
-                self.qr_token = t
-                return
-        raise RuntimeError("QR token üretilemedi.")
+        """
+        qr_token boşsa üret. Önceden varlık sorgusu yapılmaz: 256 bitlik token'da
+        çakışma pratikte imkânsızdır, olursa unique kısıtı yakalar ve save() yeniden dener.
+        """
+        if not self.qr_token:
+            self.qr_token = _gen_token()
 
     def _resolve_rateplan(self):
-        """Seçili rateplan yoksa lot'un ilk tarifesini hesaplama için kullan."""
-        return self.rateplan or self.lot.rateplans.order_by('id').first()
+        """
+        Seçili rateplan yoksa lot'un ilk tarifesini hesaplama için kullan.
+        Yüklenmemiş tarifeler süreç içi önbellekten (ücret, tavan) olarak gelir.
+        """
+        if self.rateplan_id is None:
+            return rateplan_cache.default_for_lot(self.lot_id)
+        if Reservation.rateplan.is_cached(self):
+            return self.rateplan
+        return rateplan_cache.plan(self.rateplan_id)
 
     def hesapla_ucret(self) -> Decimal:
-        """Saatlik ücret ve (varsa) günlük tavan ile basit ücret hesabı."""
-        rp = self._resolve_rateplan()
-        if not rp:
-            return Decimal('0.00')
-
-        # Toplam saat (yukarı yuvarla), min 1 saat
-        total_hours = (self.bitis - self.baslangic).total_seconds() / 3600
-        hours = Decimal(str(max(1, int(total_hours + 0.999))))
-        tutar = rp.saatlik_ucret * hours
-
-        # Günlük tavan (24 saat blok + kalan)
-        if rp.gunluk_tavan:
-            from math import floor
-            full_days = floor(total_hours / 24)
-            rem = total_hours - full_days * 24
-            rem_hours = Decimal(str(0 if rem <= 0 else max(1, int(rem + 0.999))))
-            rem_charge = rp.saatlik_ucret * rem_hours
-            tutar = rp.gunluk_tavan * full_days + min(rem_charge, rp.gunluk_tavan)
-
-        return tutar
+        """Saatlik ücret ve (varsa) günlük tavan ile basit ücret hesabı (kurallar: pricing.py)."""
+        return pricing.quote(self.baslangic, self.bitis, self._resolve_rateplan())
+
+    @classmethod
+    def transition(cls, pk, kaynak, hedef) -> bool:
+        """Koşullu durum geçişi: UPDATE ... SET durum=hedef WHERE id=pk AND durum IN kaynak."""
+        return cls.objects.filter(pk=pk, durum__in=kaynak).update(durum=hedef) == 1
+
+    def transition_to(self, hedef, kaynak) -> bool:
+        """
+        Durum değişikliği için save() yerine: tek koşullu UPDATE, fiyat/token işi yok.
+        Başarılıysa self.durum güncellenir; durum bu arada değişmişse False.
+        """
+        if not Reservation.transition(self.pk, kaynak, hedef):
+            return False
+        self.durum = hedef
+        return True
+
+    # fiyatı etkileyen alanlar (attname); yalnızca bunlar değişince yeniden fiyatlanır
+    PRICING_FIELDS = ('baslangic', 'bitis', 'lot_id', 'rateplan_id')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        obj = super().from_db(db, field_names, values)
+        obj._loaded_pricing = obj._pricing_state()
+        return obj
+
+    def _pricing_state(self):
+        # .only()/.defer() ile yüklenmemiş alanlar None (değişmiş sayılır)
+        deferred = self.get_deferred_fields()
+        return tuple(None if f in deferred else getattr(self, f) for f in self.PRICING_FIELDS)
+
+    def _needs_pricing(self, update_fields):
+        if update_fields is not None:
+            names = {self._meta.get_field(f).attname for f in update_fields}
+            if not names & set(self.PRICING_FIELDS):
+                return False
+        elif not self._state.adding and getattr(self, '_loaded_pricing', None) == self._pricing_state():
+            return False
+        return bool(self.baslangic and self.bitis and self.lot_id)
 
     def save(self, *args, **kwargs):
-        # qr_token garanti et
-        if not self.qr_token:
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = list(update_fields)
+
+        # qr_token garanti et (yalnızca kendi ürettiğimiz token çakışırsa yeniden denenir)
+        generated = False
+        if update_fields is None or 'qr_token' in update_fields:
+            generated = not self.qr_token
             self._ensure_qr()
 
-        # ücret hesapla (create & update)
-        if self.baslangic and self.bitis and self.lot_id:
+        # ücret yalnızca tarih/lot/tarife değiştiyse yeniden hesaplanır
+        if self._needs_pricing(update_fields):
             self.ucret_hesap = self.hesapla_ucret()
-
-        # uniqueness yarışına karşı küçük retry
+            if update_fields is not None and 'ucret_hesap' not in update_fields:
+                kwargs['update_fields'] = update_fields + ['ucret_hesap']
+
+        if generated:
+            self._save_with_fresh_token(*args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
+        self._loaded_pricing = self._pricing_state()
+
+    def _save_with_fresh_token(self, *args, **kwargs):
+        # iyimser insert: uniqueness yarışında yeni token ile tekrar dene.
+        # Dış transaction varsa savepoint gerekir; autocommit'te tek INSERT yeterli.
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
         for attempt in range(3):
             try:
-                with transaction.atomic():
+                in_tx = transaction.get_connection(using).in_atomic_block
+                with transaction.atomic(using=using) if in_tx else nullcontext():
                     return super().save(*args, **kwargs)
             except IntegrityError as e:
                 if 'qr_token' in str(e).lower() and attempt < 2:
-                    self.qr_token = None
-                    self._ensure_qr()
+                    self.qr_token = _gen_token()
                     continue
                 raise
 
@@ -162,6 +216,24 @@ class Reservation(models.Model):
         return f"{self.plaka} @ {self.lot.ad} [{self.durum}] by {owner}"
 
 
+# ----------------------
+# LotOccupancy
+# ----------------------
+class LotOccupancy(models.Model):
+    """Lot başına zaman dilimi (bucket) doluluk sayacı; reservations/availability.py günceller."""
+    lot    = models.ForeignKey('ParkingLot', on_delete=models.CASCADE, related_name='occupancy')
+    bucket = models.DateTimeField()  # dilimin başlangıcı (UTC)
+    dolu   = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('lot', 'bucket')
+        verbose_name = "Doluluk"
+        verbose_name_plural = "Doluluklar"
+
+    def __str__(self):
+        return f"{self.lot_id} @ {self.bucket:%Y-%m-%d %H:%M} = {self.dolu}"
+
+
 # ----------------------
 # CheckEvent
 # ----------------------
@@ -174,9 +246,11 @@ class CheckEvent(models.Model):
     gorevli     = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL,
                                     null=True, blank=True, related_name='check_events')
 
-    zaman       = models.DateTimeField(auto_now_add=True)
+    # auto_now_add değil: offline gate senkronunda gerçek okutma anı yazılır (gate.apply_batch)
+    zaman       = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
+        indexes = [models.Index(fields=['-zaman', 'id'], name='checkevent_zaman_id_idx')]
         verbose_name = "Giriş/Çıkış Kaydı"
         verbose_name_plural = "Giriş/Çıkış Kayıtları"
 
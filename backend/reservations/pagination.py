@@ -0,0 +1,135 @@
+# reservations/pagination.py
+"""
+Keyset (cursor) sayfalama.
+
+DRF CursorPagination yalnızca ilk sıralama alanını konum olarak kullanır ve
+eşit değerlerde offset'e düşer. Burada cursor, sıralamadaki tüm alanların
+(ör. created_at, id) değerlerini taşır ve sonraki sayfa
+``(a, b) < (a0, b0)`` koşuluyla, bileşik indeks üzerinden okunur; derin
+sayfalar ilk sayfa kadar ucuzdur.
+"""
+import base64
+import json
+from collections import OrderedDict
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    ordering = ('-created_at', 'id')
+    page_size = api_settings.PAGE_SIZE or 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = "Geçersiz cursor."
+
+    # ---- cursor ----
+    def _fields(self):
+        return [(f.lstrip('-'), f.startswith('-')) for f in self.ordering]
+
+    def encode_cursor(self, obj, reverse):
+        values = [getattr(obj, name) for name, _ in self._fields()]
+        values = [v if isinstance(v, int) else str(v) for v in values]
+        raw = json.dumps({'v': values, 'r': reverse}, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, request, model):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            data = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+            values = [model._meta.get_field(name).to_python(v)
+                      for (name, _), v in zip(self._fields(), data['v'], strict=True)]
+            return values, bool(data.get('r'))
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def _after(self, values, reverse):
+        """Sıralamada (values) konumundan sonra gelen satırlar (reverse: öncekiler)."""
+        # (a, b) > (a0, b0)  =>  a > a0  OR  (a = a0 AND b > b0); sondan başa kurulur
+        q = None
+        for (name, desc), value in reversed(list(zip(self._fields(), values))):
+            op = 'lt' if desc != reverse else 'gt'
+            step = Q(**{f'{name}__{op}': value})
+            q = step if q is None else step | (Q(**{name: value}) & q)
+        # OR'lu ifadeyle planlayıcı indeksi baştan tarar; ilk alana gereksiz görünen
+        # bir aralık sınırı eklemek indekste konuma atlamasını (SEARCH) sağlar.
+        name, desc = self._fields()[0]
+        return Q(**{f"{name}__{'lte' if desc != reverse else 'gte'}": values[0]}) & q
+
+    # ---- DRF arayüzü ----
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+            return max(1, min(size, self.max_page_size))
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        size = self.get_page_size(request)
+        values, reverse = self.decode_cursor(request, queryset.model)
+
+        order = list(self.ordering)
+        if reverse:
+            order = [f[1:] if f.startswith('-') else '-' + f for f in order]
+        qs = queryset.order_by(*order)
+        if values is not None:
+            qs = qs.filter(self._after(values, reverse))
+
+        rows = list(qs[:size + 1])
+        more = len(rows) > size
+        rows = rows[:size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = values is not None, more
+        else:
+            self.has_next, self.has_previous = more, values is not None
+        self.page = rows
+        return rows
+
+    def _link(self, obj, reverse):
+        return replace_query_param(self.base_url, self.cursor_query_param, self.encode_cursor(obj, reverse))
+
+    def get_next_link(self):
+        return self._link(self.page[-1], False) if self.has_next and self.page else None
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self._link(self.page[0], True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class ReservationPagination(KeysetPagination):
+    ordering = ('-created_at', 'id')
+
+
+class CheckEventPagination(KeysetPagination):
+    ordering = ('-zaman', 'id')
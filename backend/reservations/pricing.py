@@ -0,0 +1,121 @@
+# reservations/pricing.py
+"""
+Veritabanından bağımsız ücret motoru (Reservation.hesapla_ucret kuralları).
+
+Kurallar:
+- Süre saat olarak yukarı yuvarlanır, en az 1 saat; ancak saat sınırını
+  0.001 saatten (3.6 sn) az aşan süreler aşağı yuvarlanır (eski
+  ``int(total_hours + 0.999)`` davranışı).
+- Günlük tavan varsa (ve 0 değilse): her tam 24 saat için tavan + kalan süre
+  saatlik ücretle, fakat en fazla bir tavan kadar.
+
+Tüm hesap mikro saniye ve kuruş (tamsayı) üzerinden yapılır; float/Decimal
+gidiş-dönüşü yoktur. NumPy kuruluysa quote_many vektörel çalışır, değilse aynı
+tamsayı çekirdeği döngüyle uygulanır.
+"""
+from decimal import Decimal
+
+try:
+    import numpy as np
+except ImportError:  # opsiyonel bağımlılık
+    np = None
+
+US_PER_HOUR = 3_600_000_000
+US_PER_DAY = 24 * US_PER_HOUR
+# int(total_hours + 0.999): saat sınırını 0.001 saatten fazla aşınca yukarı yuvarla
+ROUND_UP_US = US_PER_HOUR - US_PER_HOUR // 1000
+
+
+def _micros(td) -> int:
+    return (td.days * 86400 + td.seconds) * 1_000_000 + td.microseconds
+
+
+def _cents(value) -> int:
+    """Decimal/str/int tutarı kuruşa çevir (None -> 0)."""
+    if value is None:
+        return 0
+    return int(Decimal(value).scaleb(2).to_integral_value())
+
+
+def to_decimal(cents: int) -> Decimal:
+    return Decimal(int(cents)).scaleb(-2)
+
+
+def billable_hours(baslangic, bitis):
+    """(toplam saat, tam gün, kalan saat) — tavan yoksa ilki, varsa son ikisi kullanılır."""
+    us = _micros(bitis - baslangic)
+    hours = max(1, (us + ROUND_UP_US) // US_PER_HOUR)
+    full_days = us // US_PER_DAY
+    rem = us - full_days * US_PER_DAY
+    rem_hours = 0 if rem <= 0 else max(1, (rem + ROUND_UP_US) // US_PER_HOUR)
+    return hours, full_days, rem_hours
+
+
+def quote_cents(us: int, rate_c: int, cap_c: int) -> int:
+    """Tek teklif çekirdeği: süre (mikro sn), saatlik ücret ve tavan (kuruş, 0 = yok)."""
+    if not cap_c:
+        return rate_c * max(1, (us + ROUND_UP_US) // US_PER_HOUR)
+    full_days = us // US_PER_DAY
+    rem = us - full_days * US_PER_DAY
+    rem_hours = 0 if rem <= 0 else max(1, (rem + ROUND_UP_US) // US_PER_HOUR)
+    return cap_c * full_days + min(rate_c * rem_hours, cap_c)
+
+
+def quote(baslangic, bitis, rateplan) -> Decimal:
+    """Tek rezervasyon teklifi; rateplan RatePlan veya (saatlik_ucret, gunluk_tavan)."""
+    if rateplan is None:
+        return Decimal('0.00')
+    rate, cap = _rate_cap(rateplan)
+    return to_decimal(quote_cents(_micros(bitis - baslangic), _cents(rate), _cents(cap)))
+
+
+def _rate_cap(rateplan):
+    if isinstance(rateplan, (tuple, list)):
+        return rateplan
+    return rateplan.saatlik_ucret, rateplan.gunluk_tavan
+
+
+def quote_many(items) -> list:
+    """
+    Toplu teklif: items = [(baslangic, bitis, rateplan), ...] -> [Decimal, ...].
+    Aynı tarife nesnesi tekrar tekrar geçebilir; kuruş dönüşümü nesne başına bir kez yapılır.
+    """
+    items = list(items)
+    if not items:
+        return []
+    plan_cents = {}
+    us, rate_c, cap_c, has_rp = [], [], [], []
+    for bas, bit, rp in items:
+        us.append(_micros(bit - bas))
+        if rp is None:
+            rate_c.append(0)
+            cap_c.append(0)
+            has_rp.append(False)
+            continue
+        key = id(rp)
+        if key not in plan_cents:
+            rate, cap = _rate_cap(rp)
+            plan_cents[key] = (_cents(rate), _cents(cap))
+        r, c = plan_cents[key]
+        rate_c.append(r)
+        cap_c.append(c)
+        has_rp.append(True)
+
+    if np is None:
+        cents = [quote_cents(u, r, c) for u, r, c in zip(us, rate_c, cap_c)]
+    else:
+        cents = _quote_cents_np(np.array(us, dtype=np.int64),
+                                np.array(rate_c, dtype=np.int64),
+                                np.array(cap_c, dtype=np.int64)).tolist()
+    zero = Decimal('0.00')
+    return [to_decimal(c) if ok else zero for c, ok in zip(cents, has_rp)]
+
+
+def _quote_cents_np(us, rate_c, cap_c):
+    """quote_cents'in NumPy karşılığı (int64, kuruş)."""
+    hours = np.maximum(1, (us + ROUND_UP_US) // US_PER_HOUR)
+    full_days = us // US_PER_DAY
+    rem = us - full_days * US_PER_DAY
+    rem_hours = np.where(rem <= 0, 0, np.maximum(1, (rem + ROUND_UP_US) // US_PER_HOUR))
+    capped = cap_c * full_days + np.minimum(rate_c * rem_hours, cap_c)
+    return np.where(cap_c != 0, capped, rate_c * hours)
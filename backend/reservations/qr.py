@@ -0,0 +1,103 @@
+# reservations/qr.py
+"""
+İmzalı, kompakt QR token'ları (rastgele qr_token'a alternatif).
+
+Biçim: "s1." + base64url(payload + imza), toplam 62 karakter:
+    payload = rezervasyon UUID (16 bayt) | lot id (uint32) |
+              başlangıç (uint32, epoch sn) | bitiş (uint32, epoch sn)
+    imza    = HMAC-SHA256(anahtar, payload) ilk 16 bayt
+
+Gate cihazı ve CheckByQRView aynı anahtarla imzayı, lotu ve zaman penceresini
+veritabanına gitmeden doğrular; geçerli token doğrudan pk ile bulunur.
+Anahtar settings.QR_SIGNING_KEY (yoksa SECRET_KEY'den türetilir).
+"""
+import base64
+import hashlib
+import hmac
+import struct
+import uuid
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+
+PREFIX = 's1.'
+_PAYLOAD = struct.Struct('>16sIII')
+_SIG_LEN = 16
+
+SignedQR = namedtuple('SignedQR', 'reservation_id lot_id baslangic bitis')
+
+
+class InvalidQR(Exception):
+    """Token reddedildi; code: 'format' | 'signature' | 'lot' | 'window'."""
+    def __init__(self, code, detail):
+        super().__init__(detail)
+        self.code = code
+        self.detail = detail
+
+
+def _key() -> bytes:
+    key = getattr(settings, 'QR_SIGNING_KEY', None)
+    if key:
+        return key.encode() if isinstance(key, str) else key
+    return salted_hmac('reservations.qr', 'signing-key', algorithm='sha256').digest()
+
+
+def _sig(payload: bytes) -> bytes:
+    return hmac.new(_key(), payload, hashlib.sha256).digest()[:_SIG_LEN]
+
+
+def _epoch(dt: datetime) -> int:
+    return int(dt.timestamp())
+
+
+def is_signed(token: str) -> bool:
+    return token.startswith(PREFIX)
+
+
+def sign(resv) -> str:
+    payload = _PAYLOAD.pack(resv.pk.bytes, resv.lot_id, _epoch(resv.baslangic), _epoch(resv.bitis))
+    return PREFIX + base64.urlsafe_b64encode(payload + _sig(payload)).decode().rstrip('=')
+
+
+def grace() -> timedelta:
+    return timedelta(minutes=getattr(settings, 'QR_CHECKIN_GRACE_MINUTES', 30))
+
+
+def verify(token: str, lot_id=None, now: datetime = None, check_window=True) -> SignedQR:
+    """
+    İmzayı ve (verilmişse) lotu, check_window ise başlangıç-grace .. bitiş+grace
+    penceresini kontrol eder. Veritabanına dokunmaz; hata durumunda InvalidQR.
+    """
+    raw = token[len(PREFIX):] if is_signed(token) else None
+    try:
+        blob = base64.urlsafe_b64decode(raw + '=' * (-len(raw) % 4)) if raw else b''
+    except ValueError:
+        blob = b''
+    if len(blob) != _PAYLOAD.size + _SIG_LEN:
+        raise InvalidQR('format', "Geçersiz QR.")
+
+    payload, sig = blob[:_PAYLOAD.size], blob[_PAYLOAD.size:]
+    if not hmac.compare_digest(sig, _sig(payload)):
+        raise InvalidQR('signature', "Geçersiz QR.")
+
+    rid, lot, bas, bit = _PAYLOAD.unpack(payload)
+    claims = SignedQR(uuid.UUID(bytes=rid), lot,
+                      datetime.fromtimestamp(bas, tz=dt_timezone.utc),
+                      datetime.fromtimestamp(bit, tz=dt_timezone.utc))
+    if lot_id is not None and int(lot_id) != claims.lot_id:
+        raise InvalidQR('lot', "Bu QR başka bir otoparka ait.")
+    if check_window:
+        now = now or timezone.now()
+        if not (claims.baslangic - grace() <= now <= claims.bitis + grace()):
+            raise InvalidQR('window', "QR geçerlilik süresi dışında.")
+    return claims
+
+
+def matches(claims: SignedQR, resv) -> bool:
+    """Token, rezervasyonun güncel lot/zaman bilgisiyle hâlâ uyuşuyor mu?"""
+    return (claims.lot_id == resv.lot_id
+            and _epoch(claims.baslangic) == _epoch(resv.baslangic)
+            and _epoch(claims.bitis) == _epoch(resv.bitis))
@@ -0,0 +1,101 @@
+# reservations/rateplan_cache.py
+"""
+Fiyatlama için süreç içi tarife önbelleği (Reservation._resolve_rateplan).
+
+Lot'un varsayılan (ilk) tarifesi ve id ile seçilen tarife, pricing.quote'un
+kabul ettiği (saatlik_ucret, gunluk_tavan) demeti olarak LRU'da tutulur;
+kararlı durumda fiyat hesabı sorgu atmaz.
+
+- RatePlan save/delete sinyali önbelleği boşaltır (signals.py).
+- Sinyal yalnızca kaydı yapan süreçte çalışır; diğer worker'lar
+  RATEPLAN_CACHE_TTL saniye içinde yeni değeri görür.
+- RATEPLAN_CACHE_SIZE girdiden sonra en eski kullanılan atılır.
+"""
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+
+_MISSING = object()
+
+_entries = OrderedDict()  # anahtar -> (bitiş zamanı, (ücret, tavan) | None)
+_counts = Counter()
+_lock = threading.Lock()
+_generation = 0  # clear() ile artar; yükleme sırasında boşaltılmışsa sonuç yazılmaz
+
+
+def _maxsize():
+    return getattr(settings, 'RATEPLAN_CACHE_SIZE', 1024)
+
+
+def _ttl():
+    return getattr(settings, 'RATEPLAN_CACHE_TTL', 60)
+
+
+def _get(key, load):
+    now = time.monotonic()
+    with _lock:
+        gen = _generation
+        expires, value = _entries.get(key, (0, _MISSING))
+        if expires > now:
+            _entries.move_to_end(key)
+            _counts['hits'] += 1
+            return value
+        _counts['misses'] += 1
+
+    value = load()  # kilit dışında: sorgu sırasında diğer thread'ler beklemesin
+    with _lock:
+        if gen != _generation:
+            return value
+        _entries[key] = (now + _ttl(), value)
+        _entries.move_to_end(key)
+        while len(_entries) > _maxsize():
+            _entries.popitem(last=False)
+            _counts['evictions'] += 1
+    return value
+
+
+def default_for_lot(lot_id):
+    """Lot'un ilk (id sırasıyla) tarifesi: (ücret, tavan) ya da tarifesi yoksa None."""
+    from .models import RatePlan
+    return _get(('lot', lot_id), lambda: (
+        RatePlan.objects.filter(lot_id=lot_id).order_by('id')
+        .values_list('saatlik_ucret', 'gunluk_tavan').first()
+    ))
+
+
+def plan(rateplan_id):
+    from .models import RatePlan
+    return _get(('rp', rateplan_id), lambda: (
+        RatePlan.objects.filter(pk=rateplan_id).values_list('saatlik_ucret', 'gunluk_tavan').first()
+    ))
+
+
+def clear():
+    global _generation
+    with _lock:
+        _generation += 1
+        _entries.clear()
+        _counts['invalidations'] += 1
+
+
+def stats():
+    with _lock:
+        counts = dict(_counts)
+        size = len(_entries)
+    lookups = counts.get('hits', 0) + counts.get('misses', 0)
+    return {
+        'hits': counts.get('hits', 0),
+        'misses': counts.get('misses', 0),
+        'evictions': counts.get('evictions', 0),
+        'invalidations': counts.get('invalidations', 0),
+        'size': size,
+        'maxsize': _maxsize(),
+        'hit_ratio': round(counts.get('hits', 0) / lookups, 4) if lookups else 0.0,
+    }
+
+
+def reset_stats():
+    with _lock:
+        _counts.clear()
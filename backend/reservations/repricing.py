@@ -0,0 +1,80 @@
+# reservations/repricing.py
+"""
+Tarife değişikliğinden sonra ucret_hesap'ın toplu yenilenmesi.
+
+Rezervasyonlar pk üzerinden keyset ile parça parça okunur (tablo belleğe
+alınmaz). Her parça pricing.quote_many ile tek çağrıda fiyatlanır ve yalnızca
+değişen satırlar bulk_update ile yazılır. Reservation.save() çağrılmaz.
+"""
+import time
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import pricing
+from .models import RatePlan, Reservation
+
+REPRICE_STATES = ('pending', 'confirmed')
+
+
+def _plans():
+    """{rateplan_id: (ücret, tavan)} ve {lot_id: varsayılan (ilk) tarife id}."""
+    plans, defaults = {}, {}
+    for rp_id, lot_id, rate, cap in (RatePlan.objects.order_by('lot_id', 'id')
+                                     .values_list('id', 'lot_id', 'saatlik_ucret', 'gunluk_tavan')):
+        plans[rp_id] = (rate, cap)
+        defaults.setdefault(lot_id, rp_id)
+    return plans, defaults
+
+
+def affected(rateplan_ids=None, lot_ids=None, now=None):
+    """İleri tarihli pending/confirmed rezervasyonlar; tarife/lot ile daraltılabilir."""
+    qs = Reservation.objects.filter(durum__in=REPRICE_STATES, baslangic__gte=now or timezone.now())
+    if rateplan_ids:
+        _, defaults = _plans()
+        wanted = set(rateplan_ids)
+        default_lots = [lot for lot, rp in defaults.items() if rp in wanted]
+        qs = qs.filter(Q(rateplan_id__in=rateplan_ids) | Q(rateplan__isnull=True, lot_id__in=default_lots))
+    if lot_ids:
+        qs = qs.filter(lot_id__in=lot_ids)
+    return qs
+
+
+def reprice(qs, chunk_size=2000, progress=None):
+    """
+    qs içindeki rezervasyonların ucret_hesap'ını yeniden hesapla.
+    Döner: {'scanned', 'updated', 'seconds', 'rows_per_s'}.
+    progress(scanned, updated) her parçadan sonra çağrılır.
+    """
+    plans, defaults = _plans()
+    rows = qs.order_by('pk').values_list('pk', 'lot_id', 'rateplan_id', 'baslangic', 'bitis', 'ucret_hesap')
+    scanned = updated = 0
+    last = None
+    started = time.perf_counter()
+    while True:
+        chunk = list((rows.filter(pk__gt=last) if last is not None else rows)[:chunk_size])
+        if not chunk:
+            break
+        last = chunk[-1][0]
+        quotes = pricing.quote_many(
+            (bas, bit, plans.get(rp_id or defaults.get(lot_id)))
+            for _, lot_id, rp_id, bas, bit, _ in chunk
+        )
+        changed = [Reservation(pk=pk, ucret_hesap=q)
+                   for (pk, *_, old), q in zip(chunk, quotes) if q != old]
+        if changed:
+            with transaction.atomic():
+                Reservation.objects.bulk_update(changed, ['ucret_hesap'], batch_size=500)
+        scanned += len(chunk)
+        updated += len(changed)
+        if progress:
+            progress(scanned, updated)
+
+    seconds = time.perf_counter() - started
+    return {
+        'scanned': scanned,
+        'updated': updated,
+        'seconds': round(seconds, 3),
+        'rows_per_s': round(scanned / seconds, 1) if seconds else 0.0,
+    }
@@ -0,0 +1,49 @@
+# reservations/search.py
+"""
+Toplu müsaitlik araması: "18:00-23:00 arası nereye park edebilirim?"
+
+Her aktif lot için kalan kapasite (LotOccupancy MAX alt sorgusu) ve fiyat
+teklifi (Reservation.hesapla_ucret kuralları, lot'un ilk tarifesiyle) tek bir
+SQL ifadesinde hesaplanır; lot başına ayrı sorgu atılmaz.
+"""
+from decimal import Decimal
+
+from django.db.models import (
+    Case, DecimalField, F, IntegerField, Max, OuterRef, Q, Subquery, Value, When,
+)
+from django.db.models.functions import Coalesce, Greatest, Least
+
+from . import availability
+from .models import LotOccupancy, RatePlan
+from .pricing import billable_hours
+
+PRICE_FIELD = DecimalField(max_digits=10, decimal_places=2)
+
+
+def price_expression(bas, bit, rate='_rate', cap='_cap'):
+    """Pencere sabit olduğu için saatler sabittir; fiyat tarifeye göre bir CASE ifadesi."""
+    hours, full_days, rem_hours = billable_hours(bas, bit)
+    return Coalesce(
+        Case(
+            When(Q(**{f'{cap}__isnull': False}) & ~Q(**{cap: 0}),
+                 then=F(cap) * Value(full_days) + Least(F(rate) * Value(rem_hours), F(cap))),
+            default=F(rate) * Value(hours),
+            output_field=PRICE_FIELD,
+        ),
+        Value(Decimal('0.00')),
+        output_field=PRICE_FIELD,
+    )
+
+
+def annotate_availability(qs, bas, bit):
+    """ParkingLot queryset'ine dolu, bos ve fiyat alanlarını ekler (tek sorgu)."""
+    peak = (LotOccupancy.objects
+            .filter(lot=OuterRef('pk'), bucket__gte=availability.floor_bucket(bas), bucket__lt=bit)
+            .values('lot').annotate(m=Max('dolu')).values('m'))
+    first_rp = RatePlan.objects.filter(lot=OuterRef('pk')).order_by('id')
+    return qs.annotate(
+        dolu=Coalesce(Subquery(peak, output_field=IntegerField()), Value(0)),
+        bos=Greatest(F('kapasite') - F('dolu'), Value(0)),
+        _rate=Subquery(first_rp.values('saatlik_ucret')[:1], output_field=PRICE_FIELD),
+        _cap=Subquery(first_rp.values('gunluk_tavan')[:1], output_field=PRICE_FIELD),
+    ).annotate(fiyat=price_expression(bas, bit))
@@ -1,10 +1,16 @@
 # reservations/serializers.py
+from datetime import timedelta
+
+from django.utils import timezone
 from rest_framework import serializers
+
+from core.serializers import ModelSerializer, Serializer
 from .models import ParkingLot, RatePlan, Reservation, CheckEvent
+from . import availability, qr
 
 
 # ---- ParkingLot ----
-class ParkingLotSerializer(serializers.ModelSerializer):
+class ParkingLotSerializer(ModelSerializer):
     tip_display = serializers.CharField(source='get_tip_display', read_only=True)
 
     class Meta:
@@ -12,15 +18,25 @@ class ParkingLotSerializer(serializers.ModelSerializer):
         fields = ('id','ad','tip','tip_display','konum','kapasite','aktif')
 
 
+# ParkingLot + istenen pencere için kalan yer ve fiyat (lots/search/)
+class LotAvailabilitySerializer(ParkingLotSerializer):
+    dolu  = serializers.IntegerField(read_only=True)
+    bos   = serializers.IntegerField(read_only=True)
+    fiyat = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+
+    class Meta(ParkingLotSerializer.Meta):
+        fields = ParkingLotSerializer.Meta.fields + ('dolu', 'bos', 'fiyat')
+
+
 # ---- RatePlan ----
-class RatePlanSerializer(serializers.ModelSerializer):
+class RatePlanSerializer(ModelSerializer):
     class Meta:
         model = RatePlan
         fields = ('id','lot','ad','saatlik_ucret','gunluk_tavan')
 
 
 # ---- Reservation (create: müşteri rateplan seçebilir) ----
-class ReservationCreateSerializer(serializers.ModelSerializer):
+class ReservationCreateSerializer(ModelSerializer):
     rateplan = serializers.PrimaryKeyRelatedField(
         queryset=RatePlan.objects.all(), required=False, allow_null=True
     )
@@ -44,33 +60,41 @@ class ReservationCreateSerializer(serializers.ModelSerializer):
         if rp and lot and rp.lot_id != lot.id:
             raise serializers.ValidationError("Seçilen tarife bu otoparka ait değil.")
 
+        # Kapasite: önceden hesaplanmış doluluk dilimleri üzerinden tek MAX sorgusu
+        if lot and bas and bit and not availability.has_capacity(lot, bas, bit):
+            raise serializers.ValidationError("Seçilen zaman aralığında otoparkta boş yer yok.")
+
         return attrs
 
 
 # ---- Reservation (detay/liste) ----
-class ReservationDetailSerializer(serializers.ModelSerializer):
+class ReservationDetailSerializer(ModelSerializer):
     lot_ad = serializers.CharField(source='lot.ad', read_only=True)
     rp_ad  = serializers.CharField(source='rateplan.ad', read_only=True)
+    qr_imzali = serializers.SerializerMethodField()  # offline doğrulanabilir token (qr.py)
 
     class Meta:
         model = Reservation
         fields = [
             'id','lot','lot_ad','rateplan','rp_ad',
-            'plaka','baslangic','bitis','durum','qr_token',
+            'plaka','baslangic','bitis','durum','qr_token','qr_imzali',
             'ucret_hesap','created_at'
         ]
         read_only_fields = ['durum','qr_token','ucret_hesap','created_at','lot_ad','rp_ad']
 
+    def get_qr_imzali(self, obj):
+        return qr.sign(obj)
+
 
 # (opsiyonel) Genel amaçlı tüm alanlar
-class ReservationSerializer(serializers.ModelSerializer):
+class ReservationSerializer(ModelSerializer):
     class Meta:
         model = Reservation
         fields = "__all__"
 
 
 # ---- CheckEvent ----
-class CheckEventSerializer(serializers.ModelSerializer):
+class CheckEventSerializer(ModelSerializer):
     class Meta:
         model = CheckEvent
         fields = "__all__"
@@ -78,6 +102,85 @@ class CheckEventSerializer(serializers.ModelSerializer):
 
 from rest_framework import serializers
 
-class CheckByQRSerializer(serializers.Serializer):
+class CheckByQRSerializer(Serializer):
     qr_token = serializers.CharField(max_length=64)
-    tip = serializers.ChoiceField(choices=['check_in', 'check_out'])
\ No newline at end of file
+    tip = serializers.ChoiceField(choices=['check_in', 'check_out'])
+    lot = serializers.IntegerField(required=False)  # okutulan gate'in lotu
+
+
+# Offline gate senkronu: tamponlanmış okutmalar
+class GateScanSerializer(CheckByQRSerializer):
+    MAX_AGE = timedelta(days=7)       # gate'in çevrimdışı kalabileceği en uzun süre
+    MAX_SKEW = timedelta(minutes=5)   # gate saatinin ileride olabileceği pay
+
+    scanned_at = serializers.DateTimeField()
+
+    def validate_scanned_at(self, value):
+        now = timezone.now()
+        if value > now + self.MAX_SKEW:
+            raise serializers.ValidationError("Okutma zamanı gelecekte olamaz.")
+        if value < now - self.MAX_AGE:
+            raise serializers.ValidationError("Okutma zamanı çok eski.")
+        return value
+
+
+class CheckByQRBatchSerializer(Serializer):
+    MAX_SCANS = 1000
+
+    scans = GateScanSerializer(many=True, allow_empty=False, max_length=MAX_SCANS)
+
+
+# ---- Availability takvimi (/lots/{id}/availability/ sorgu parametreleri) ----
+class AvailabilityQuerySerializer(Serializer):
+    GRANULARITY = {
+        '15m': timedelta(minutes=15),
+        '1h': timedelta(hours=1),
+        '1d': timedelta(days=1),
+    }
+    MAX_SLOTS = 2000
+
+    baslangic = serializers.DateTimeField(required=False)
+    bitis = serializers.DateTimeField(required=False)
+    granularity = serializers.ChoiceField(choices=list(GRANULARITY), default='1h')
+
+    def validate(self, attrs):
+        step = self.GRANULARITY[attrs['granularity']]
+        if step.total_seconds() % availability.bucket_seconds():
+            raise serializers.ValidationError("granularity, doluluk dilim genişliğinin katı olmalı.")
+
+        bas = availability.align(attrs.get('baslangic') or timezone.now(), step)
+        bit = attrs.get('bitis') or bas + (timedelta(days=7) if step >= timedelta(days=1) else timedelta(days=1))
+        if bas >= bit:
+            raise serializers.ValidationError("Bitiş tarihi başlangıçtan sonra olmalı.")
+        if (bit - bas) / step > self.MAX_SLOTS:
+            raise serializers.ValidationError(f"En fazla {self.MAX_SLOTS} zaman dilimi istenebilir.")
+
+        attrs.update(baslangic=bas, bitis=bit, step=step)
+        return attrs
+
+
+# ---- Toplu müsaitlik araması (/lots/search/ sorgu parametreleri) ----
+class LotSearchQuerySerializer(Serializer):
+    ORDERING = ('fiyat', '-fiyat', 'bos', '-bos')
+
+    baslangic = serializers.DateTimeField()
+    bitis = serializers.DateTimeField()
+    ordering = serializers.ChoiceField(choices=ORDERING, default='fiyat')
+
+    def validate(self, attrs):
+        if attrs['baslangic'] >= attrs['bitis']:
+            raise serializers.ValidationError("Bitiş tarihi başlangıçtan sonra olmalı.")
+        return attrs
+
+
+# ---- Dışa aktarım (/export/... sorgu parametreleri) ----
+class ExportQuerySerializer(Serializer):
+    lot = serializers.IntegerField(required=False, min_value=1)
+    baslangic = serializers.DateTimeField(required=False)
+    bitis = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        bas, bit = attrs.get('baslangic'), attrs.get('bitis')
+        if bas and bit and bas >= bit:
+            raise serializers.ValidationError("Bitiş tarihi başlangıçtan sonra olmalı.")
+        return attrs
@@ -0,0 +1,20 @@
+# reservations/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import catalog_cache, rateplan_cache
+from .models import ParkingLot, RatePlan
+
+
+@receiver([post_save, post_delete], sender=ParkingLot)
+@receiver([post_save, post_delete], sender=RatePlan)
+def invalidate_catalog(sender, **kwargs):
+    catalog_cache.invalidate()
+
+
+@receiver([post_save, post_delete], sender=RatePlan)
+def invalidate_rateplans(sender, **kwargs):
+    # commit sonrası ikinci kez: arada eski veriyi yükleyen thread'in girdisi de düşer
+    rateplan_cache.clear()
+    transaction.on_commit(rateplan_cache.clear)
@@ -1,6 +1,8 @@
-from django.urls import path, include
+from django.urls import include, path, re_path
 from rest_framework.routers import DefaultRouter
-from .views import CheckByQRView, ParkingLotViewSet, RatePlanViewSet, ReservationViewSet, CheckEventViewSet
+
+from . import async_views
+from .views import CheckByQRBatchView, CheckByQRView, ExportView, ParkingLotViewSet, RatePlanViewSet, ReservationViewSet, CheckEventViewSet
 
 router = DefaultRouter()
 
@@ -12,4 +14,16 @@ router.register(r'rateplans', RatePlanViewSet, basename='rateplans')
 urlpatterns = [
     path('', include(router.urls)),
     path('check-by-qr/', CheckByQRView.as_view(), name='check-by-qr'),
+    path('check-by-qr/batch/', CheckByQRBatchView.as_view(), name='check-by-qr-batch'),
+    re_path(r'^export/(?P<kind>reservations|check-events|payments)\.(?P<fmt>csv|ndjson|parquet)$',
+            ExportView.as_view(), name='export'),
+
+    # ASGI altında async-native sürümler (async_views.py, core/asgi.py)
+    path('async/check-by-qr/', async_views.CheckByQRView.as_view(), name='async-check-by-qr'),
+    path('async/lots/', async_views.LotListView.as_view(), name='async-lots'),
+    path('async/lots/search/', async_views.LotSearchView.as_view(), name='async-lots-search'),
+    path('async/lots/live/', async_views.LotLiveView.as_view(), name='async-lots-live'),
+    path('async/lots/<int:pk>/', async_views.LotDetailView.as_view(), name='async-lot-detail'),
+    path('async/lots/<int:pk>/availability/', async_views.LotAvailabilityView.as_view(),
+         name='async-lot-availability'),
 ]
\ No newline at end of file
@@ -1,12 +1,23 @@
 # reservations/views.py
+import hashlib
+
+from django.db import transaction
 from django.db.models import Q
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
 from rest_framework import viewsets, permissions, status, filters
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from django_filters.rest_framework import DjangoFilterBackend
 
+from core.routers import ReplicaReadMixin
 from .models import ParkingLot, RatePlan, Reservation, CheckEvent
+from . import availability, booking, catalog_cache, gate, live, qr, search
+from .pagination import CheckEventPagination, ReservationPagination
 from .serializers import (
+    AvailabilityQuerySerializer,
+    LotAvailabilitySerializer,
+    LotSearchQuerySerializer,
     ParkingLotSerializer,
     RatePlanSerializer,
     ReservationSerializer,
@@ -26,14 +37,49 @@ class IsAdminOrReadOnly(permissions.BasePermission):
         return bool(request.user and request.user.is_staff)
 
 
+class IsGateStaff(permissions.BasePermission):
+    """Gate görevlisi (role=gorevli/yonetici) ya da admin (is_staff)."""
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(user and user.is_authenticated and
+                    (user.is_staff or getattr(user, 'role', None) in ('gorevli', 'yonetici')))
+
+
 # --- ParkingLot ------------------------------------------------------------
 
-class ParkingLotViewSet(viewsets.ModelViewSet):
+def filter_lots(qs, params):
+    """?aktif=, ?tip=, ?search=, ?ordering= (async_views ile ortak)."""
+    aktif = params.get('aktif')
+    if aktif is not None:
+        if aktif.lower() in ('1', 'true', 'yes', 'y'):
+            qs = qs.filter(aktif=True)
+        elif aktif.lower() in ('0', 'false', 'no', 'n'):
+            qs = qs.filter(aktif=False)
+
+    tip = params.get('tip')
+    if tip:
+        qs = qs.filter(tip=tip)
+
+    search = params.get('search')
+    if search:
+        # DÜZELTİLDİ: queryset union yerine Q(...) | Q(...)
+        qs = qs.filter(Q(ad__icontains=search) | Q(konum__icontains=search))
+
+    ordering = params.get('ordering')
+    if ordering in ['ad', '-ad', 'kapasite', '-kapasite']:
+        qs = qs.order_by(ordering)
+
+    return qs
+
+
+class ParkingLotViewSet(ReplicaReadMixin, catalog_cache.CachedCatalogMixin, viewsets.ModelViewSet):
     """
     /lots/ CRUD
     Filtreleme: ?aktif=true|false, ?tip=acik|kapali|vip
     Arama:      ?search=izmit
     Sıralama:   ?ordering=ad|-ad|kapasite|-kapasite
+    list/retrieve yanıtları sürümlü önbellekten gelir (catalog_cache.py); diğer
+    GET'ler (availability vb.) okuma replikasından (core/routers.py).
     """
     queryset = ParkingLot.objects.all()
     serializer_class = ParkingLotSerializer
@@ -47,30 +93,7 @@ class ParkingLotViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         # Ek manuel filtre/arama desteği istiyorsan burada kalabilir
-        qs = super().get_queryset()
-        params = self.request.query_params
-
-        aktif = params.get('aktif')
-        if aktif is not None:
-            if aktif.lower() in ('1', 'true', 'yes', 'y'):
-                qs = qs.filter(aktif=True)
-            elif aktif.lower() in ('0', 'false', 'no', 'n'):
-                qs = qs.filter(aktif=False)
-
-        tip = params.get('tip')
-        if tip:
-            qs = qs.filter(tip=tip)
-
-        search = params.get('search')
-        if search:
-            # DÜZELTİLDİ: queryset union yerine Q(...) | Q(...)
-            qs = qs.filter(Q(ad__icontains=search) | Q(konum__icontains=search))
-
-        ordering = params.get('ordering')
-        if ordering in ['ad', '-ad', 'kapasite', '-kapasite']:
-            qs = qs.order_by(ordering)
-
-        return qs
+        return filter_lots(super().get_queryset(), self.request.query_params)
 
     @action(detail=True, methods=['get', 'post'], url_path='rateplans')
     def rateplans(self, request, pk=None):
@@ -79,11 +102,13 @@ class ParkingLotViewSet(viewsets.ModelViewSet):
         GET  /lots/{id}/rateplans/ -> bu lota ait tarifeleri listele
         POST /lots/{id}/rateplans/ -> bu lota yeni tarife ekle (sadece admin)
         """
-        lot = self.get_object()
-
         if request.method.lower() == 'get':
-            rp_qs = lot.rateplans.select_related('lot').all().order_by('ad')
-            return Response(RatePlanSerializer(rp_qs, many=True).data)
+            def build():
+                rp_qs = self.get_object().rateplans.select_related('lot').all().order_by('ad')
+                return Response(RatePlanSerializer(rp_qs, many=True).data)
+            return catalog_cache.serve(request, build)
+
+        lot = self.get_object()
 
         # POST
         if not (request.user and request.user.is_staff):
@@ -97,16 +122,86 @@ class ParkingLotViewSet(viewsets.ModelViewSet):
         ser.save()
         return Response(ser.data, status=status.HTTP_201_CREATED)
 
+    @action(detail=False, methods=['get'], url_path='search')
+    def search_available(self, request):
+        """
+        GET /lots/search/?baslangic=...&bitis=...[&tip=..&search=..&ordering=fiyat|-fiyat|bos|-bos]
+        Tüm aktif lotlar, pencere için kalan yer ve fiyat teklifiyle; tek sorgu.
+        """
+        q = LotSearchQuerySerializer(data=request.query_params)
+        q.is_valid(raise_exception=True)
+        bas, bit = q.validated_data['baslangic'], q.validated_data['bitis']
+
+        qs = self.filter_queryset(self.get_queryset()).filter(aktif=True)
+        order = q.validated_data['ordering']
+        tie = '-bos' if order.lstrip('-') == 'fiyat' else 'fiyat'
+        qs = search.annotate_availability(qs, bas, bit).order_by(order, tie, 'id')
+        return Response(LotAvailabilitySerializer(qs, many=True).data)
+
+    @action(detail=True, methods=['get'], url_path='availability')
+    def availability_calendar(self, request, pk=None):
+        """
+        GET /lots/{id}/availability/?baslangic=...&bitis=...&granularity=15m|1h|1d
+        Her zaman dilimi için dolu/boş yer sayısı; LotOccupancy üzerinden tek sorgu.
+        ETag/Last-Modified gönderir, değişiklik yoksa 304 döner.
+        """
+        lot = self.get_object()
+        q = AvailabilityQuerySerializer(data=request.query_params)
+        q.is_valid(raise_exception=True)
+        bas, bit, step = (q.validated_data[k] for k in ('baslangic', 'bitis', 'step'))
+
+        etag, last_modified = calendar_etag(lot, bas, bit, step)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = Response(calendar_body(lot, q.validated_data, availability.calendar(lot.pk, bas, bit, step)))
+        return calendar_headers(response, etag, last_modified)
+
+
+def calendar_etag(lot, bas, bit, step):
+    """Takvim yanıtının ETag'i ve Last-Modified'ı (lot'un son doluluk değişikliğinden)."""
+    changed = lot.doluluk_zamani
+    last_modified = int(changed.timestamp()) if changed else None
+    etag = quote_etag(hashlib.md5(
+        f"{lot.pk}:{lot.kapasite}:{changed and changed.timestamp()}:"
+        f"{bas.timestamp()}:{bit.timestamp()}:{step.total_seconds()}".encode()
+    ).hexdigest())
+    return etag, last_modified
+
+
+def calendar_body(lot, params, slots):
+    bas, bit, step = (params[k] for k in ('baslangic', 'bitis', 'step'))
+    return {
+        'lot': lot.pk,
+        'kapasite': lot.kapasite,
+        'granularity': params['granularity'],
+        'baslangic': bas,
+        'bitis': bit,
+        'slots': [
+            {'baslangic': t, 'bitis': min(t + step, bit),
+             'dolu': dolu, 'bos': max(0, lot.kapasite - dolu)}
+            for t, dolu in slots
+        ],
+    }
+
+
+def calendar_headers(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+    return response
+
 
 # --- RatePlan --------------------------------------------------------------
 
-class RatePlanViewSet(viewsets.ModelViewSet):
+class RatePlanViewSet(ReplicaReadMixin, catalog_cache.CachedCatalogMixin, viewsets.ModelViewSet):
     """
     /rateplans/ CRUD
     Filtre:   ?lot=ID  (django-filter)
               ?lot_id=ID (manuel)
     Arama:    ?search=...
     Sıralama: ?ordering=ad|saatlik_ucret|gunluk_tavan (ve - ile ters)
+    list/retrieve yanıtları sürümlü önbellekten gelir (catalog_cache.py).
     """
     queryset = RatePlan.objects.select_related('lot').all()
     serializer_class = RatePlanSerializer
@@ -155,6 +250,7 @@ class ReservationViewSet(viewsets.ModelViewSet):
     """
     queryset = Reservation.objects.select_related('lot','user','rateplan').all()
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = ReservationPagination  # ?cursor=...&page_size=...
     
     def get_queryset(self):
         qs = super().get_queryset()
@@ -175,13 +271,26 @@ class ReservationViewSet(viewsets.ModelViewSet):
         return ReservationDetailSerializer
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user, durum='pending')  # istersen 'pending' de yapabilirsin
+        # Aynı lot için eşzamanlı kabuller booking.py'de sıraya sokulur
+        booking.create_reservation(serializer, user=self.request.user, durum='pending')
+
+    def perform_update(self, serializer):
+        # lot/zaman değişirse doluluk sayaçları taşınır ve yeni aralık kapasiteye göre kabul edilir
+        booking.update_reservation(serializer)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            # aktifse önce koşullu iptal: eşzamanlı iptal/check-in ile sayaç iki kez bırakılmaz
+            if instance.transition_to('canceled', kaynak=Reservation.AKTIF):
+                availability.release(instance)
+                live.notify('reservation_canceled', instance)
+            instance.delete()
 
     @action(detail=False, methods=['get'], url_path='my')
     def my_reservations(self, request):
-        qs = self.get_queryset().order_by('-created_at')
+        qs = self.get_queryset()
         page = self.paginate_queryset(qs)
-        ser = ReservationDetailSerializer(page or qs, many=True)
+        ser = ReservationDetailSerializer(page if page is not None else qs, many=True)
         if page is not None:
             return self.get_paginated_response(ser.data)
         return Response(ser.data)
@@ -192,11 +301,13 @@ class ReservationViewSet(viewsets.ModelViewSet):
         Sadece sahibi (veya admin) ve belirli durumlarda iptal edebilir.
         """
         resv = self.get_object()  # IsOwnerOrAdmin devreye girer
-        if resv.durum in ['checked_in', 'checked_out', 'canceled']:
-            return Response({"detail": "Bu rezervasyon iptal edilemez."},
-                            status=status.HTTP_400_BAD_REQUEST)
-        resv.durum = 'canceled'
-        resv.save(update_fields=['durum'])
+        with transaction.atomic():
+            # koşullu UPDATE: eşzamanlı check-in/iptal ile yarışta ikisinden biri kazanır
+            if not resv.transition_to('canceled', kaynak=('pending', 'confirmed')):
+                return Response({"detail": "Bu rezervasyon iptal edilemez."},
+                                status=status.HTTP_400_BAD_REQUEST)
+            availability.release(resv)
+            live.notify('reservation_canceled', resv)
         return Response({"detail": "Rezervasyon iptal edildi."}, status=status.HTTP_200_OK)
 
 
@@ -206,7 +317,7 @@ class ReservationViewSet(viewsets.ModelViewSet):
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
 
-class CheckEventViewSet(viewsets.ModelViewSet):
+class CheckEventViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """
     /check-events/ CRUD
     Sadece admin (veya görevli) yazabilir; listeleme adminlere açık.
@@ -216,6 +327,7 @@ class CheckEventViewSet(viewsets.ModelViewSet):
     queryset = CheckEvent.objects.select_related('reservation','gorevli','reservation__lot').all()
     serializer_class = CheckEventSerializer
     permission_classes = [permissions.IsAdminUser]
+    pagination_class = CheckEventPagination
 
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ['tip', 'reservation', 'gorevli']
@@ -235,7 +347,7 @@ class CheckEventViewSet(viewsets.ModelViewSet):
             from django.utils.timezone import now
             d = now().date()
             qs = qs.filter(zaman__date=d)
-        return qs.order_by('-zaman')
+        return qs.order_by('-zaman', 'id')
 
 
 from rest_framework.views import APIView
@@ -243,15 +355,19 @@ from rest_framework.permissions import IsAdminUser
 from django.utils import timezone
 
 from .models import Reservation, CheckEvent
-from .serializers import CheckByQRSerializer, ReservationDetailSerializer, CheckEventSerializer
+from .serializers import (
+    CheckByQRBatchSerializer, CheckByQRSerializer, ReservationDetailSerializer, CheckEventSerializer,
+)
 
 class CheckByQRView(APIView):
     """
     POST /reservation/check-by-qr/
-    Body: { "qr_token": "...", "tip": "check_in" | "check_out" }
+    Body: { "qr_token": "...", "tip": "check_in" | "check_out", "lot": <gate lot id, opsiyonel> }
+    qr_token rastgele (eski) ya da imzalı "s1." token olabilir; imzalı token'lar
+    veritabanına gitmeden doğrulanır (bkz. qr.py).
     Only staff (görevli/admin).
     """
-    permission_classes = []
+    permission_classes = [IsGateStaff]
 
     def post(self, request, *args, **kwargs):
         ser = CheckByQRSerializer(data=request.data)
@@ -260,41 +376,88 @@ class CheckByQRView(APIView):
         tip   = ser.validated_data['tip']
 
         try:
-            resv = Reservation.objects.select_related('lot', 'user', 'rateplan').get(qr_token=token)
-        except Reservation.DoesNotExist:
+            qs, check = gate.lookup(token, tip, ser.validated_data.get('lot'))
+        except qr.InvalidQR as e:
+            return Response({"detail": e.detail, "code": e.code}, status=status.HTTP_400_BAD_REQUEST)
+        resv = qs.first()
+        if resv is None:
             return Response({"detail": "Rezervasyon bulunamadı."}, status=status.HTTP_404_NOT_FOUND)
+        mismatch = check(resv)
+        if mismatch:
+            return Response({"detail": mismatch[0], "code": mismatch[1]}, status=status.HTTP_400_BAD_REQUEST)
 
-        # İş kuralları
-        if tip == 'check_in':
-            if resv.durum in ['checked_in', 'checked_out', 'canceled']:
-                return Response({"detail": f"Bu rezervasyon için check-in yapılamaz (durum: {resv.durum})."}, status=status.HTTP_400_BAD_REQUEST)
-            # İstersen pending -> confirmed yap
-            if resv.durum == 'pending':
-                resv.durum = 'confirmed'
-            resv.durum = 'checked_in'
-            resv.save(update_fields=['durum'])
-
-        elif tip == 'check_out':
-            if resv.durum != 'checked_in':
-                return Response({"detail": "Check-out yalnızca 'checked_in' durumunda yapılabilir."}, status=status.HTTP_400_BAD_REQUEST)
-
-            # Gerçek çıkış saatini şimdi olarak alıp ücreti yeniden hesaplamak istersen:
-            # resv.bitis = timezone.now()
-            # resv.durum = 'checked_out'
-            # resv.save(update_fields=['bitis', 'durum'])
-            # Eğer planlanan bitiş saati kalsın diyorsan sadece durum değiştir:
-            resv.durum = 'checked_out'
-            resv.save(update_fields=['durum'])
-
-        # Event kaydı
-        event = CheckEvent.objects.create(
-            reservation=resv,
-            tip=tip,
-            gorevli=request.user
-        )
+        # İş kuralları (hızlı red; asıl kontrol koşullu UPDATE'te)
+        err = gate.rule_error(resv, tip)
+        if err:
+            return Response({"detail": err}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Planlanan bitiş saati korunur, ücret yeniden hesaplanmaz
+        event = gate.record_scan(resv, tip, gorevli=request.user)
+        if event is None:
+            return Response({"detail": "Rezervasyon durumu aynı anda değişti, tekrar okutun.", "code": "conflict"},
+                            status=status.HTTP_409_CONFLICT)
 
         return Response({
             "detail": "OK",
             "reservation": ReservationDetailSerializer(resv).data,
             "event": CheckEventSerializer(event).data
         }, status=status.HTTP_200_OK)
+
+
+class CheckByQRBatchView(APIView):
+    """
+    POST /reservation/check-by-qr/batch/
+    Body: { "scans": [ { "qr_token": "...", "tip": "check_in" | "check_out",
+                         "scanned_at": "<ISO>", "lot": <opsiyonel> }, ... ] }
+    Bağlantı koptuğunda tamponlanan okutmaları zaman sırasıyla, toplu sorgularla uygular.
+    Her okutma için sonuç (ok | rejected | invalid | not_found) girdi sırasıyla döner.
+    scanned_at gelecekte ya da çok eskiyse (CheckByQRBatchSerializer) istek 400 alır.
+    Sadece görevli/admin.
+    """
+    permission_classes = [IsGateStaff]
+
+    def post(self, request, *args, **kwargs):
+        ser = CheckByQRBatchSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        results = gate.apply_batch(ser.validated_data['scans'], gorevli=request.user)
+        if results is None:
+            return Response({"detail": "Rezervasyon durumu aynı anda değişti, tekrar gönderin.", "code": "conflict"},
+                            status=status.HTTP_409_CONFLICT)
+        return Response({
+            "applied": sum(r['status'] == 'ok' for r in results),
+            "results": results,
+        }, status=status.HTTP_200_OK)
+
+
+from django.http import StreamingHttpResponse
+
+from core.routers import read_db
+from . import export
+from .serializers import ExportQuerySerializer
+
+
+class ExportView(ReplicaReadMixin, APIView):
+    """
+    GET /reservation/export/<reservations|check-events|payments>.<csv|ndjson|parquet>
+    Filtre: ?lot=<id>  ?baslangic=<ISO>  ?bitis=<ISO>  (rezervasyonda baslangic,
+    giriş/çıkışta zaman, ödemede created_at alanına göre; bitis hariç)
+    Satırlar sabit bellekle akış halinde gönderilir. Sadece admin.
+    Okuma replikası varsa oradan okunur; akış view döndükten sonra sürdüğü için
+    alias sorguya açıkça verilir.
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, kind, fmt):
+        ser = ExportQuerySerializer(data=request.query_params)
+        ser.is_valid(raise_exception=True)
+        if fmt == 'parquet' and not export.parquet_available():
+            return Response({"detail": "Parquet için sunucuda pyarrow kurulu değil."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        data = ser.validated_data
+        resp = StreamingHttpResponse(
+            export.stream(kind, fmt, lot=data.get('lot'), since=data.get('baslangic'), until=data.get('bitis'),
+                          using=read_db()),
+            content_type=export.FORMATS[fmt],
+        )
+        resp['Content-Disposition'] = f'attachment; filename="{kind}-{timezone.now():%Y%m%d%H%M}.{fmt}"'
+        return resp